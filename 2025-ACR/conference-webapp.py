@@ -9,6 +9,8 @@ Usage:
 
 import os
 import json
+import itertools
+import numpy as np
 import pandas as pd
 from flask import Flask, render_template_string, request, jsonify, send_file
 from flask_cors import CORS
@@ -369,6 +371,57 @@ HTML_TEMPLATE = """
             transform: none;
         }
         
+        .facet-panel {
+            margin-bottom: 15px;
+        }
+
+        .facet {
+            display: flex;
+            flex-wrap: wrap;
+            align-items: center;
+            gap: 6px;
+            margin-bottom: 8px;
+        }
+
+        .facet-name {
+            font-weight: 600;
+            color: #333;
+            margin-right: 4px;
+        }
+
+        .facet-value {
+            padding: 2px 8px;
+            border: 1px solid #ccd;
+            border-radius: 12px;
+            background-color: #f5f7fb;
+            font-size: 13px;
+            cursor: pointer;
+        }
+
+        .facet-value:hover {
+            background-color: #e6ecf7;
+        }
+
+        .facet-value.selected {
+            background-color: #3498db;
+            border-color: #3498db;
+            color: white;
+        }
+
+        .facet-value small {
+            color: #888;
+        }
+
+        .facet-value.selected small {
+            color: #dde9ff;
+        }
+
+        .facet-action {
+            font-size: 13px;
+            color: #3498db;
+            cursor: pointer;
+        }
+
         .pagination {
             display: flex;
             justify-content: center;
@@ -645,6 +698,8 @@ HTML_TEMPLATE = """
         
         <!-- Table -->
         <div class="table-container">
+            <div id="facetPanel" class="facet-panel" style="display: none;"></div>
+            
             <table id="abstractsTable">
                 <thead>
                     <tr>
@@ -693,6 +748,13 @@ HTML_TEMPLATE = """
         let isShowingAnnotated = false;
         let currentFilteredTotal = 0;  // Track filtered total
         
+        // Facets: keyword counts over the current search; clicking a value filters by it
+        const FACET_VALUES_SHOWN = 12;          // Values listed per facet until expanded
+        const activeFacets = {};                // facet column -> selected values
+        const expandedFacets = new Set();
+        let shownFacets = {};
+        let facetChoices = [];                  // [column, value] behind each rendered value
+        
         // Load statistics on page load
         window.onload = function() {
             loadStats();
@@ -797,9 +859,10 @@ HTML_TEMPLATE = """
             const showEmpty = document.getElementById('showEmptyAbstracts').checked;
             const perPage = document.getElementById('perPage').value;
             
-            fetch('/api/abstracts?page=' + page + '&per_page=' + perPage + '&search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty)
+            fetch('/api/abstracts?page=' + page + '&per_page=' + perPage + '&search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty + facetQuery())
                 .then(response => response.json())
                 .then(data => {
+                    renderFacets(data.facets);
                     currentPage = data.page;
                     totalPages = data.total_pages;
                     isShowingAnnotated = false;
@@ -867,6 +930,67 @@ HTML_TEMPLATE = """
                 .catch(error => console.error('Error loading abstracts:', error));
         }
         
+        function escapeFacetText(text) {
+            const div = document.createElement('div');
+            div.textContent = text;
+            return div.innerHTML;
+        }
+        
+        function facetQuery() {
+            return Object.entries(activeFacets).map(([column, values]) =>
+                values.map(value => '&facet=' + encodeURIComponent(column + ':' + value)).join('')).join('');
+        }
+        
+        function renderFacets(facets) {
+            const panel = document.getElementById('facetPanel');
+            shownFacets = facets || {};
+            facetChoices = [];
+            const columns = Object.keys(shownFacets).filter(column => shownFacets[column].values.length);
+            panel.innerHTML = columns.map((column, index) => {
+                const facet = shownFacets[column];
+                // Selected values first, so they stay visible when the list is collapsed
+                const values = facet.values.filter(item => facet.selected.includes(item.value))
+                    .concat(facet.values.filter(item => !facet.selected.includes(item.value)));
+                const shown = expandedFacets.has(column) ? values : values.slice(0, FACET_VALUES_SHOWN);
+                const items = shown.map(item => {
+                    facetChoices.push([column, item.value]);
+                    return '<span class="facet-value' + (facet.selected.includes(item.value) ? ' selected' : '') +
+                        '" onclick="toggleFacet(' + (facetChoices.length - 1) + ')">' + escapeFacetText(item.value) +
+                        ' <small>' + item.count.toLocaleString() + '</small></span>';
+                }).join('');
+                const more = values.length > FACET_VALUES_SHOWN ?
+                    '<span class="facet-action" onclick="toggleFacetExpanded(' + index + ')">' +
+                        (expandedFacets.has(column) ? 'fewer' : 'all ' + values.length) + '</span>' : '';
+                const clear = facet.selected.length ?
+                    '<span class="facet-action" onclick="clearFacet(' + index + ')">clear</span>' : '';
+                return '<div class="facet"><span class="facet-name">' + escapeFacetText(column) + '</span>' + items + more + clear + '</div>';
+            }).join('');
+            panel.style.display = columns.length ? '' : 'none';
+        }
+        
+        function toggleFacet(choice) {
+            const [column, value] = facetChoices[choice];
+            const values = activeFacets[column] || [];
+            activeFacets[column] = values.includes(value) ? values.filter(v => v !== value) : values.concat([value]);
+            if (!activeFacets[column].length) delete activeFacets[column];
+            searchAbstracts();
+        }
+        
+        function toggleFacetExpanded(index) {
+            const column = Object.keys(shownFacets).filter(c => shownFacets[c].values.length)[index];
+            if (expandedFacets.has(column)) {
+                expandedFacets.delete(column);
+            } else {
+                expandedFacets.add(column);
+            }
+            renderFacets(shownFacets);
+        }
+        
+        function clearFacet(index) {
+            delete activeFacets[Object.keys(shownFacets).filter(c => shownFacets[c].values.length)[index]];
+            searchAbstracts();
+        }
+        
         function searchAbstracts() {
             isShowingAnnotated = false;
             currentTaskId = null;
@@ -924,7 +1048,8 @@ HTML_TEMPLATE = """
                 num_threads: numThreads,
                 dry_run: dryRun,
                 search_filter: searchFilter,
-                show_empty: showEmpty
+                show_empty: showEmpty,
+                facets: activeFacets
             };
             
             fetch('/api/annotate', {
@@ -1113,7 +1238,7 @@ HTML_TEMPLATE = """
                 const search = document.getElementById('searchInput').value;
                 const showEmpty = document.getElementById('showEmptyAbstracts').checked;
 
-                window.location.href = '/api/download/current?search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty;
+                window.location.href = '/api/download/current?search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty + facetQuery();
             }
         }
 
@@ -1229,6 +1354,11 @@ CORS(app)
 annotation_progress = {}
 annotation_results = {}
 
+# Facets counted over every search result and usable as filters (?facet=Keywords:...).
+# Multi-valued columns list their values separated by the given string.
+FACET_COLUMNS = {'Keywords': ';'}
+FACET_MAX_VALUES = 100      # Most frequent values returned per facet (selected ones are always included)
+
 # Load data at startup
 def load_data():
     """Load the Excel file from the same directory as the app"""
@@ -1298,8 +1428,115 @@ def load_data():
         traceback.print_exc()
         return pd.DataFrame()
 
+def build_facet_index(df):
+    """
+    Per facet column: its distinct values (sorted) and one (row position, value code)
+    pair per value a row has, so counts over any set of rows are one bincount.
+    """
+    index = {}
+    for column, separator in FACET_COLUMNS.items():
+        if column not in df.columns:
+            continue
+        values = df[column].astype(str)
+        if separator:
+            lists = values.str.split(separator, regex=False)
+            lengths = lists.str.len().to_numpy(dtype=np.int64)
+            values = pd.Series(np.fromiter(itertools.chain.from_iterable(lists), dtype=object,
+                                           count=int(lengths.sum())), dtype=object)
+            rows = np.repeat(np.arange(len(df), dtype=np.int64), lengths)
+        else:
+            rows = np.arange(len(df), dtype=np.int64)
+        values = values.str.strip().to_numpy(dtype=object)
+        keep = values != ''
+        codes, uniques = pd.factorize(values[keep], sort=True)
+
+        # A value listed twice in one row counts once
+        stride = max(len(df), 1)
+        pairs = codes.astype(np.int64) * stride + rows[keep]
+        pairs.sort()
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if len(pairs) else pairs
+        uniques = np.asarray(uniques, dtype=object)
+        index[column] = {
+            'values': uniques,
+            'codes': (pairs // stride).astype(np.int32),
+            'rows': (pairs % stride).astype(np.int32),
+            'lookup': {value: code for code, value in enumerate(uniques)}
+        }
+    return index
+
 # Initialize data
 abstracts_df = load_data()
+facet_index = build_facet_index(abstracts_df)
+
+def parse_facet_filters(selections):
+    """
+    Canonical facet filters ((column, (values, ...)), ...) from a {column: [values]}
+    mapping; raises ValueError for columns that are not facets.
+    """
+    if not isinstance(selections, dict):
+        raise ValueError('Facet filters must map facet columns to values')
+    filters = []
+    for column, values in selections.items():
+        if column not in facet_index:
+            raise ValueError(f"Unknown facet: {column}")
+        values = tuple(sorted({str(value) for value in ([values] if isinstance(values, str) else values)}))
+        if values:
+            filters.append((column, values))
+    return tuple(sorted(filters))
+
+def requested_facet_filters():
+    """Facet filters from repeated ?facet=Column:value parameters; raises ValueError for unknown facets"""
+    selections = {}
+    for item in request.args.getlist('facet'):
+        column, _, value = item.partition(':')
+        selections.setdefault(column, []).append(value)
+    return parse_facet_filters(selections)
+
+def facet_mask(column, values):
+    """Rows (positions in abstracts_df) having any of the given values in a facet column"""
+    facet = facet_index[column]
+    codes = [facet['lookup'][value] for value in values if value in facet['lookup']]
+    mask = np.zeros(len(abstracts_df), dtype=bool)
+    mask[facet['rows'][np.isin(facet['codes'], codes)]] = True
+    return mask
+
+def apply_facet_filters(filtered_df, facet_filters):
+    """Rows of filtered_df matching every facet filter (each facet matches any of its selected values)"""
+    if not facet_filters:
+        return filtered_df
+    mask = np.ones(len(abstracts_df), dtype=bool)
+    for column, values in facet_filters:
+        mask &= facet_mask(column, values)
+    return filtered_df[mask[abstracts_df.index.get_indexer(filtered_df.index)]]
+
+def facet_counts(filtered_df, facet_filters):
+    """
+    Value counts of every facet over the rows of a search result. Each facet is
+    counted with the other facets' filters applied but not its own, so the
+    alternatives to a selected value keep their counts.
+    """
+    search_mask = np.zeros(len(abstracts_df), dtype=bool)
+    search_mask[abstracts_df.index.get_indexer(filtered_df.index)] = True
+    masks = {column: facet_mask(column, values) for column, values in facet_filters}
+    selected = dict(facet_filters)
+    counts = {}
+    for column, facet in facet_index.items():
+        rows = search_mask
+        for other, mask in masks.items():
+            if other != column:
+                rows = rows & mask
+        value_counts = np.bincount(facet['codes'][rows[facet['rows']]], minlength=len(facet['values']))
+        codes = np.flatnonzero(value_counts)
+        codes = codes[np.lexsort((codes, -value_counts[codes]))]
+        listed = codes[:FACET_MAX_VALUES].tolist()
+        listed += [facet['lookup'][value] for value in selected.get(column, ())
+                   if value in facet['lookup'] and facet['lookup'][value] not in listed]
+        counts[column] = {
+            'values': [{'value': facet['values'][code], 'count': int(value_counts[code])} for code in listed],
+            'distinct': len(codes),
+            'selected': list(selected.get(column, ()))
+        }
+    return counts
 
 def get_openai_response(api_key, model, abstract_text, question, dry_run=False):
     """Get response from OpenAI API or generate mock response for dry run"""
@@ -1384,6 +1621,10 @@ def get_abstracts():
     per_page = int(request.args.get('per_page', 20))
     search = request.args.get('search', '')
     show_empty = request.args.get('show_empty', 'false').lower() == 'true'
+    try:
+        facet_filters = requested_facet_filters()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     # Filter data based on search
     filtered_df = abstracts_df.copy()
@@ -1418,6 +1659,10 @@ def get_abstracts():
         
         filtered_df = filtered_df[mask]
     
+    # Count facet values over the search result, then narrow it to the selected values
+    facets = facet_counts(filtered_df, facet_filters)
+    filtered_df = apply_facet_filters(filtered_df, facet_filters)
+    
     # Paginate
     total = len(filtered_df)
     start = (page - 1) * per_page
@@ -1431,7 +1676,8 @@ def get_abstracts():
         'total': total,
         'page': page,
         'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
+        'total_pages': (total + per_page - 1) // per_page,
+        'facets': facets
     }
     
     # Include search terms if present
@@ -1451,6 +1697,10 @@ def annotate_abstracts():
     dry_run = data.get('dry_run', False)
     search_filter = data.get('search_filter', '')
     show_empty = data.get('show_empty', False)
+    try:
+        facet_filters = parse_facet_filters(data.get('facets') or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     # Generate task ID
     task_id = hashlib.md5(f"{question}{datetime.now()}".encode()).hexdigest()
@@ -1487,6 +1737,8 @@ def annotate_abstracts():
         
         filtered_df = filtered_df[mask]
     
+    filtered_df = apply_facet_filters(filtered_df, facet_filters)
+    
     # Initialize progress tracking
     total_abstracts = len(filtered_df)
     annotation_progress[task_id] = {
@@ -1590,6 +1842,10 @@ def download_current_view():
     """Download current filtered view as CSV"""
     search = request.args.get('search', '')
     show_empty = request.args.get('show_empty', 'false').lower() == 'true'
+    try:
+        facet_filters = requested_facet_filters()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     # Apply same filters as display
     filtered_df = abstracts_df.copy()
@@ -1622,6 +1878,8 @@ def download_current_view():
         
         filtered_df = filtered_df[mask]
     
+    filtered_df = apply_facet_filters(filtered_df, facet_filters)
+    
     # Reorder columns to match display
     cols = ['Abstract #', 'Keywords', 'First Author', 'Abstract title', 'Abstract', 'Link']
     if 'Matched Keywords' in filtered_df.columns:
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Annotation Throughput Benchmark
+Runs the annotation pipeline over synthetic abstract tables against the local
+mock model server and reports abstracts/sec, per-call latency percentiles,
+peak RSS and thread counts.
+
+Usage:
+    python benchmarks/annotation_throughput.py --rows 500 2000 --threads 10 50 100
+    python benchmarks/annotation_throughput.py --output after.json --compare before.json
+"""
+
+import time
+import argparse
+import threading
+from synthetic_data import (
+    synthetic_abstracts_file, load_webapp, start_mock_server, mock_stats, current_rss_mb,
+    peak_rss_mb, percentiles, environment_info, save_report, compare_reports
+)
+
+
+class ResourceMonitor:
+    """Samples thread count and RSS in the background while a run is in progress"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak_threads = 0
+        self.peak_rss_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            self.peak_rss_mb = max(self.peak_rss_mb, current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def instrument_model_calls(webapp):
+    """Wrap the app's single model-call entry point to record per-call latency"""
+    latencies = []
+    lock = threading.Lock()
+    original = webapp.request_chat_completion
+
+    def timed_request(*args, **kwargs):
+        start = time.time()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            with lock:
+                latencies.append(time.time() - start)
+
+    webapp.request_chat_completion = timed_request
+    return latencies
+
+
+def run_annotation(webapp, settings, latencies, base_url):
+    """Run one annotation task through the API and collect its metrics"""
+    client = webapp.app.test_client()
+    latencies.clear()
+    stats_before = mock_stats(base_url)
+
+    with ResourceMonitor() as monitor:
+        start = time.time()
+        response = client.post('/api/annotate', json=settings)
+        if response.status_code != 200:
+            raise RuntimeError(f"Annotation request failed: {response.get_json()}")
+        task_id = response.get_json()['task_id']
+
+        while True:
+            progress = client.get(f'/api/progress/{task_id}').get_json()
+            if progress['status'] in ('completed', 'error'):
+                break
+            time.sleep(0.05)
+        elapsed = time.time() - start
+
+    stats_after = mock_stats(base_url)
+    server = {k: stats_after[k] - stats_before[k] for k in ('requests', 'errors_429', 'errors_500')}
+    return {
+        'status': progress['status'],
+        'abstracts': progress['total'],
+        'elapsed_seconds': round(elapsed, 3),
+        'abstracts_per_second': round(progress['total'] / elapsed, 2) if elapsed else None,
+        'model_calls': len(latencies),
+        'calls_per_second': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'latency_seconds': percentiles(latencies),
+        'throttled': progress.get('throttled', 0),
+        'retries': progress.get('retries', 0),
+        'hedged': progress.get('hedged', 0),
+        'server': server,
+        'peak_threads': monitor.peak_threads,
+        'peak_rss_mb': round(monitor.peak_rss_mb, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark annotation throughput against the mock model server')
+    parser.add_argument('--rows', type=int, nargs='+', default=[500, 2000], help='Synthetic table sizes')
+    parser.add_argument('--threads', type=int, nargs='+', default=[10, 50, 100], help='Concurrency levels')
+    parser.add_argument('--questions', type=int, default=1, help='Questions asked per abstract')
+    parser.add_argument('--model', default='gpt-5-nano')
+    parser.add_argument('--adaptive', action='store_true', help='Use adaptive concurrency (threads = upper limit)')
+    parser.add_argument('--hedge', action='store_true', help='Hedge slow requests')
+    parser.add_argument('--latency-median', type=float, default=0.5, help='Mock median latency in seconds')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Mock lognormal latency spread')
+    parser.add_argument('--error-429-rate', type=float, default=0.0)
+    parser.add_argument('--error-500-rate', type=float, default=0.0)
+    parser.add_argument('--max-concurrent', type=int, default=0, help='Mock in-flight limit before 429s')
+    parser.add_argument('--output', default='annotation-benchmark.json', help='Where to save the JSON report')
+    parser.add_argument('--compare', help='Earlier JSON report to compare abstracts/sec against')
+    args = parser.parse_args()
+
+    mock_process, base_url = start_mock_server(
+        latency_median=args.latency_median, latency_sigma=args.latency_sigma,
+        error_429_rate=args.error_429_rate, error_500_rate=args.error_500_rate,
+        max_concurrent=args.max_concurrent
+    )
+    print(f"Mock model server at {base_url}")
+
+    questions = [f"Question {i + 1}: does the abstract report outcome {i + 1}?" for i in range(args.questions)]
+    runs = []
+    try:
+        for rows in args.rows:
+            webapp = load_webapp(synthetic_abstracts_file(rows), base_url=base_url)
+            latencies = instrument_model_calls(webapp)
+
+            for threads in args.threads:
+                settings = {
+                    'api_key': 'mock',
+                    'model': args.model,
+                    'questions': questions,
+                    'num_threads': threads,
+                    'adaptive_concurrency': args.adaptive,
+                    'hedge_requests': args.hedge
+                }
+                result = run_annotation(webapp, settings, latencies, base_url)
+                run = {'rows': rows, 'threads': threads, **result}
+                runs.append(run)
+                print(f"rows={rows:>6} threads={threads:>4}  {run['abstracts_per_second']:>8} abstracts/s  "
+                      f"p50={run['latency_seconds']['p50']}s p95={run['latency_seconds']['p95']}s "
+                      f"p99={run['latency_seconds']['p99']}s  threads={run['peak_threads']} "
+                      f"rss={run['peak_rss_mb']}MB  429s={run['server']['errors_429']}")
+    finally:
+        mock_process.terminate()
+        mock_process.wait()
+
+    report = {
+        'benchmark': 'annotation_throughput',
+        'environment': environment_info(),
+        'config': vars(args),
+        'process_peak_rss_mb': round(peak_rss_mb(), 1),
+        'runs': runs
+    }
+    save_report(args.output, report)
+    if args.compare:
+        compare_reports(args.compare, runs, ('rows', 'threads'), 'abstracts_per_second')
+
+
+if __name__ == '__main__':
+    main()
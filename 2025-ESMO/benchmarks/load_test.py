@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Conference-Day Load Test
+Replays a mix of browsing traffic (stats, paged browsing, searches, opening
+an abstract, CSV downloads) from simulated users, plus a few concurrent annotation jobs
+against the mock model server, and reports throughput and latency
+percentiles per route.
+
+By default it starts the app itself on a synthetic corpus, either with the
+Flask development server or with gunicorn, so worker and thread counts can
+be compared:
+
+    python benchmarks/load_test.py --server gunicorn --workers 4 --threads 4 --users 50
+    python benchmarks/load_test.py --server gunicorn --workers 1 --threads 16 --users 50
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --users 20 --annotate-jobs 0
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import urllib.parse
+import urllib.request
+import urllib.error
+from collections import defaultdict
+from synthetic_data import (
+    APP_DIR, WEBAPP_PATH, DOMAIN_TERMS, VOCABULARY, synthetic_abstracts_file, start_mock_server,
+    free_port, wait_for_url, percentiles, environment_info, save_report, compare_reports
+)
+
+# Relative frequency of each browsing action for one simulated user
+USER_ACTIONS = {
+    'stats': 5,
+    'browse': 40,
+    'search': 30,
+    'open_abstract': 15,
+    'download_current': 3
+}
+# The projection and preview length the page requests for its table
+LIST_PARAMS = {
+    'fields': 'Abstract #,Track,First Author,Abstract title,Abstract,Matched Keywords',
+    'preview': 300
+}
+PROGRESS_POLL_SECONDS = 1.0     # Same interval as the page's progress poller
+
+
+class RouteStats:
+    """Thread-safe latency and error collection per route"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route, seconds, status):
+        with self.lock:
+            self.latencies[route].append(seconds * 1000)
+            if status >= 400:
+                self.errors[route][str(status)] += 1
+
+    def summary(self, elapsed):
+        with self.lock:
+            routes = []
+            for route, values in sorted(self.latencies.items()):
+                errors = dict(self.errors[route])
+                routes.append({
+                    'route': route,
+                    'requests': len(values),
+                    'errors': sum(errors.values()),
+                    'error_statuses': errors,
+                    'requests_per_second': round(len(values) / elapsed, 2),
+                    **{f"{k}_ms": v for k, v in percentiles(values, (50, 95, 99)).items()},
+                    'max_ms': round(max(values), 1)
+                })
+            return routes
+
+
+def http_request(stats, base_url, route, path, params=None, body=None):
+    """Issue one request, time it and record it under `route`; returns (status, parsed JSON or None)"""
+    url = base_url + path + ('?' + urllib.parse.urlencode(params) if params else '')
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'} if data else {})
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=300) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    except OSError:
+        payload = b''
+        status = 599    # Connection refused, reset or timed out
+    stats.record(route, time.perf_counter() - start, status)
+
+    if payload[:1] in (b'{', b'['):
+        return status, json.loads(payload)
+    return status, None
+
+
+def random_search(rng):
+    """One to three terms, mostly common oncology words with the occasional rare one"""
+    terms = [rng.choice(DOMAIN_TERMS[20:]) for _ in range(rng.randint(1, 3))]
+    if rng.random() < 0.3:
+        terms.append(str(rng.choice(VOCABULARY[-2000:])))
+    return '; '.join(terms)
+
+
+def simulated_user(user_id, stats, base_url, deadline, think_time):
+    """Loop over weighted browsing actions with exponential think time until the deadline"""
+    rng = random.Random(user_id)
+    actions, weights = zip(*USER_ACTIONS.items())
+    total_pages = 50
+    row_ids = []    # Rows on the page the user last looked at
+
+    while time.time() < deadline:
+        action = rng.choices(actions, weights)[0]
+        per_page = rng.choice([20, 20, 50, 100])
+
+        if action == 'stats':
+            http_request(stats, base_url, 'GET /api/stats', '/api/stats')
+        elif action == 'browse':
+            _, page = http_request(stats, base_url, 'GET /api/abstracts (browse)', '/api/abstracts', {
+                'page': rng.randint(1, total_pages), 'per_page': per_page, **LIST_PARAMS})
+            if page and page.get('total_pages'):
+                total_pages = page['total_pages']
+                row_ids = [row['_id'] for row in page['data']]
+        elif action == 'search':
+            _, page = http_request(stats, base_url, 'GET /api/abstracts (search)', '/api/abstracts', {
+                'page': 1, 'per_page': per_page, 'search': random_search(rng), **LIST_PARAMS})
+            if page and page.get('data'):
+                row_ids = [row['_id'] for row in page['data']]
+        elif action == 'open_abstract' and row_ids:
+            http_request(stats, base_url, 'GET /api/abstracts/<id>', f'/api/abstracts/{rng.choice(row_ids)}')
+        elif action == 'download_current':
+            http_request(stats, base_url, 'GET /api/download/current', '/api/download/current', {
+                'search': random_search(rng)})
+
+        time.sleep(rng.expovariate(1.0 / think_time) if think_time else 0)
+
+
+def annotation_job_loop(job_id, stats, base_url, deadline, threads, jobs_done):
+    """Start annotation jobs one after another, polling progress like the page does"""
+    rng = random.Random(1000 + job_id)
+    while time.time() < deadline:
+        # A rare term keeps each job to a few hundred rows, as a focused question would be
+        search = str(rng.choice(VOCABULARY[len(VOCABULARY) // 4:len(VOCABULARY) // 2]))
+        status, started = http_request(stats, base_url, 'POST /api/annotate', '/api/annotate', body={
+            'api_key': 'mock', 'model': 'gpt-5-nano', 'question': 'Is overall survival reported?',
+            'num_threads': threads, 'search_filter': search})
+        if status != 200 or not started:
+            time.sleep(PROGRESS_POLL_SECONDS)
+            continue
+        task_id = started['task_id']
+
+        outcome = 'lost'
+        while time.time() < deadline + 300:
+            time.sleep(PROGRESS_POLL_SECONDS)
+            status, progress = http_request(stats, base_url, 'GET /api/progress', f'/api/progress/{task_id}')
+            if status == 404:
+                # Task state lives in one worker process; another worker answered
+                continue
+            if progress and progress.get('status') in ('completed', 'error'):
+                outcome = progress['status']
+                break
+
+        if outcome == 'completed':
+            http_request(stats, base_url, 'GET /api/annotated', f'/api/annotated/{task_id}', {
+                'page': 1, 'per_page': 20, **LIST_PARAMS})
+            http_request(stats, base_url, 'GET /api/download/<task_id>', f'/api/download/{task_id}')
+        jobs_done.append(outcome)
+
+
+def start_app(args, data_file, model_base_url):
+    """Start the app under test; returns (process, base_url)"""
+    port = free_port()
+    env = dict(os.environ, ABSTRACTS_FILE=data_file, OPENAI_BASE_URL=model_base_url,
+               HOST='127.0.0.1', PORT=str(port))
+    if args.server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-w', str(args.workers), '--threads', str(args.threads),
+                   '-b', f'127.0.0.1:{port}', '--timeout', '600', 'conference-webapp:app']
+    else:
+        command = [sys.executable, WEBAPP_PATH]
+    log = open(os.path.join(args.log_dir, f'load-test-{args.server}.log'), 'w')
+    process = subprocess.Popen(command, cwd=APP_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    base_url = f'http://127.0.0.1:{port}'
+    wait_for_url(base_url + '/api/stats', timeout=args.startup_timeout)
+    return process, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay conference-day traffic and report per-route latency')
+    parser.add_argument('--url', help='Test an already running instance instead of starting one')
+    parser.add_argument('--server', choices=['flask', 'gunicorn'], default='gunicorn')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker')
+    parser.add_argument('--rows', type=int, default=5000, help='Synthetic corpus size')
+    parser.add_argument('--users', type=int, default=30, help='Concurrent simulated users')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds of traffic')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Mean seconds between a user\'s actions')
+    parser.add_argument('--annotate-jobs', type=int, default=2, help='Concurrent annotation job loops')
+    parser.add_argument('--annotate-threads', type=int, default=20, help='num_threads for each annotation job')
+    parser.add_argument('--latency-median', type=float, default=0.5, help='Mock model median latency in seconds')
+    parser.add_argument('--startup-timeout', type=float, default=600, help='Seconds to wait for the app to load')
+    parser.add_argument('--log-dir', default='.', help='Where the started server writes its log')
+    parser.add_argument('--output', default='load-test.json', help='Where to save the JSON report')
+    parser.add_argument('--compare', help='Earlier JSON report to compare p95 latency against')
+    args = parser.parse_args()
+
+    processes = []
+    try:
+        mock_process, model_base_url = start_mock_server(latency_median=args.latency_median)
+        processes.append(mock_process)
+        if args.url:
+            base_url = args.url.rstrip('/')
+        else:
+            app_process, base_url = start_app(args, synthetic_abstracts_file(args.rows), model_base_url)
+            processes.append(app_process)
+        print(f"Testing {base_url} with {args.users} users and {args.annotate_jobs} annotation jobs "
+              f"for {args.duration:.0f}s")
+
+        stats = RouteStats()
+        jobs_done = []
+        start = time.time()
+        deadline = start + args.duration
+        workers = [
+            threading.Thread(target=simulated_user, args=(i, stats, base_url, deadline, args.think_time))
+            for i in range(args.users)
+        ] + [
+            threading.Thread(target=annotation_job_loop,
+                             args=(i, stats, base_url, deadline, args.annotate_threads, jobs_done))
+            for i in range(args.annotate_jobs)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.time() - start
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    routes = stats.summary(elapsed)
+    total_requests = sum(r['requests'] for r in routes)
+    print(f"\n{'Route':<32}{'Requests':>9}{'Errors':>8}{'Req/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in routes:
+        print(f"{r['route']:<32}{r['requests']:>9}{r['errors']:>8}{r['requests_per_second']:>8}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+    print(f"\nTotal: {total_requests} requests, {total_requests / elapsed:.1f} req/s over {elapsed:.0f}s; "
+          f"annotation jobs: {', '.join(f'{jobs_done.count(o)} {o}' for o in sorted(set(jobs_done))) or 'none'}")
+
+    report = {
+        'benchmark': 'load_test',
+        'environment': environment_info(),
+        'config': vars(args),
+        'elapsed_seconds': round(elapsed, 1),
+        'total_requests': total_requests,
+        'requests_per_second': round(total_requests / elapsed, 2),
+        'annotation_jobs': {outcome: jobs_done.count(outcome) for outcome in set(jobs_done)},
+        'runs': routes
+    }
+    save_report(args.output, report)
+    if args.compare:
+        compare_reports(args.compare, routes, ('route',), 'p95_ms', higher_is_better=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Search and Pagination Micro-benchmarks
+Times the browse hot path over synthetic corpora at several sizes:
+filter_dataframe_efficient, paged /api/abstracts requests (cold, with the
+result snapshot cache cleared before each call, and warm), records_json page
+serialization and the CSV exports.
+
+Usage:
+    python benchmarks/search_pagination.py --rows 1000 10000 100000 --terms 1 5 20 50
+    python benchmarks/search_pagination.py --output after.json --compare before.json
+"""
+
+import time
+import argparse
+import numpy as np
+from datetime import datetime
+from synthetic_data import (
+    DOMAIN_TERMS, VOCABULARY, synthetic_abstracts_file, load_webapp, percentiles,
+    environment_info, save_report, compare_reports
+)
+
+
+def search_terms(count, seed=2025):
+    """Semicolon-joined search terms, mixing common oncology terms with rare words"""
+    rng = np.random.RandomState(seed + count)
+    common = rng.choice(DOMAIN_TERMS[20:], size=(count + 1) // 2, replace=False).tolist()
+    rare = rng.choice(VOCABULARY[len(VOCABULARY) // 2:], size=count // 2, replace=False).tolist()
+    return '; '.join(common + rare)
+
+
+def time_case(func, repeat, budget, setup=None):
+    """
+    Run func up to `repeat` times (at least once, stopping once `budget` seconds are used).
+    setup, if given, runs untimed before every call.
+    """
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeat:
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+        if time.perf_counter() - started > budget:
+            break
+    return {
+        'repeats': len(timings),
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(float(np.median(timings)), 3),
+        **{f"{k}_ms": v for k, v in percentiles(timings, (95,)).items()}
+    }
+
+
+def benchmark_corpus(webapp, rows, args):
+    """All cases for one corpus size"""
+    client = webapp.app.test_client()
+    df = webapp.abstracts_df
+    runs = []
+    skipped_terms = None
+
+    def record(case, func, terms=0, setup=None, **extra):
+        result = time_case(func, args.repeat, args.budget, setup)
+        run = {'rows': rows, 'case': case, 'terms': terms, **extra, **result}
+        runs.append(run)
+        print(f"rows={rows:>7} {case:<32} terms={terms:>3}  median={run['median_ms']:>10.2f}ms  "
+              f"min={run['min_ms']:>10.2f}ms  n={run['repeats']}")
+        return run
+
+    def record_api(case, query, terms=0):
+        # Cold: every call re-runs the query; warm: pages are served from the snapshot cache
+        fetch = lambda: client.get('/api/abstracts', query_string=query)
+        record(case, fetch, terms=terms, setup=webapp.result_snapshots.clear)
+        fetch()
+        record(f'{case}_warm', fetch, terms=terms)
+
+    # Filtering alone, and the full paged request it sits behind
+    record('filter_no_search', lambda: webapp.filter_dataframe_efficient(df, '', False))
+    for count in args.terms:
+        if skipped_terms:
+            print(f"rows={rows:>7} filter/search terms={count}: skipped (over {args.budget}s at {skipped_terms} terms)")
+            continue
+        search = search_terms(count)
+        mask, _ = webapp.filter_dataframe_efficient(df, search, False)
+        run = record('filter_search', lambda: webapp.filter_dataframe_efficient(df, search, False),
+                     terms=count, matched=int(mask.sum()))
+        record_api('api_abstracts_search', {'page': 1, 'per_page': 20, 'search': search}, terms=count)
+        if run['min_ms'] / 1000 > args.budget:
+            skipped_terms = count
+
+    for per_page in (20, 200):
+        last_page = max(1, -(-len(df) // per_page))
+        record_api(f'api_abstracts_page1_{per_page}', {'page': 1, 'per_page': per_page})
+        record_api(f'api_abstracts_last_page_{per_page}', {'page': last_page, 'per_page': per_page})
+
+    # Serialization of a page and of the whole table from the fragments encoded at load time
+    for size in (20, 200, len(df)):
+        positions = np.arange(size)
+        record(f'records_json_{"all" if size == len(df) else size}',
+               lambda: webapp.records_json(df, positions, fragments=webapp.abstracts_json))
+
+    # CSV exports: the current (filtered) view and an annotated result
+    record('download_current', lambda: client.get('/api/download/current'))
+    search = search_terms(args.terms[0])
+    record('download_current_search', lambda: client.get('/api/download/current', query_string={
+        'search': search}), terms=args.terms[0])
+
+    result_df = df.copy()
+    result_df['Answer: Does the abstract report overall survival?'] = np.where(
+        np.arange(len(df)) % 2 == 0, 'Yes, overall survival is reported.', 'No, not mentioned.')
+    webapp.annotation_results['benchmark'] = result_df
+    webapp.annotation_timestamps['benchmark'] = datetime.now()
+    record('download_annotated', lambda: client.get('/api/download/benchmark'))
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark search, pagination and export over synthetic corpora')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='Corpus sizes')
+    parser.add_argument('--terms', type=int, nargs='+', default=[1, 5, 20, 50], help='Search term counts')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions per case')
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help='Seconds per case; larger term counts are skipped once a single search exceeds it')
+    parser.add_argument('--output', default='search-benchmark.json', help='Where to save the JSON report')
+    parser.add_argument('--compare', help='Earlier JSON report to compare median times against')
+    args = parser.parse_args()
+
+    runs = []
+    load_seconds = {}
+    for rows in args.rows:
+        start = time.perf_counter()
+        webapp = load_webapp(synthetic_abstracts_file(rows))
+        load_seconds[rows] = round(time.perf_counter() - start, 2)
+        print(f"rows={rows:>7} app load {load_seconds[rows]}s, "
+              f"{webapp.abstracts_df.memory_usage(deep=True).sum() / 1e6:.1f} MB in memory")
+        runs.extend(benchmark_corpus(webapp, rows, args))
+
+    report = {
+        'benchmark': 'search_pagination',
+        'environment': environment_info(),
+        'config': vars(args),
+        'load_seconds': load_seconds,
+        'runs': runs
+    }
+    save_report(args.output, report)
+    if args.compare:
+        compare_reports(args.compare, runs, ('rows', 'case', 'terms'), 'median_ms', higher_is_better=False)
+
+
+if __name__ == '__main__':
+    main()
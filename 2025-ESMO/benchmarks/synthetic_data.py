@@ -0,0 +1,242 @@
+"""
+Synthetic conference data and shared helpers for the benchmark scripts.
+
+Tables use the raw ESMO column names, so they go through the app's normal
+load_data() path. Abstract lengths and word frequencies are roughly like
+real abstracts.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import platform
+import resource
+import tempfile
+import subprocess
+import importlib.util
+import urllib.request
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEBAPP_PATH = os.path.join(APP_DIR, 'conference-webapp.py')
+MOCK_SERVER_PATH = os.path.join(APP_DIR, 'mock-openai-server.py')
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'esmo-benchmarks')
+
+# Oncology vocabulary with the common search terms, weighted towards the front
+DOMAIN_TERMS = [
+    'cancer', 'patients', 'treatment', 'survival', 'tumor', 'therapy', 'overall', 'progression',
+    'response', 'phase', 'trial', 'chemotherapy', 'immunotherapy', 'metastatic', 'advanced',
+    'median', 'months', 'ratio', 'hazard', 'confidence', 'interval', 'cohort', 'randomized',
+    'lung', 'breast', 'colorectal', 'prostate', 'gastric', 'melanoma', 'ovarian', 'pancreatic',
+    'nsclc', 'pembrolizumab', 'nivolumab', 'osimertinib', 'trastuzumab', 'durvalumab',
+    'atezolizumab', 'olaparib', 'bevacizumab', 'egfr', 'her2', 'alk', 'kras', 'brca', 'pd-l1',
+    'ctdna', 'biomarker', 'mutation', 'expression', 'adjuvant', 'neoadjuvant', 'first-line',
+    'second-line', 'toxicity', 'adverse', 'events', 'grade', 'safety', 'efficacy', 'endpoint',
+    'primary', 'secondary', 'pfs', 'os', 'orr', 'dcr', 'placebo', 'dose', 'combination',
+    'monotherapy', 'retrospective', 'prospective', 'real-world', 'quality', 'life', 'elderly',
+    'radiotherapy', 'surgery', 'resection', 'recurrence', 'relapse', 'remission', 'lymphoma',
+    'leukemia', 'myeloma', 'sarcoma', 'glioblastoma', 'hepatocellular', 'renal', 'bladder',
+    'urothelial', 'cervical', 'endometrial', 'head', 'neck', 'esophageal', 'biliary', 'antibody',
+    'conjugate', 'bispecific', 'car-t', 'vaccine', 'inhibitor', 'tki', 'parp', 'cdk4/6'
+]
+FILLER_WORDS = [
+    'the', 'of', 'and', 'in', 'with', 'was', 'were', 'to', 'a', 'for', 'at', 'by', 'on', 'vs',
+    'from', 'this', 'we', 'as', 'or', 'after', 'than', 'that', 'between', 'among', 'who', 'is',
+    'all', 'no', 'not', 'data', 'study', 'analysis', 'group', 'arm', 'rate', 'results', 'baseline',
+    'significant', 'higher', 'lower', 'similar', 'associated', 'compared', 'observed', 'received',
+    'enrolled', 'evaluated', 'assessed', 'reported', 'included', 'total', 'mean', 'range'
+]
+SECTIONS = ['Background:', 'Methods:', 'Results:', 'Conclusions:']
+TRACKS = [
+    'Breast cancer, early stage', 'Breast cancer, metastatic', 'NSCLC, metastatic',
+    'NSCLC, early stage', 'Gastrointestinal tumours, colorectal', 'Gastrointestinal tumours, upper',
+    'Genitourinary tumours, prostate', 'Genitourinary tumours, non-prostate', 'Gynaecological cancers',
+    'Haematological malignancies', 'Melanoma and other skin tumours', 'Head and neck cancer',
+    'Sarcoma', 'CNS tumours', 'Developmental therapeutics', 'Translational research',
+    'Immunotherapy of cancer', 'Supportive and palliative care', 'Public health and health economics'
+]
+FIRST_NAMES = ['A.', 'B.', 'C.', 'D.', 'E.', 'F.', 'G.', 'H.', 'J.', 'K.', 'L.', 'M.', 'N.', 'P.', 'R.', 'S.', 'T.', 'Y.']
+LAST_NAMES = [
+    'Smith', 'Garcia', 'Müller', 'Rossi', 'Dubois', 'Wang', 'Li', 'Kim', 'Tanaka', 'Silva', 'Novak',
+    'Jensen', 'Cohen', 'Patel', 'Nguyen', 'Kowalski', 'Andersson', 'Moreau', 'Fernández', 'Chen'
+]
+
+# Word frequencies fall off like natural text (Zipf), so search terms vary in selectivity
+VOCABULARY = np.array(DOMAIN_TERMS + FILLER_WORDS + [f"term{i}" for i in range(4000)])
+_ranks = np.arange(1, len(VOCABULARY) + 1)
+WORD_WEIGHTS = (1.0 / _ranks ** 0.9) / (1.0 / _ranks ** 0.9).sum()
+
+
+def generate_abstracts(rows, seed=2025, mean_words=330, duplicate_rate=0.01, empty_rate=0.002):
+    """Build a synthetic abstracts table with the raw ESMO column names"""
+    rng = np.random.RandomState(seed)
+    word_counts = np.clip(rng.normal(mean_words, mean_words * 0.25, size=rows), 40, mean_words * 3).astype(int)
+    words = VOCABULARY[rng.choice(len(VOCABULARY), size=int(word_counts.sum()), p=WORD_WEIGHTS)].astype(object)
+    offsets = np.concatenate([[0], np.cumsum(word_counts)])
+
+    # A sentence break every ~18 words and the four usual section headers
+    positions = np.arange(len(words)) - np.repeat(offsets[:-1], word_counts)
+    sentence_ends = positions % 18 == 17
+    words[sentence_ends] = words[sentence_ends] + '.'
+
+    abstracts = []
+    for i in range(rows):
+        body = words[offsets[i]:offsets[i + 1]].tolist()
+        section_size = -(-len(body) // len(SECTIONS))
+        abstracts.append(' '.join(
+            f"{header} {' '.join(body[k * section_size:(k + 1) * section_size]).rstrip('.')}."
+            for k, header in enumerate(SECTIONS)
+        ))
+
+    title_words = VOCABULARY[rng.choice(80, size=(rows, 12))]
+    df = pd.DataFrame({
+        'Poster ID': [f"{1000 + i}P" for i in range(rows)],
+        'Poster Title': [' '.join(t).capitalize() for t in title_words],
+        'Presenting Author': [
+            f"{FIRST_NAMES[a]} {LAST_NAMES[b]}"
+            for a, b in zip(rng.randint(len(FIRST_NAMES), size=rows), rng.randint(len(LAST_NAMES), size=rows))
+        ],
+        'Category': [TRACKS[t] for t in rng.randint(len(TRACKS), size=rows)],
+        'Abstract': abstracts
+    })
+
+    # A few exact re-submissions and withdrawn (empty) abstracts, as in real exports
+    duplicates = rng.choice(rows, size=int(rows * duplicate_rate), replace=False)
+    if len(duplicates):
+        sources = rng.randint(rows, size=len(duplicates))
+        df.loc[duplicates, 'Abstract'] = df['Abstract'].values[sources]
+    empties = rng.choice(rows, size=int(rows * empty_rate), replace=False)
+    df.loc[empties, 'Abstract'] = ''
+    return df
+
+
+def synthetic_abstracts_file(rows, seed=2025):
+    """Path to a cached synthetic Excel file with the given number of rows"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"synthetic-{rows}-{seed}.xlsx")
+    if not os.path.exists(path):
+        print(f"Generating {rows} synthetic abstracts -> {path}")
+        partial = path + '.partial.xlsx'
+        generate_abstracts(rows, seed).to_excel(partial, index=False)
+        os.replace(partial, path)
+    return path
+
+
+def load_webapp(data_file, base_url=None, name='conference_webapp'):
+    """Import a fresh copy of the app with the given data file (and model endpoint)"""
+    os.environ['ABSTRACTS_FILE'] = data_file
+    if base_url:
+        os.environ['OPENAI_BASE_URL'] = base_url
+    spec = importlib.util.spec_from_file_location(name, WEBAPP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def free_port():
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_url(url, timeout=30):
+    """Poll a URL until it answers"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=2).read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def start_mock_server(latency_median=0.5, latency_sigma=0.5, error_429_rate=0.0, error_500_rate=0.0,
+                      rpm_limit=0, max_concurrent=0, seed=2025):
+    """Run mock-openai-server.py in a subprocess; returns (process, base_url)"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, MOCK_SERVER_PATH, '--port', str(port),
+         '--latency-median', str(latency_median), '--latency-sigma', str(latency_sigma),
+         '--error-429-rate', str(error_429_rate), '--error-500-rate', str(error_500_rate),
+         '--rpm-limit', str(rpm_limit), '--max-concurrent', str(max_concurrent), '--seed', str(seed)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}/v1"
+    wait_for_url(f"{base_url}/models")
+    return process, base_url
+
+
+def mock_stats(base_url):
+    """Counters from the mock server's /stats endpoint"""
+    with urllib.request.urlopen(base_url.rsplit('/v1', 1)[0] + '/stats', timeout=5) as response:
+        return json.loads(response.read())
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def percentiles(values, quantiles=(50, 95, 99)):
+    """Selected percentiles of a list of numbers, rounded for reports"""
+    if not len(values):
+        return {f"p{q}": None for q in quantiles}
+    return {f"p{q}": round(float(np.percentile(values, q)), 4) for q in quantiles}
+
+
+def environment_info():
+    """Details that make results comparable across machines and commits"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=APP_DIR,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def save_report(path, report):
+    """Write a benchmark report as JSON"""
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved results to {path}")
+
+
+def compare_reports(baseline_path, runs, key_fields, metric, higher_is_better=True, threshold=0.15):
+    """Print the change of one metric against matching runs of an earlier report"""
+    with open(baseline_path) as f:
+        baseline = {tuple(r[k] for k in key_fields): r for r in json.load(f)['runs']}
+
+    print(f"\nComparison with {baseline_path} ({metric}):")
+    for run in runs:
+        key = tuple(run[k] for k in key_fields)
+        previous = baseline.get(key)
+        if not previous or not previous.get(metric) or run.get(metric) is None:
+            continue
+        change = (run[metric] - previous[metric]) / previous[metric]
+        # Changes inside the threshold are treated as run-to-run noise
+        worse = -change if higher_is_better else change
+        label = ', '.join(f"{k}={v}" for k, v in zip(key_fields, key))
+        print(f"  {label}: {previous[metric]} -> {run[metric]} ({change:+.1%}{' REGRESSION' if worse > threshold else ''})")
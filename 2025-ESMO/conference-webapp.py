@@ -1,28 +1,57 @@
 #!/usr/bin/env python3
 """
 ESMO 2025 Abstract Annotator - Conference Web Application
-Run this single file to start the web application.
+Run this file (with the static/ directory next to it) to start the web application.
 
 Usage:
     python conference-webapp.py
 """
 
 import os
+import sys
 import json
+import tempfile
 import pandas as pd
-from flask import Flask, render_template_string, request, jsonify, send_file
+from flask import Flask, render_template_string, request, jsonify, send_file, send_from_directory, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import threading
 import time
 import random
 import hashlib
+import hmac
 from datetime import datetime, timedelta
 import io
 import gc
-
-# HTML Template embedded as string
+import shutil
+import re
+import zlib
+import base64
+import functools
+import itertools
+import glob
+import mimetypes
+from collections import deque, OrderedDict
+import numpy as np
+
+try:
+    import orjson   # Optional: faster JSON encoding of API responses
+except ImportError:
+    orjson = None
+
+try:
+    import brotli   # Optional: brotli response compression (gzip otherwise)
+except ImportError:
+    brotli = None
+
+try:
+    import pyarrow  # Optional: Arrow-backed text columns (less memory, vectorized string matching)
+except ImportError:
+    pyarrow = None
+
+# HTML shell embedded as string; styles and scripts live in static/ (see fingerprint_assets)
 HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
@@ -30,497 +59,7 @@ HTML_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>ESMO 2025 Abstract Annotator</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background-color: #f5f5f5;
-            color: #333;
-        }
-        
-        .container {
-            max-width: 95%;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        
-        header {
-            background-color: #2c3e50;
-            color: white;
-            padding: 20px 0;
-            margin-bottom: 30px;
-        }
-        
-        h1 {
-            text-align: center;
-            font-size: 2rem;
-        }
-        
-        .stats {
-            background-color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            margin-bottom: 20px;
-            display: flex;
-            justify-content: space-around;
-        }
-        
-        .stat-item {
-            text-align: center;
-        }
-        
-        .stat-value {
-            font-size: 2rem;
-            font-weight: bold;
-            color: #3498db;
-        }
-        
-        .controls {
-            background-color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            margin-bottom: 20px;
-        }
-        
-        .search-box {
-            background-color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            margin-bottom: 20px;
-        }
-        
-        .annotate-box {
-            background-color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            margin-bottom: 20px;
-        }
-        
-        .advanced-settings {
-            margin-top: 15px;
-            border-top: 1px solid #eee;
-            padding-top: 15px;
-        }
-        
-        .settings-toggle {
-            cursor: pointer;
-            color: #3498db;
-            font-weight: 500;
-            margin-bottom: 10px;
-            display: inline-block;
-        }
-        
-        .settings-toggle:hover {
-            color: #2980b9;
-        }
-        
-        .settings-content {
-            display: none;
-            margin-top: 10px;
-        }
-        
-        .settings-content.show {
-            display: block;
-        }
-        
-        .control-group {
-            margin-bottom: 15px;
-        }
-        
-        label {
-            display: block;
-            margin-bottom: 5px;
-            font-weight: 500;
-        }
-        
-        input, select, textarea {
-            width: 100%;
-            padding: 8px 12px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            font-size: 14px;
-        }
-        
-        textarea {
-            resize: vertical;
-            min-height: 80px;
-        }
-        
-        .button-group {
-            display: flex;
-            gap: 10px;
-            margin-top: 20px;
-        }
-        
-        button {
-            padding: 10px 20px;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 500;
-            transition: background-color 0.2s;
-        }
-        
-        .btn-primary {
-            background-color: #3498db;
-            color: white;
-        }
-        
-        .btn-primary:hover {
-            background-color: #2980b9;
-        }
-        
-        .btn-secondary {
-            background-color: #95a5a6;
-            color: white;
-        }
-        
-        .btn-secondary:hover {
-            background-color: #7f8c8d;
-        }
-        
-        .btn-success {
-            background-color: #27ae60;
-            color: white;
-        }
-        
-        .btn-success:hover {
-            background-color: #229954;
-        }
-        
-        .table-container {
-            background-color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            overflow-x: auto;
-            width: 100%;
-        }
-        
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            table-layout: auto;
-            min-width: 1200px; /* Ensure table has minimum width for all columns */
-        }
-        
-        th, td {
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-            border-right: 1px solid #eee;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        th {
-            background-color: #f8f9fa;
-            font-weight: 600;
-            position: sticky;
-            top: 0;
-            user-select: none;
-        }
-        
-        th:last-child, td:last-child {
-            border-right: none;
-        }
-        
-        tr:hover {
-            background-color: #f8f9fa;
-        }
-        
-        /* Column widths for new order */
-        th:nth-child(1), td:nth-child(1) { /* Abstract # */
-            width: 80px;
-            min-width: 80px;
-        }
-
-        th:nth-child(2), td:nth-child(2) { /* Track */
-            width: 150px;
-            min-width: 120px;
-        }
-
-        th:nth-child(3), td:nth-child(3) { /* Author */
-            width: 120px;
-            min-width: 100px;
-        }
-
-        th:nth-child(4), td:nth-child(4) { /* Abstract title */
-            width: 200px;
-            min-width: 150px;
-        }
-
-        th:nth-child(5), td:nth-child(5) { /* Abstract */
-            width: 300px;
-            min-width: 250px;
-        }
-
-        th:nth-child(6), td:nth-child(6) { /* Matched Keywords */
-            width: 120px;
-            min-width: 100px;
-            background-color: #fff3cd;
-        }
-
-        td:nth-child(6) {
-            background-color: #fffbf0;
-            font-style: italic;
-        }
-
-        /* Annotation columns */
-        th:nth-child(7), td:nth-child(7),
-        th:nth-child(8), td:nth-child(8) {
-            width: 150px;
-            min-width: 120px;
-        }
-        
-        .abstract-cell {
-            position: relative;
-            padding-right: 60px;
-            max-width: 250px;
-        }
-        
-        .abstract-preview {
-            overflow: hidden;
-            text-overflow: ellipsis;
-            white-space: nowrap;
-            display: block;
-            max-width: calc(100% - 30px);
-        }
-        
-        .abstract-cell.expanded .abstract-preview {
-            white-space: normal;
-            word-wrap: break-word;
-            overflow: visible;
-            background-color: #f8f9fa;
-            padding: 10px;
-            border-radius: 4px;
-            line-height: 1.5;
-            max-height: 300px;
-            overflow-y: auto;
-            max-width: 400px;
-        }
-        
-        .expand-button {
-            position: absolute;
-            right: 30px;
-            top: 50%;
-            transform: translateY(-50%);
-            background-color: #3498db;
-            color: white;
-            border: none;
-            border-radius: 3px;
-            padding: 2px 6px;
-            font-size: 14px;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.2s;
-            z-index: 10;
-            line-height: 1;
-        }
-
-        .expand-button:hover {
-            background-color: #2980b9;
-        }
-
-        .abstract-cell.expanded .expand-button {
-            top: 12px;
-            transform: none;
-        }
-
-        .modal-button {
-            position: absolute;
-            right: 5px;
-            top: 50%;
-            transform: translateY(-50%);
-            background-color: #9b59b6;
-            color: white;
-            border: none;
-            border-radius: 3px;
-            padding: 2px 6px;
-            font-size: 14px;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.2s;
-            z-index: 10;
-            line-height: 1;
-        }
-
-        .modal-button:hover {
-            background-color: #8e44ad;
-        }
-
-        .abstract-cell.expanded .modal-button {
-            top: 12px;
-            transform: none;
-        }
-        
-        .pagination {
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            gap: 10px;
-            margin-top: 20px;
-        }
-        
-        .page-info {
-            margin: 0 20px;
-        }
-        
-        .progress-container {
-            display: none;
-            background-color: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            margin-bottom: 20px;
-        }
-        
-        .progress-bar {
-            width: 100%;
-            height: 30px;
-            background-color: #ecf0f1;
-            border-radius: 15px;
-            overflow: hidden;
-            margin: 10px 0;
-        }
-        
-        .progress-fill {
-            height: 100%;
-            background-color: #3498db;
-            transition: width 0.3s ease;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-weight: bold;
-        }
-        
-        .modal {
-            display: none;
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background-color: rgba(0,0,0,0.7);
-            overflow: auto;
-        }
-
-        .modal-content {
-            background-color: white;
-            margin: 5% auto;
-            padding: 30px;
-            border-radius: 8px;
-            width: 90%;
-            max-width: 900px;
-            max-height: 85vh;
-            overflow-y: auto;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-        }
-
-        .modal-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 20px;
-            padding-bottom: 15px;
-            border-bottom: 2px solid #eee;
-        }
-
-        .modal-title {
-            font-size: 1.3rem;
-            font-weight: bold;
-            color: #2c3e50;
-            flex: 1;
-            margin-right: 20px;
-        }
-
-        .close {
-            color: #aaa;
-            font-size: 32px;
-            font-weight: bold;
-            cursor: pointer;
-            line-height: 1;
-            transition: color 0.2s;
-        }
-
-        .close:hover {
-            color: #000;
-        }
-
-        .modal-abstract-text {
-            line-height: 1.8;
-            font-size: 1rem;
-            color: #333;
-            white-space: pre-wrap;
-        }
-
-        .modal-abstract-text strong {
-            color: #2c3e50;
-            font-weight: 700;
-        }
-
-        .keyword-highlight {
-            background-color: #ffeb3b;
-            padding: 2px 4px;
-            border-radius: 3px;
-            font-weight: 500;
-        }
-
-        .modal-info {
-            background-color: #f8f9fa;
-            padding: 15px;
-            border-radius: 5px;
-            margin-bottom: 20px;
-            font-size: 0.95rem;
-        }
-
-        .modal-info-item {
-            margin-bottom: 8px;
-        }
-
-        .modal-info-label {
-            font-weight: 600;
-            color: #555;
-            display: inline-block;
-            min-width: 100px;
-        }
-        
-        .checkbox-group {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-        
-        .checkbox-group input {
-            width: auto;
-        }
-        
-        .error {
-            color: #e74c3c;
-            margin-top: 10px;
-        }
-        
-        .success {
-            color: #27ae60;
-            margin-top: 10px;
-        }
-        
-        input[type="file"] {
-            padding: 4px;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_urls['app.css'] }}">
 </head>
 <body>
     <header>
@@ -549,9 +88,12 @@ HTML_TEMPLATE = """
         
         <!-- Search Box -->
         <div class="search-box">
-            <div class="control-group">
+            <div class="control-group instant-search">
                 <label for="searchInput">Search Abstracts (separate multiple keywords with semicolon):</label>
-                <input type="text" id="searchInput" placeholder="e.g., breast cancer; immunotherapy; PD-L1" onkeypress="handleSearchKeyPress(event)">
+                <input type="text" id="searchInput" placeholder="e.g., breast cancer; immunotherapy; PD-L1" autocomplete="off"
+                       onkeypress="handleSearchKeyPress(event)" onkeydown="handleSearchKeyDown(event)"
+                       oninput="handleSearchInput()" onblur="hideInstantResults()">
+                <div id="instantResults" class="instant-results"></div>
             </div>
             
             <div class="button-group">
@@ -567,10 +109,20 @@ HTML_TEMPLATE = """
             <h3>Annotation Settings</h3>
             
             <div class="control-group">
-                <label for="questionInput">Annotation Question:</label>
+                <label for="questionInput">Annotation Question (one per line to ask several in a single pass):</label>
                 <textarea id="questionInput" placeholder="Enter the question you want to ask about each abstract (e.g. what is the treatment modality?)"></textarea>
             </div>
             
+            <div class="control-group">
+                <label for="fieldsInput">Extraction Fields (optional, one per line as name: type[: value1|value2]; types are number, integer, boolean, category, string):</label>
+                <textarea id="fieldsInput" placeholder="e.g.&#10;phase: category: I|II|III|IV&#10;sample_size: integer&#10;randomized: boolean"></textarea>
+            </div>
+            
+            <div class="control-group">
+                <label for="guidanceInput">Additional Instructions (optional definitions or examples, sent once per abstract before it and cached by the provider):</label>
+                <textarea id="guidanceInput" placeholder="e.g. Treat neoadjuvant and adjuvant settings as different answers."></textarea>
+            </div>
+            
             <div class="advanced-settings">
                 <div class="settings-toggle" onclick="toggleAnnotationSettings()">
                     ▶ Advanced Settings
@@ -589,6 +141,16 @@ HTML_TEMPLATE = """
                         </select>
                     </div>
                     
+                    <div class="control-group">
+                        <label for="cascadeModelSelect">Escalate unclear answers to (model cascade):</label>
+                        <select id="cascadeModelSelect">
+                            <option value="" selected>No cascade</option>
+                            <option value="gpt-5-mini">GPT-5 Mini</option>
+                            <option value="gpt-5">GPT-5</option>
+                            <option value="gpt-4o">GPT-4o</option>
+                        </select>
+                    </div>
+                    
                     <div class="control-group">
                         <label for="apiKey">OpenAI API Key:</label>
                         <input type="password" id="apiKey" placeholder="sk-..." value="{{ openai_api_key }}">
@@ -599,6 +161,21 @@ HTML_TEMPLATE = """
                         <input type="number" id="numThreads" min="1" max="200" value="100">
                     </div>
                     
+                    <div class="control-group">
+                        <label for="requestTimeout">Per-request timeout (seconds):</label>
+                        <input type="number" id="requestTimeout" min="5" max="600" value="120">
+                    </div>
+                    
+                    <div class="checkbox-group">
+                        <input type="checkbox" id="hedgeRequests">
+                        <label for="hedgeRequests">Hedge slow requests (re-send calls slower than the recent p95 and keep the first answer)</label>
+                    </div>
+                    
+                    <div class="checkbox-group">
+                        <input type="checkbox" id="adaptiveConcurrency">
+                        <label for="adaptiveConcurrency">Adaptive concurrency (Number of Threads becomes the upper limit)</label>
+                    </div>
+                    
                     <div class="control-group">
                         <label for="perPage">Results per page:</label>
                         <select id="perPage">
@@ -610,6 +187,11 @@ HTML_TEMPLATE = """
                         </select>
                     </div>
                     
+                    <div class="checkbox-group">
+                        <input type="checkbox" id="continuousScroll" checked>
+                        <label for="continuousScroll">Continuous scroll (load abstracts while scrolling instead of by page)</label>
+                    </div>
+                    
                     <div class="checkbox-group">
                         <input type="checkbox" id="dryRun">
                         <label for="dryRun">Dry Run (no API calls)</label>
@@ -619,10 +201,16 @@ HTML_TEMPLATE = """
                         <input type="checkbox" id="showEmptyAbstracts" checked>
                         <label for="showEmptyAbstracts">Show rows without abstract text</label>
                     </div>
+
+                    <div class="checkbox-group">
+                        <input type="checkbox" id="dedupeNearDuplicates">
+                        <label for="dedupeNearDuplicates">Annotate one abstract per near-duplicate group</label>
+                    </div>
                 </div>
             </div>
             
             <div class="button-group">
+                <button class="btn-secondary" onclick="estimateAnnotation()">Estimate Cost &amp; Time</button>
                 <button class="btn-success" onclick="startAnnotation()">Start Annotation</button>
             </div>
             
@@ -640,6 +228,8 @@ HTML_TEMPLATE = """
         
         <!-- Table -->
         <div class="table-container">
+            <div id="facetPanel" class="facet-panel"></div>
+            <div id="tableScroller" class="table-scroller">
             <table id="abstractsTable">
                 <thead>
                     <tr>
@@ -654,6 +244,7 @@ HTML_TEMPLATE = """
                     <!-- Data will be populated here -->
                 </tbody>
             </table>
+            </div>
             
             <div class="pagination">
                 <button onclick="previousPage()" id="prevBtn">Previous</button>
@@ -679,553 +270,213 @@ HTML_TEMPLATE = """
         </div>
     </div>
 
-    <script>
-        let currentPage = 1;
-        let totalPages = 1;
-        let currentTaskId = null;
-        let progressInterval = null;
-        let isShowingAnnotated = false;
-        let currentFilteredTotal = 0;  // Track filtered total
-        
-        // Load statistics on page load
-        window.onload = function() {
-            loadStats();
-            loadAbstracts();
-            
-            // Add event listeners
-            document.getElementById('showEmptyAbstracts').addEventListener('change', function() {
-                loadAbstracts(1);  // Reload from page 1 when toggling
-            });
-            
-            document.getElementById('perPage').addEventListener('change', function() {
-                loadAbstracts(1);  // Reload from page 1 when changing per page
-            });
-        };
-        
-        function handleSearchKeyPress(event) {
-            if (event.key === 'Enter') {
-                searchAbstracts();
-            }
-        }
-        
-        function toggleAbstract(button) {
-            const cell = button.closest('.abstract-cell');
-            const preview = cell.querySelector('.abstract-preview');
-
-            if (cell.classList.contains('expanded')) {
-                cell.classList.remove('expanded');
-                button.textContent = '+';
-                button.style.top = '50%';
-                button.style.transform = 'translateY(-50%)';
-            } else {
-                // Get the original text and apply formatting
-                const originalText = preview.getAttribute('data-original-text');
-                if (originalText && !preview.getAttribute('data-formatted')) {
-                    const formattedText = formatAbstractText(originalText);
-                    preview.innerHTML = formattedText;
-                    preview.setAttribute('data-formatted', 'true');
-                }
-
-                cell.classList.add('expanded');
-                button.textContent = '−';
-                button.style.top = '12px';
-                button.style.transform = 'none';
-            }
-        }
-        
-        function toggleAnnotationSettings() {
-            const settings = document.getElementById('annotationAdvancedSettings');
-            const toggle = document.querySelector('.annotate-box .settings-toggle');
-            
-            if (settings.classList.contains('show')) {
-                settings.classList.remove('show');
-                toggle.innerHTML = '▶ Advanced Settings';
-            } else {
-                settings.classList.add('show');
-                toggle.innerHTML = '▼ Advanced Settings';
-            }
-        }
-        
-        function resetSearch() {
-            document.getElementById('searchInput').value = '';
-            document.getElementById('searchMessage').innerHTML = '';
-            loadAbstracts(1);
-        }
-        
-        function showSearchMessage(message, type = 'info') {
-            const messageEl = document.getElementById('searchMessage');
-            messageEl.className = type;
-            messageEl.textContent = message;
-            setTimeout(() => {
-                messageEl.textContent = '';
-            }, 5000);
-        }
-        
-        function showMessage(message, type = 'error') {
-            const messageEl = document.getElementById('message');
-            messageEl.className = type;
-            messageEl.textContent = message;
-            
-            // Add download button if annotation is complete
-            if (message.includes('completed successfully') && currentTaskId) {
-                messageEl.innerHTML = message + ' <button class="btn-success" style="margin-left: 10px;" onclick="downloadResults()">Download Now</button>';
-            }
-            
-            setTimeout(() => {
-                messageEl.textContent = '';
-            }, 10000); // Show for longer when download is available
-        }
-        
-        function loadStats() {
-            fetch('/api/stats')
-                .then(response => response.json())
-                .then(data => {
-                    document.getElementById('totalAbstracts').textContent = data.total_abstracts.toLocaleString();
-                    document.getElementById('abstractsWithText').textContent = data.abstracts_with_text.toLocaleString();
-                })
-                .catch(error => console.error('Error loading stats:', error));
-        }
-        
-        function loadAbstracts(page = 1) {
-            const search = document.getElementById('searchInput').value;
-            const showEmpty = document.getElementById('showEmptyAbstracts').checked;
-            const perPage = document.getElementById('perPage').value;
-            
-            fetch('/api/abstracts?page=' + page + '&per_page=' + perPage + '&search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty)
-                .then(response => response.json())
-                .then(data => {
-                    currentPage = data.page;
-                    totalPages = data.total_pages;
-                    isShowingAnnotated = false;
-                    currentFilteredTotal = data.total;  // Store filtered total
-                    
-                    // Update filtered count in stats
-                    document.getElementById('totalAbstracts').textContent = data.total.toLocaleString();
-                    
-                    // Update table
-                    const tbody = document.getElementById('tableBody');
-                    tbody.innerHTML = '';
-                    
-                    // Reset table headers to default
-                    const thead = document.querySelector('#abstractsTable thead tr');
-                    thead.innerHTML = '<th>Abstract #</th><th>Track</th><th>Author</th><th>Abstract Title</th><th>Abstract</th>' +
-                        (search ? '<th>Matched Keywords</th>' : '');
-                    
-                    data.data.forEach(row => {
-                        const tr = document.createElement('tr');
-                        const abstractText = row['Abstract'] || '';
-                        const hasAbstract = abstractText && abstractText !== '-' && abstractText !== '0';
-                        
-                        // Escape HTML in abstract text
-                        const escapeHtml = (text) => {
-                            const div = document.createElement('div');
-                            div.textContent = text;
-                            return div.innerHTML;
-                        };
-                        
-                        tr.innerHTML = '<td>' + (row['Abstract #'] || '-') + '</td>' +
-                            '<td>' + (row['Track'] || '-') + '</td>' +
-                            '<td>' + (row['First Author'] || '-') + '</td>' +
-                            '<td>' + (row['Abstract title'] || '-') + '</td>' +
-                            '<td class="abstract-cell">' +
-                                (hasAbstract ?
-                                    '<div class="abstract-preview" data-original-text="' + escapeHtml(abstractText) + '">' + escapeHtml(abstractText) + '</div>' +
-                                    '<button class="expand-button" onclick="toggleAbstract(this)">+</button>' +
-                                    '<button class="modal-button" onclick="openModal(this)" title="Open in modal view">⊡</button>' :
-                                    '-') +
-                            '</td>' +
-                            (search && row['Matched Keywords'] ? '<td>' + escapeHtml(row['Matched Keywords']) + '</td>' : (search ? '<td>-</td>' : ''));
-
-                        // Store row data for modal access
-                        if (hasAbstract) {
-                            const abstractCell = tr.querySelector('.abstract-cell');
-                            abstractCell.dataset.rowData = JSON.stringify(row);
-                        }
-
-                        tbody.appendChild(tr);
-                    });
-                    
-                    // Update pagination
-                    document.getElementById('pageInfo').textContent = 'Page ' + currentPage + ' of ' + totalPages;
-                    document.getElementById('prevBtn').disabled = currentPage === 1;
-                    document.getElementById('nextBtn').disabled = currentPage === totalPages;
-                    
-                    // Show search complete message
-                    if (search) {
-                        showSearchMessage('Search complete! Found ' + data.total + ' matching abstracts.', 'success');
-                    }
-                })
-                .catch(error => console.error('Error loading abstracts:', error));
-        }
-        
-        function searchAbstracts() {
-            isShowingAnnotated = false;
-            currentTaskId = null;
-            loadAbstracts(1);
-        }
-        
-        function previousPage() {
-            if (currentPage > 1) {
-                if (isShowingAnnotated && currentTaskId) {
-                    loadAnnotatedResults(currentPage - 1);
-                } else {
-                    loadAbstracts(currentPage - 1);
-                }
-            }
-        }
-        
-        function nextPage() {
-            if (currentPage < totalPages) {
-                if (isShowingAnnotated && currentTaskId) {
-                    loadAnnotatedResults(currentPage + 1);
-                } else {
-                    loadAbstracts(currentPage + 1);
-                }
-            }
-        }
-        
-        function startAnnotation() {
-            const question = document.getElementById('questionInput').value.trim();
-            const apiKey = document.getElementById('apiKey').value.trim();
-            const model = document.getElementById('modelSelect').value;
-            const numThreads = parseInt(document.getElementById('numThreads').value);
-            const dryRun = document.getElementById('dryRun').checked;
-            const searchFilter = document.getElementById('searchInput').value;
-            const showEmpty = document.getElementById('showEmptyAbstracts').checked;
-            
-            if (!question) {
-                showMessage('Please enter a question to ask about the abstracts', 'error');
-                return;
-            }
-            
-            if (!dryRun && !apiKey) {
-                showMessage('Please enter your OpenAI API key or enable dry run', 'error');
-                return;
-            }
-            
-            // Show progress container
-            document.getElementById('progressContainer').style.display = 'block';
-            document.getElementById('progressFill').style.width = '0%';
-            document.getElementById('progressFill').textContent = '0%';
-            
-            const requestData = {
-                question: question,
-                api_key: apiKey,
-                model: model,
-                num_threads: numThreads,
-                dry_run: dryRun,
-                search_filter: searchFilter,
-                show_empty: showEmpty
-            };
-            
-            fetch('/api/annotate', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify(requestData)
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.task_id) {
-                    currentTaskId = data.task_id;
-                    document.getElementById('progressText').textContent = 'Processing ' + data.total + ' abstracts...';
-                    startProgressTracking();
-                } else {
-                    showMessage('Failed to start annotation', 'error');
-                }
-            })
-            .catch(error => {
-                showMessage('Error: ' + error, 'error');
-                document.getElementById('progressContainer').style.display = 'none';
-            });
-        }
-        
-        function startProgressTracking() {
-            if (progressInterval) {
-                clearInterval(progressInterval);
-            }
-
-            progressInterval = setInterval(() => {
-                if (!currentTaskId) return;
-
-                fetch('/api/progress/' + currentTaskId)
-                    .then(response => response.json())
-                    .then(data => {
-                        // Safely calculate percentage, avoiding NaN
-                        let percentage = 0;
-                        if (data.total && data.total > 0) {
-                            percentage = Math.round((data.completed / data.total) * 100);
-                            // Clamp between 0 and 100
-                            percentage = Math.max(0, Math.min(100, percentage));
-                        }
-
-                        document.getElementById('progressFill').style.width = percentage + '%';
-                        document.getElementById('progressFill').textContent = percentage + '%';
-
-                        if (data.status === 'completed') {
-                            clearInterval(progressInterval);
-                            document.getElementById('progressFill').style.width = '100%';
-                            document.getElementById('progressFill').textContent = '100%';
-                            document.getElementById('progressText').textContent = 'Annotation completed!';
-                            showMessage('Annotation completed successfully!', 'success');
-
-                            // Reload the table to show the new annotation column
-                            loadAnnotatedResults();
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error tracking progress:', error);
-                    });
-            }, 1000);
-        }
-        
-        function loadAnnotatedResults(page = 1) {
-            // Load the annotated results and update the table
-            if (!currentTaskId) return;
-            
-            isShowingAnnotated = true;
-            const perPage = document.getElementById('perPage').value;
-            
-            fetch('/api/annotated/' + currentTaskId + '?page=' + page + '&per_page=' + perPage)
-                .then(response => response.json())
-                .then(data => {
-                    if (data.error) {
-                        console.error('Error loading annotated results:', data.error);
-                        return;
-                    }
-                    
-                    currentPage = data.page;
-                    totalPages = data.total_pages;
-                    
-                    // Update table headers if new columns exist
-                    if (data.columns && data.columns.length > 0) {
-                        const thead = document.querySelector('#abstractsTable thead tr');
-                        thead.innerHTML = '';
-                        
-                        // Add standard columns in new order
-                        const standardColumns = [
-                            {name: 'Abstract #', field: 'Abstract #'},
-                            {name: 'Track', field: 'Track'},
-                            {name: 'Author', field: 'First Author'},
-                            {name: 'Abstract Title', field: 'Abstract title'},
-                            {name: 'Abstract', field: 'Abstract'}
-                        ];
-                        
-                        standardColumns.forEach(col => {
-                            const th = document.createElement('th');
-                            th.textContent = col.name;
-                            thead.appendChild(th);
-                        });
-                        
-                        // Add matched keywords column if present
-                        if (data.columns.includes('Matched Keywords')) {
-                            const th = document.createElement('th');
-                            th.textContent = 'Matched Keywords';
-                            th.style.backgroundColor = '#fff3cd';
-                            thead.appendChild(th);
-                        }
-                        
-                        // Add annotation columns
-                        data.columns.forEach(col => {
-                            if (col.startsWith('Answer:')) {
-                                const th = document.createElement('th');
-                                th.textContent = col;
-                                th.style.backgroundColor = '#e8f5e9';
-                                thead.appendChild(th);
-                            }
-                        });
-                    }
-                    
-                    // Update table body
-                    const tbody = document.getElementById('tableBody');
-                    tbody.innerHTML = '';
-                    
-                    data.data.forEach(row => {
-                        const tr = document.createElement('tr');
-                        const abstractText = row['Abstract'] || '';
-                        const hasAbstract = abstractText && abstractText !== '-' && abstractText !== '0';
-                        
-                        // Escape HTML in text
-                        const escapeHtml = (text) => {
-                            const div = document.createElement('div');
-                            div.textContent = text;
-                            return div.innerHTML;
-                        };
-                        
-                        // Add standard columns with expandable abstract in new order
-                        let html = '<td>' + (row['Abstract #'] || '-') + '</td>' +
-                            '<td>' + (row['Track'] || '-') + '</td>' +
-                            '<td>' + (row['First Author'] || '-') + '</td>' +
-                            '<td>' + (row['Abstract title'] || '-') + '</td>' +
-                            '<td class="abstract-cell">' +
-                                (hasAbstract ?
-                                    '<div class="abstract-preview" data-original-text="' + escapeHtml(abstractText) + '">' + escapeHtml(abstractText) + '</div>' +
-                                    '<button class="expand-button" onclick="toggleAbstract(this)">+</button>' +
-                                    '<button class="modal-button" onclick="openModal(this)" title="Open in modal view">⊡</button>' :
-                                    '-') +
-                            '</td>';
-
-                        // Add matched keywords if present
-                        if (data.columns.includes('Matched Keywords')) {
-                            html += '<td style="background-color: #fffbf0; font-style: italic;">' + escapeHtml(row['Matched Keywords'] || '-') + '</td>';
-                        }
-
-                        tr.innerHTML = html;
-
-                        // Add annotation columns
-                        data.columns.forEach(col => {
-                            if (col.startsWith('Answer:')) {
-                                const td = document.createElement('td');
-                                td.textContent = row[col] || '-';
-                                td.style.backgroundColor = '#f1f8e9';
-                                tr.appendChild(td);
-                            }
-                        });
-
-                        // Store row data for modal access
-                        if (hasAbstract) {
-                            const abstractCell = tr.querySelector('.abstract-cell');
-                            abstractCell.dataset.rowData = JSON.stringify(row);
-                        }
-
-                        tbody.appendChild(tr);
-                    });
-                                            
-                    // Update pagination
-                    document.getElementById('pageInfo').textContent = 'Page ' + data.page + ' of ' + data.total_pages;
-                    document.getElementById('prevBtn').disabled = data.page === 1;
-                    document.getElementById('nextBtn').disabled = data.page === data.total_pages;
-                })
-                .catch(error => console.error('Error loading annotated results:', error));
-        }
-        
-        function downloadResults() {
-            if (currentTaskId && isShowingAnnotated) {
-                // Download annotated results
-                window.location.href = '/api/download/' + currentTaskId;
-            } else {
-                // Download current filtered view
-                const search = document.getElementById('searchInput').value;
-                const showEmpty = document.getElementById('showEmptyAbstracts').checked;
-
-                window.location.href = '/api/download/current?search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty;
-            }
-        }
-
-        // Format abstract text with bold section headers
-        function formatAbstractText(text) {
-            if (!text) return text;
-
-            // Escape HTML first to prevent XSS
-            const div = document.createElement('div');
-            div.textContent = text;
-            let formatted = div.innerHTML;
-
-            // List of section headers to make bold
-            const headers = ['Background', 'Methods', 'Results', 'Conclusions', 'Legal entity responsible for the study', 'Disclosure'];
-
-            headers.forEach(header => {
-                // Match header at start of text or after period/newline/space
-                const regex = new RegExp(`(^|\\. |\\n)(${header})([:  ])`, 'gi');
-                formatted = formatted.replace(regex, '$1<strong>$2</strong>$3');
-            });
-
-            return formatted;
-        }
-
-        // Highlight keywords in text
-        function highlightKeywords(text, keywords) {
-            if (!text || !keywords) return text;
-
-            let highlighted = text;
-            const keywordList = keywords.split(';').map(k => k.trim()).filter(k => k);
-
-            keywordList.forEach(keyword => {
-                // Escape special regex characters in the keyword
-                const escapedKeyword = keyword.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&');
-                const regex = new RegExp(`(${escapedKeyword})`, 'gi');
-                highlighted = highlighted.replace(regex, '<span class="keyword-highlight">$1</span>');
-            });
-
-            return highlighted;
-        }
-
-        // Open modal from button click
-        function openModal(button) {
-            const cell = button.closest('.abstract-cell');
-            const rowData = JSON.parse(cell.dataset.rowData);
-            showAbstractModal(rowData);
-        }
-
-        // Show abstract in modal
-        function showAbstractModal(row) {
-            const modal = document.getElementById('abstractModal');
-            const modalTitle = document.getElementById('modalTitle');
-            const modalInfo = document.getElementById('modalInfo');
-            const modalAbstractText = document.getElementById('modalAbstractText');
-
-            // Set title
-            modalTitle.textContent = row['Abstract title'] || 'Abstract';
-
-            // Set info
-            let infoHTML = '';
-            if (row['Abstract #']) {
-                infoHTML += `<div class="modal-info-item"><span class="modal-info-label">Abstract #:</span> ${row['Abstract #']}</div>`;
-            }
-            if (row['First Author']) {
-                infoHTML += `<div class="modal-info-item"><span class="modal-info-label">Author:</span> ${row['First Author']}</div>`;
-            }
-            if (row['Track']) {
-                infoHTML += `<div class="modal-info-item"><span class="modal-info-label">Track:</span> ${row['Track']}</div>`;
-            }
-            if (row['Matched Keywords']) {
-                infoHTML += `<div class="modal-info-item"><span class="modal-info-label">Keywords:</span> ${row['Matched Keywords']}</div>`;
-            }
-            modalInfo.innerHTML = infoHTML;
-
-            // Set abstract text with formatting
-            let abstractText = row['Abstract'] || 'No abstract available';
-            abstractText = formatAbstractText(abstractText);
-
-            if (row['Matched Keywords']) {
-                abstractText = highlightKeywords(abstractText, row['Matched Keywords']);
-            }
-
-            modalAbstractText.innerHTML = abstractText;
-
-            // Show modal
-            modal.style.display = 'block';
-        }
-
-        // Close modal
-        function closeAbstractModal() {
-            document.getElementById('abstractModal').style.display = 'none';
-        }
-
-        // Close modal when clicking outside
-        window.onclick = function(event) {
-            const modal = document.getElementById('abstractModal');
-            if (event.target == modal) {
-                modal.style.display = 'none';
-            }
-        }
-    </script>
+    <script src="{{ asset_urls['app.js'] }}"></script>
 </body>
 </html>
 """
 
-app = Flask(__name__)
+# Static assets are served under content-hashed names by static_asset()
+app = Flask(__name__, static_folder=None)
 CORS(app)
 
 # Global variables for progress tracking
+progress_lock = threading.Lock()
 annotation_progress = {}
+recent_call_latencies = {}  # model -> deque of recent real call latencies (seconds)
 annotation_results = {}
 annotation_timestamps = {}  # Track creation time for cleanup
+usage_by_api_key = {}  # API key label -> model -> token and cost totals (process lifetime)
+result_snapshots = OrderedDict()  # Snapshot id -> cached query result for cursor paging (LRU)
+snapshot_lock = threading.Lock()
 
 # Constants
 RESULT_EXPIRATION_HOURS = 24
 
+# Query results kept for cursor pagination (least recently used are dropped first)
+RESULT_SNAPSHOT_CACHE_SIZE = 32
+
+# Load-time dtype compaction (see compact_dtypes)
+CATEGORY_MAX_UNIQUE_RATIO = 0.05    # Text columns with at most this many distinct values per row become categorical
+CATEGORY_MAX_VALUES = 1000          # ... and never more distinct values than this
+TEXT_DTYPE = 'string[pyarrow]' if pyarrow is not None else None    # Other text columns; None keeps object
+
+# Search-as-you-type over a word-prefix index of these columns
+INSTANT_SEARCH_COLUMNS = ('Abstract title', 'Abstract', 'First Author', 'Track', 'Abstract #')
+INSTANT_SEARCH_RESULT_FIELDS = {'Abstract #', 'Abstract title', 'First Author', 'Track'}
+INSTANT_SEARCH_MIN_CHARS = 2        # Shorter queries match most of the vocabulary
+INSTANT_SEARCH_MAX_RESULTS = 50
+
+# Autocomplete over terms mined from titles and abstracts, first authors and tracks
+SUGGEST_TERM_COLUMNS = ('Abstract title', 'Abstract')
+SUGGEST_VALUE_COLUMNS = {'First Author': 'author', 'Track': 'track'}
+SUGGEST_KINDS = ('term', 'author', 'track')
+SUGGEST_TERM_PATTERN = r'\w(?:[\w-]*\w)?'     # Keeps PD-L1, T-DXd and 5-FU whole
+SUGGEST_MIN_TERM_CHARS = 3
+SUGGEST_MAX_RESULTS = 20
+SUGGEST_MAX_TERM_SHARE = 0.5        # Terms in more abstracts than this are too common to suggest
+SUGGEST_STOPWORDS = frozenset('''
+    about above after again against all also although among and any are because been before being below
+    between both but can could did does doing down during each either few for from further had has have
+    having here how however into its itself may might more most much must nor not now off once only other
+    our out over own per respectively same should since some such than that the their them then there
+    thereby therefore these they this those though through thus too under until upon very via was were
+    what when where whereas whether which while whilst who whom why will with within without would yet
+'''.split())
+
+# Structures derived from the loaded table (search and suggest indexes, near-duplicate
+# groups) are saved here under the data version, so restarts and other workers load
+# them instead of rebuilding. Set DATA_CACHE_DIR=off to always rebuild.
+DATA_CACHE_DIR = os.environ.get('DATA_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'esmo-data-cache')
+
+# Columns whose per-cell JSON is kept in memory after loading: 'auto' only encodes
+# list- or dict-valued columns ahead of time (scalars are cheap to encode per page),
+# 'all' every column (about the table's size again in memory), 'off' none
+PRECOMPUTE_JSON = os.environ.get('PRECOMPUTE_JSON', 'auto').lower()
+
+# Facets counted over every query result and usable as filters (?facet=Track:...).
+# Multi-valued columns list their values separated by the given string.
+FACET_COLUMNS = {'Track': None, 'Keywords': ';'}
+FACET_MAX_VALUES = 100      # Most frequent values returned per facet (selected ones are always included)
+
+# Search terms containing these are matched as regular expressions
+SEARCH_REGEX_CHARS = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+# Near-duplicate detection (MinHash + LSH over the 'Abstract' column)
+NEAR_DUPLICATE_NUM_PERM = 128       # MinHash signature length
+NEAR_DUPLICATE_BANDS = 32           # LSH bands (rows per band = NUM_PERM / BANDS)
+NEAR_DUPLICATE_SHINGLE_SIZE = 5     # Word shingles
+NEAR_DUPLICATE_THRESHOLD = 0.8      # Minimum estimated Jaccard similarity
+
+SYSTEM_PROMPT = "You are a helpful assistant analyzing medical abstracts. Provide concise, factual answers based only on the information in the abstract."
+
+# Model cascade: the first-tier model may answer UNCLEAR, and those rows are re-run on the stronger model
+CASCADE_UNCLEAR_MARKER = 'UNCLEAR'
+CASCADE_SYSTEM_PROMPT = SYSTEM_PROMPT + f" If the abstract does not let you answer a question confidently, answer exactly {CASCADE_UNCLEAR_MARKER}."
+ANSWERED_BY_COLUMN = 'Answered By'
+DRY_RUN_UNCLEAR_RATE = 0.2
+
+# Preflight estimates: USD per 1M tokens (input, cached input, output), typical output
+# tokens per call (reasoning models include hidden reasoning tokens) and default
+# seconds per call until real latencies have been observed
+MODEL_PRICING = {
+    'gpt-5-nano': {'input': 0.05, 'cached_input': 0.005, 'output': 0.40, 'output_tokens': 600, 'seconds_per_call': 6.0},
+    'gpt-5-mini': {'input': 0.25, 'cached_input': 0.025, 'output': 2.00, 'output_tokens': 500, 'seconds_per_call': 7.0},
+    'gpt-5': {'input': 1.25, 'cached_input': 0.125, 'output': 10.00, 'output_tokens': 800, 'seconds_per_call': 15.0},
+    'o4-mini': {'input': 1.10, 'cached_input': 0.275, 'output': 4.40, 'output_tokens': 600, 'seconds_per_call': 8.0},
+    'o3': {'input': 2.00, 'cached_input': 0.50, 'output': 8.00, 'output_tokens': 800, 'seconds_per_call': 15.0},
+    'o1': {'input': 15.00, 'cached_input': 7.50, 'output': 60.00, 'output_tokens': 800, 'seconds_per_call': 20.0},
+    'o1-mini': {'input': 1.10, 'cached_input': 0.55, 'output': 4.40, 'output_tokens': 600, 'seconds_per_call': 8.0},
+    'gpt-4o': {'input': 2.50, 'cached_input': 1.25, 'output': 10.00, 'output_tokens': 60, 'seconds_per_call': 3.0},
+    'gpt-4o-mini': {'input': 0.15, 'cached_input': 0.075, 'output': 0.60, 'output_tokens': 60, 'seconds_per_call': 2.0},
+    'gpt-4-turbo': {'input': 10.00, 'cached_input': 10.00, 'output': 30.00, 'output_tokens': 60, 'seconds_per_call': 6.0},
+    'gpt-4': {'input': 30.00, 'cached_input': 30.00, 'output': 60.00, 'output_tokens': 60, 'seconds_per_call': 8.0},
+    'gpt-3.5-turbo': {'input': 0.50, 'cached_input': 0.50, 'output': 1.50, 'output_tokens': 60, 'seconds_per_call': 2.0}
+}
+ESTIMATE_FALLBACK_MODEL = 'gpt-4o'            # Pricing used for models missing from the table
+ESTIMATE_CHARS_PER_TOKEN = 4                  # Heuristic when tiktoken is not installed
+ESTIMATE_MESSAGE_OVERHEAD_TOKENS = 12         # Chat formatting tokens per request
+ESTIMATE_OUTPUT_TOKENS_PER_EXTRA_ANSWER = 40
+ESTIMATE_DEFAULT_ESCALATION_RATE = 0.2
+ESTIMATE_LATENCY_HISTORY = 500                # Recent call latencies kept per model
+ESTIMATE_MIN_LATENCY_SAMPLES = 5
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Token usage accounting (per call, per task, per model and per API key)
+USAGE_TOKEN_FIELDS = ('prompt_tokens', 'completion_tokens', 'cached_tokens', 'reasoning_tokens')
+USAGE_COLUMNS = {
+    'prompt_tokens': 'Prompt Tokens',
+    'completion_tokens': 'Completion Tokens',
+    'cached_tokens': 'Cached Tokens',
+    'reasoning_tokens': 'Reasoning Tokens',
+    'cost_usd': 'Cost (USD)'
+}
+
+# /api/usage shows the caller's own key (sent in USAGE_KEY_HEADER); every key's usage
+# only with "Authorization: Bearer <USAGE_ADMIN_TOKEN>" (the all-keys view is off when unset)
+USAGE_KEY_HEADER = 'X-OpenAI-Key'
+USAGE_ADMIN_TOKEN = os.environ.get('USAGE_ADMIN_TOKEN') or None
+
+# Adaptive (AIMD) concurrency for annotation workers
+ADAPTIVE_INITIAL_CONCURRENCY = 8
+ADAPTIVE_DECREASE_FACTOR = 0.5      # Multiplicative cut on 429s or timeouts
+ADAPTIVE_LATENCY_TOLERANCE = 1.5    # Stop growing once latency exceeds this multiple of the best seen
+
+# Per-request timeouts, retries and hedging for model calls
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get('OPENAI_REQUEST_TIMEOUT', 120))
+REQUEST_MAX_RETRIES = int(os.environ.get('OPENAI_MAX_RETRIES', 2))
+OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL') or None   # e.g. the local mock server for load tests
+REQUEST_BACKOFF_SECONDS = 1.0
+REQUEST_BACKOFF_MAX_SECONDS = 20.0
+HEDGE_LATENCY_QUANTILE = 0.95       # Re-issue requests slower than this quantile of recent calls
+HEDGE_MIN_SAMPLES = 20              # Observed calls needed before hedging starts
+HEDGE_MAX_WORKERS = 400             # Threads for hedged requests (primary + hedge per worker)
+
+# Shared pool that runs hedged request pairs
+hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS)
+
+# Static assets, referenced from HTML_TEMPLATE under content-hashed names
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_ASSETS = ('app.css', 'app.js')
+STATIC_MAX_AGE_SECONDS = 365 * 24 * 3600    # Hashed names change with their content
+
+# Response compression for JSON, CSV and text bodies
+COMPRESS_MIMETYPES = ('application/json', 'text/csv', 'text/html', 'text/css', 'text/javascript',
+                      'application/javascript')
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5
+
+# Metrics (Prometheus text format at /metrics). Each process writes its own file and
+# /metrics sums them, so counts stay correct across gunicorn workers. Set METRICS_DIR
+# to share one directory between processes that are not children of one gunicorn master
+# (and clear it on deploy); by default each server instance gets its own directory.
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_SECONDS = 5
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+METRIC_DEFINITIONS = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by Flask route'),
+    'annotator_filter_duration_seconds': ('histogram', 'Time spent in filter_dataframe_efficient'),
+    'annotator_filter_rows_scanned_total': ('counter', 'Rows evaluated by filter_dataframe_efficient'),
+    'annotator_cache_requests_total': ('counter', 'Cache lookups by cache and result (hit or miss)'),
+    'annotator_active_tasks': ('gauge', 'Annotation tasks currently processing'),
+    'annotator_model_call_duration_seconds': ('histogram', 'Model call latency including retries'),
+    'annotator_model_calls_total': ('counter', 'Model calls by outcome'),
+    'annotator_model_errors_total': ('counter', 'Failed model call attempts by error kind'),
+    'annotator_model_prompt_tokens_total': ('counter', 'Prompt tokens reported by the provider'),
+    'annotator_model_cached_tokens_total': ('counter', 'Prompt tokens served from the provider prompt cache'),
+    'annotator_model_completion_tokens_total': ('counter', 'Completion tokens (including reasoning) reported by the provider'),
+    'annotator_model_reasoning_tokens_total': ('counter', 'Reasoning tokens reported by the provider'),
+    'process_resident_memory_bytes': ('gauge', 'Resident memory of each server process')
+}
+
+# Structured extraction field types and their JSON-schema types
+FIELD_TYPES = {
+    'number': 'number',
+    'integer': 'integer',
+    'boolean': 'boolean',
+    'category': 'string',
+    'string': 'string'
+}
+EXTRACTION_ERROR_COLUMN = 'Answer: Extraction Error'
+
+# JSON answers (several questions, extraction) use strict structured outputs where the model
+# supports them and JSON mode on older models; other models only get the keys in the prompt.
+# Dated snapshots (gpt-4o-2024-08-06) count as their base model.
+STRUCTURED_OUTPUT_MODELS = {
+    'gpt-5', 'gpt-5-mini', 'gpt-5-nano', 'gpt-4.1', 'gpt-4.1-mini', 'gpt-4.1-nano',
+    'gpt-4o', 'gpt-4o-mini', 'o1', 'o3', 'o3-mini', 'o4-mini'
+}
+JSON_MODE_MODELS = {'gpt-4-turbo', 'gpt-3.5-turbo'}
+
+# Mock answers returned in dry-run mode
+DRY_RUN_RESPONSES = [
+    "Yes, this abstract mentions the treatment.",
+    "No, this is not mentioned in the abstract.",
+    "Partially relevant - see details in abstract.",
+    "Not applicable to this study.",
+    "Further investigation needed."
+]
+
 # Load data at startup
 def load_data():
     """Load the Excel file from the same directory as the app"""
@@ -1243,12 +494,19 @@ def load_data():
         ]
 
         df = None
-        for filename in possible_files:
-            filepath = os.path.join(script_dir, filename)
-            if os.path.exists(filepath):
-                print(f"Loading Excel file: {filepath}")
-                df = pd.read_excel(filepath)
-                break
+        filepath = os.environ.get('ABSTRACTS_FILE')
+        if filepath:
+            # Explicit data file (benchmarks point this at synthetic tables)
+            print(f"Loading Excel file: {filepath}")
+            df = pd.read_excel(filepath)
+
+        else:
+            for filename in possible_files:
+                filepath = os.path.join(script_dir, filename)
+                if os.path.exists(filepath):
+                    print(f"Loading Excel file: {filepath}")
+                    df = pd.read_excel(filepath)
+                    break
 
         if df is None:
             # Try to find any .xlsx file in the directory
@@ -1277,12 +535,10 @@ def load_data():
         if 'Link' not in df.columns:
             df['Link'] = ''
 
-        # Clean data
+        # Clean data (missing numbers stay missing; compact_dtypes picks nullable types for them)
         for col in df.columns:
             if df[col].dtype == 'object':
                 df[col] = df[col].fillna('')
-            else:
-                df[col] = df[col].fillna(0)
 
         print(f"Successfully loaded {len(df)} abstracts from {os.path.basename(filepath)}")
         print(f"Columns: {list(df.columns)}")
@@ -1293,8 +549,746 @@ def load_data():
         traceback.print_exc()
         return pd.DataFrame()
 
+def compact_dtypes(df):
+    """
+    Shrink the loaded table in place: text columns with few distinct values become
+    categorical, other text columns TEXT_DTYPE, integers the smallest integer type,
+    and whole-number float columns (integers with gaps) nullable integers. Other
+    floats keep float64, since float32 would change the values shown.
+    Returns the memory use before and after and the new dtypes.
+    """
+    start = time.time()
+    usage = df.memory_usage(deep=True)
+    for column in df.columns:
+        values = df[column]
+        if values.dtype == object:
+            if pd.api.types.infer_dtype(values, skipna=False) != 'string':
+                continue    # Mixed types (e.g. numeric and text IDs) are left as they are
+            if values.nunique() <= min(CATEGORY_MAX_UNIQUE_RATIO * len(values), CATEGORY_MAX_VALUES):
+                df[column] = values.astype('category')
+            elif TEXT_DTYPE:
+                df[column] = values.astype(TEXT_DTYPE)
+        elif pd.api.types.is_bool_dtype(values):
+            continue
+        elif pd.api.types.is_integer_dtype(values):
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values):
+            present = values.dropna()
+            if np.isfinite(present).all() and (present == np.floor(present)).all():
+                smallest = pd.to_numeric(present.astype(np.int64), downcast='integer').dtype
+                df[column] = values.astype(smallest.name.capitalize())     # int16 -> nullable Int16
+    # Only converted columns are measured again: deep sizes of untouched str objects
+    # can grow once they have been encoded (CPython caches their UTF-8 form)
+    before = int(usage.sum())
+    after = before + sum(int(df[column].memory_usage(deep=True, index=False)) - int(usage[column])
+                         for column in df.columns if df[column].dtype != object)
+    if len(df):
+        print(f"Compacted table: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB ({time.time() - start:.1f}s)")
+    return {
+        'before_bytes': before,
+        'after_bytes': after,
+        'dtypes': {str(column): str(dtype) for column, dtype in df.dtypes.items()}
+    }
+
+def column_text(series):
+    """A column as strings for text matching, with missing values as ''"""
+    if isinstance(series.dtype, pd.StringDtype):
+        return series   # Already strings, and its .str methods are vectorized under Arrow
+    text = series.astype(str)
+    return text.where(series.notna(), '') if series.hasnans else text
+
+# MinHash permutations are seeded so every gunicorn worker builds identical groups
+_MINHASH_PRIME = np.uint64((1 << 31) - 1)
+_minhash_rng = np.random.RandomState(2025)
+_MINHASH_A = _minhash_rng.randint(1, (1 << 31) - 1, size=NEAR_DUPLICATE_NUM_PERM).astype(np.uint64)
+_MINHASH_B = _minhash_rng.randint(0, (1 << 31) - 1, size=NEAR_DUPLICATE_NUM_PERM).astype(np.uint64)
+
+def minhash_signature(text):
+    """Compute the MinHash signature of an abstract's word shingles (None for empty text)"""
+    words = re.findall(r'\w+', str(text).lower())
+    if not words:
+        return None
+
+    size = NEAR_DUPLICATE_SHINGLE_SIZE
+    shingles = {' '.join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+
+    # crc32 < 2^32 and A < 2^31, so the products fit in uint64
+    return ((hashes[:, None] * _MINHASH_A + _MINHASH_B) % _MINHASH_PRIME).min(axis=0)
+
+def compute_near_duplicate_groups(df):
+    """
+    Cluster near-identical abstracts (encores, resubmissions, cross-track copies).
+    Returns a Series aligned with df.index whose value is the index label of the
+    group's representative (its first row); singletons map to themselves.
+    """
+    groups = pd.Series(df.index, index=df.index)
+    if df.empty or 'Abstract' not in df.columns:
+        return groups
+
+    start_time = time.time()
+
+    # Union-find over row positions; the root is always the earliest row
+    parent = list(range(len(df)))
+
+    def find(pos):
+        while parent[pos] != pos:
+            parent[pos] = parent[parent[pos]]
+            pos = parent[pos]
+        return pos
+
+    signatures = {}
+    for pos, text in enumerate(df['Abstract']):
+        if text is None or (isinstance(text, float) and pd.isna(text)) or text == '':
+            continue
+        signature = minhash_signature(text)
+        if signature is not None:
+            signatures[pos] = signature
+
+    # LSH: rows sharing any band bucket become candidate pairs
+    rows_per_band = NEAR_DUPLICATE_NUM_PERM // NEAR_DUPLICATE_BANDS
+    buckets = {}
+    for pos, signature in signatures.items():
+        for band in range(NEAR_DUPLICATE_BANDS):
+            key = (band, signature[band * rows_per_band:(band + 1) * rows_per_band].tobytes())
+            buckets.setdefault(key, []).append(pos)
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        first = members[0]
+        for other in members[1:]:
+            root_first, root_other = find(first), find(other)
+            if root_first == root_other:
+                continue
+            similarity = np.mean(signatures[first] == signatures[other])
+            if similarity >= NEAR_DUPLICATE_THRESHOLD:
+                parent[max(root_first, root_other)] = min(root_first, root_other)
+
+    groups = pd.Series(df.index[[find(pos) for pos in range(len(df))]], index=df.index)
+
+    duplicates = int((groups != groups.index).sum())
+    print(f"Near-duplicate detection: {duplicates} abstracts fold into earlier rows "
+          f"({time.time() - start_time:.1f}s)")
+    return groups
+
+def json_default(value):
+    """Encode values neither JSON encoder handles natively (numpy scalars, timestamps)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.isoformat()
+    return str(value)
+
+def json_dumps(value):
+    """Encode to compact UTF-8 JSON bytes with orjson if installed, otherwise the stdlib"""
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Route jsonify through json_dumps"""
+
+    def dumps(self, obj, **kwargs):
+        return json_dumps(obj).decode('utf-8')
+
+app.json = FastJSONProvider(app)
+
+def is_missing_value(value):
+    """Whether a cell is empty (None, NaN, pd.NA or NaT) rather than a value"""
+    return value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and value != value)
+
+def json_fragments(values):
+    """JSON encoding of each value of a column (or list), in order (missing values become null)"""
+    if isinstance(values, pd.Series):
+        values = values.tolist()
+    if orjson is not None:
+        return [orjson.dumps(None if is_missing_value(value) else value, default=json_default) for value in values]
+    return [json_dumps(None if is_missing_value(value) else value) for value in values]
+
+def has_nested_values(series):
+    """Whether a column holds lists or dicts, whose JSON is costly to build per request"""
+    return series.dtype == object and series.map(lambda value: isinstance(value, (list, tuple, dict))).any()
+
+def encode_columns(df, mode=PRECOMPUTE_JSON):
+    """
+    Per-column JSON fragments of a table that does not change after loading, for
+    the columns PRECOMPUTE_JSON selects. Other columns are encoded per request.
+    """
+    start = time.time()
+    if mode == 'all':
+        columns = list(df.columns)
+    elif mode == 'auto':
+        columns = [column for column in df.columns if has_nested_values(df[column])]
+    else:
+        columns = []
+    fragments = {column: json_fragments(df[column]) for column in columns}
+    if len(df):
+        print(f"Encoded {len(columns)} of {len(df.columns)} columns as JSON fragments "
+              f"({fragments_bytes(fragments) / 1e6:.1f} MB, {time.time() - start:.1f}s, "
+              f"{'orjson' if orjson is not None else 'stdlib json'})")
+    return fragments
+
+def fragments_bytes(fragments):
+    """Memory held by precomputed JSON fragments"""
+    return sum(sys.getsizeof(values) + sum(map(sys.getsizeof, values)) for values in fragments.values())
+
+def records_json(df, positions, fields=None, preview=None, keep_columns=(), extra_columns=None, fragments=None):
+    """
+    JSON array (bytes) of the rows of df at `positions`, encoded column by column.
+
+    `fields` limits the columns (plus any in `keep_columns`); `preview` cuts
+    'Abstract' to that many characters and marks the record `_truncated`.
+    `extra_columns` maps further column names to this page's values, and
+    `fragments` are df's precomputed encodings from encode_columns. Every
+    record carries its row id as `_id` for /api/abstracts/<id>.
+    """
+    positions = np.asarray(positions, dtype=np.intp)
+    columns = [c for c in df.columns if fields is None or c in fields or c in keep_columns]
+    encoded = {}
+    for column in columns:
+        if fragments is not None and column in fragments:
+            column_fragments = fragments[column]
+            encoded[column] = [column_fragments[p] for p in positions]
+        else:
+            # Take from the backing array: Series.iloc costs more than encoding a page
+            encoded[column] = json_fragments(df[column].array[positions].tolist())
+    for column, values in (extra_columns or {}).items():
+        if fields is None or column in fields or column in keep_columns:
+            columns.append(column)
+            encoded[column] = json_fragments(list(values))
+
+    truncated = [False] * len(positions)
+    if preview and 'Abstract' in encoded:
+        texts = df['Abstract'].array[positions].tolist()
+        for i, text in enumerate(texts):
+            if isinstance(text, str) and len(text) > preview:
+                encoded['Abstract'][i] = json_dumps(text[:preview].rstrip() + '…')
+                truncated[i] = True
+
+    keys = [json_dumps(column) + b':' for column in columns]
+    rows = []
+    for i, row_id in enumerate(df.index[positions]):
+        parts = [key + encoded[column][i] for key, column in zip(keys, columns)]
+        parts.append(b'"_id":' + str(int(row_id)).encode())
+        if truncated[i]:
+            parts.append(b'"_truncated":true')
+        rows.append(b'{' + b','.join(parts) + b'}')
+    return b'[' + b','.join(rows) + b']'
+
+def json_response(payload, data_json=None, status=200):
+    """JSON response; pre-encoded `data_json` bytes are spliced in as the 'data' member"""
+    body = json_dumps(payload)
+    if data_json is not None:
+        body = b'{"data":' + data_json + (b',' + body[1:] if payload else b'}')
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def compute_data_version(df):
+    """
+    Content hash of the loaded table and of this file (responses change with either).
+    Identical in every gunicorn worker, so ETags stay valid whichever worker answers.
+    """
+    digest = hashlib.sha1()
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    digest.update(json_dumps([str(column) for column in df.columns]))
+    if len(df):
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()[:16]
+
+def pack_strings(values):
+    """Strings as one NUL-separated UTF-8 byte array, so they can be saved without pickle"""
+    return np.frombuffer('\0'.join(values).encode('utf-8'), dtype=np.uint8)
+
+def unpack_strings(packed):
+    text = packed.tobytes().decode('utf-8')
+    return np.array(text.split('\0') if text else [], dtype=object)
+
+def cached_arrays(name, build, params=()):
+    """
+    Arrays derived from the loaded table, kept in DATA_CACHE_DIR under DATA_VERSION.
+    `build` returns a dict of numpy arrays and only runs when no file for this
+    version (and these build `params`) exists; files left by earlier versions are removed.
+    """
+    if DATA_CACHE_DIR == 'off' or abstracts_df.empty:
+        return build()
+    version = DATA_VERSION
+    if params:
+        version = hashlib.sha1(f"{DATA_VERSION}|{params!r}".encode('utf-8')).hexdigest()[:len(DATA_VERSION)]
+    path = os.path.join(DATA_CACHE_DIR, f"{name}-{version}.npz")
+    try:
+        with np.load(path, allow_pickle=False) as cached:
+            return {key: cached[key] for key in cached.files}
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Ignoring unreadable cache file {path}: {e}")
+
+    arrays = build()
+    try:
+        os.makedirs(DATA_CACHE_DIR, mode=0o700, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temporary, path)
+        for stale in glob.glob(os.path.join(DATA_CACHE_DIR, f"{name}-{'?' * len(DATA_VERSION)}.npz")):
+            if stale != path:
+                os.remove(stale)
+    except OSError as e:
+        print(f"Could not write cache file {path}: {e}")
+    return arrays
+
+def normalize_search_text(texts):
+    """Lowercase and strip accents (Müller -> muller) so the index and queries agree"""
+    return (texts.astype(str).str.normalize('NFKD')
+            .str.replace(r'[\u0300-\u036f]', '', regex=True).str.lower())
+
+class PrefixIndex:
+    """
+    Word-prefix index over one text per row. Tokens are kept in sorted order with
+    each token's rows stored contiguously (CSR layout), so every token starting
+    with a prefix is one binary search and one slice of the postings array.
+    """
+
+    def __init__(self, texts):
+        self.rows = len(texts)
+        tokens = normalize_search_text(texts).str.findall(r'\w+')
+        counts = tokens.str.len().to_numpy(dtype=np.int64)
+        words = np.fromiter(itertools.chain.from_iterable(tokens), dtype=object, count=int(counts.sum()))
+        row_of = np.repeat(np.arange(self.rows, dtype=np.int64), counts)
+
+        # One posting per (token, row), ordered by token and then row
+        codes, vocabulary = pd.factorize(words, sort=True)
+        stride = max(self.rows, 1)
+        keys = codes.astype(np.int64) * stride + row_of
+        keys.sort()     # In-place sort and adjacent dedupe; much faster than np.unique here
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+        self.tokens = np.asarray(vocabulary, dtype=object)
+        self.postings = (keys % stride).astype(np.int32)
+        self.offsets = np.searchsorted(keys // stride, np.arange(len(self.tokens) + 1))
+        self.frequencies = np.diff(self.offsets)    # Rows containing each token
+
+    def prefix_range(self, prefix):
+        """[lo, hi) positions in self.tokens of the tokens starting with prefix"""
+        lo = int(np.searchsorted(self.tokens, prefix, side='left'))
+        hi = int(np.searchsorted(self.tokens, prefix + '\U0010ffff', side='left'))
+        return lo, hi
+
+    def match(self, prefix):
+        """Boolean mask of the rows containing a token that starts with prefix"""
+        lo, hi = self.prefix_range(prefix)
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[self.postings[self.offsets[lo]:self.offsets[hi]]] = True
+        return mask
+
+    def nbytes(self):
+        return self.postings.nbytes + self.offsets.nbytes + sum(len(token) + 50 for token in self.tokens)
+
+    def to_arrays(self):
+        return {'rows': np.int64(self.rows), 'tokens': pack_strings(self.tokens),
+                'postings': self.postings, 'offsets': self.offsets}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        index = cls.__new__(cls)
+        index.rows = int(arrays['rows'])
+        index.tokens = unpack_strings(arrays['tokens'])
+        index.postings = arrays['postings']
+        index.offsets = arrays['offsets']
+        index.frequencies = np.diff(index.offsets)
+        return index
+
+def build_search_index(df):
+    """Prefix indexes for search-as-you-type: all searchable text, and titles alone for ranking"""
+    start = time.time()
+
+    def all_texts():
+        texts = pd.Series('', index=df.index)
+        for column in INSTANT_SEARCH_COLUMNS:
+            if column in df.columns:
+                texts = texts + ' ' + column_text(df[column]).astype(str)
+        return texts
+
+    def titles():
+        return df['Abstract title'] if 'Abstract title' in df.columns else pd.Series('', index=df.index)
+
+    index = {
+        name: PrefixIndex.from_arrays(cached_arrays(f'search-{name}', lambda: PrefixIndex(texts()).to_arrays()))
+        for name, texts in (('all', all_texts), ('title', titles))
+    }
+    if len(df):
+        print(f"Search index: {len(index['all'].tokens)} tokens, {len(index['all'].postings)} postings, "
+              f"{index['all'].nbytes() / 1e6:.1f} MB ({time.time() - start:.1f}s)")
+    return index
+
+def suggest_keys(texts):
+    """Normalized text with punctuation runs as single spaces ('PD-L1' -> 'pd l1', 'Smith, J.' -> 'smith j')"""
+    return normalize_search_text(texts).str.replace(r'\W+', ' ', regex=True).str.strip()
+
+def corpus_terms(texts):
+    """(keys, most common spelling, abstracts containing) for the words of one text per row"""
+    tokens = texts.astype(str).str.findall(SUGGEST_TERM_PATTERN)
+    counts = tokens.str.len().to_numpy(dtype=np.int64)
+    words = np.fromiter(itertools.chain.from_iterable(tokens), dtype=object, count=int(counts.sum()))
+    row_of = np.repeat(np.arange(len(texts), dtype=np.int64), counts)
+
+    # Normalize each distinct spelling once, then count rows per normalized key
+    spelling_codes, spellings = pd.factorize(words)
+    key_of_spelling, keys = pd.factorize(suggest_keys(pd.Series(spellings, dtype=object)).to_numpy())
+    word_keys = key_of_spelling[spelling_codes]
+    stride = max(len(texts), 1)
+    pairs = word_keys.astype(np.int64) * stride + row_of
+    pairs.sort()
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if len(pairs) else pairs
+    abstracts = np.bincount(pairs // stride, minlength=len(keys))
+
+    # Display each key in its most frequent spelling ('PD-L1' rather than 'pd-l1')
+    spelling_counts = np.bincount(spelling_codes, minlength=len(spellings))
+    order = np.lexsort((-spelling_counts, key_of_spelling))
+    first = order[np.concatenate(([True], key_of_spelling[order][1:] != key_of_spelling[order][:-1]))]
+    display = np.empty(len(keys), dtype=object)
+    display[key_of_spelling[first]] = np.asarray(spellings, dtype=object)[first]
+
+    # Drop short words, numbers, stopwords and words most abstracts contain
+    keys = np.asarray(keys, dtype=object)
+    keep = np.array([len(key) >= SUGGEST_MIN_TERM_CHARS and not key.replace(' ', '').isdigit()
+                     and key not in SUGGEST_STOPWORDS for key in keys], dtype=bool)
+    keep &= abstracts <= SUGGEST_MAX_TERM_SHARE * len(texts)
+    return keys[keep], display[keep], abstracts[keep]
+
+def column_values(values):
+    """(keys, value, abstracts) for each distinct value, keyed from every word on ('smith j', 'j')"""
+    values = values.astype(str).str.strip()
+    counts = values[values != ''].value_counts()
+    keys, texts, abstracts = [], [], []
+    for text, key, count in zip(counts.index, suggest_keys(counts.index.to_series()), counts.to_numpy()):
+        words = key.split()
+        for i in range(len(words)):
+            keys.append(' '.join(words[i:]))
+            texts.append(text)
+            abstracts.append(count)
+    return np.array(keys, dtype=object), np.array(texts, dtype=object), np.array(abstracts, dtype=np.int64)
+
+class SuggestIndex:
+    """
+    Completions for the word or name being typed. Entries (terms, authors, tracks)
+    are sorted by normalized key, so the completions of a prefix are one contiguous
+    range, and are ranked by the number of abstracts they occur in.
+    """
+
+    def __init__(self, arrays):
+        self.keys = unpack_strings(arrays['keys'])
+        self.texts = unpack_strings(arrays['texts'])
+        self.kinds = arrays['kinds']
+        self.counts = arrays['counts']
+
+    def suggest(self, prefix, limit):
+        lo = int(np.searchsorted(self.keys, prefix, side='left'))
+        hi = int(np.searchsorted(self.keys, prefix + '\U0010ffff', side='left'))
+        if not prefix or lo == hi or limit <= 0:
+            return []
+        counts = self.counts[lo:hi]
+        candidates = np.arange(hi - lo)
+        if len(candidates) > limit * 4:     # Room for authors and tracks matched by several keys
+            candidates = np.argpartition(-counts, limit * 4)[:limit * 4]
+        candidates = candidates[np.lexsort((candidates, -counts[candidates]))]
+
+        suggestions, seen = [], set()
+        for position in candidates + lo:
+            entry = (int(self.kinds[position]), self.texts[position])
+            if entry in seen:
+                continue
+            seen.add(entry)
+            suggestions.append({'text': entry[1], 'kind': SUGGEST_KINDS[entry[0]],
+                                'count': int(self.counts[position])})
+            if len(suggestions) == limit:
+                break
+        return suggestions
+
+def build_suggest_index(df):
+    """Autocomplete entries mined from the corpus (loaded from DATA_CACHE_DIR when present)"""
+    start = time.time()
+
+    def build():
+        texts = pd.Series('', index=df.index)
+        for column in SUGGEST_TERM_COLUMNS:
+            if column in df.columns:
+                texts = texts + ' ' + column_text(df[column]).astype(str)
+        parts = [corpus_terms(texts) + (SUGGEST_KINDS.index('term'),)]
+        for column, kind in SUGGEST_VALUE_COLUMNS.items():
+            if column in df.columns:
+                parts.append(column_values(df[column]) + (SUGGEST_KINDS.index(kind),))
+        keys = np.concatenate([part[0] for part in parts])
+        order = np.argsort(keys, kind='stable')
+        return {
+            'keys': pack_strings(keys[order]),
+            'texts': pack_strings(np.concatenate([part[1] for part in parts])[order]),
+            'kinds': np.concatenate([np.full(len(part[0]), part[3], dtype=np.int8) for part in parts])[order],
+            'counts': np.concatenate([part[2] for part in parts]).astype(np.int32)[order]
+        }
+
+    index = SuggestIndex(cached_arrays('suggest', build, (sorted(SUGGEST_STOPWORDS), SUGGEST_MAX_TERM_SHARE)))
+    if len(df):
+        print(f"Suggest index: {len(index.keys)} entries ({time.time() - start:.1f}s)")
+    return index
+
+def build_facet_index(df):
+    """
+    Per facet column: its distinct values (sorted) and one (row position, value code)
+    pair per value a row has, so counts over any set of rows are one bincount.
+    """
+    index = {}
+    for column, separator in FACET_COLUMNS.items():
+        if column not in df.columns:
+            continue
+        values = df[column].astype(str)
+        if separator:
+            lists = values.str.split(separator, regex=False)
+            lengths = lists.str.len().to_numpy(dtype=np.int64)
+            values = pd.Series(np.fromiter(itertools.chain.from_iterable(lists), dtype=object,
+                                           count=int(lengths.sum())), dtype=object)
+            rows = np.repeat(np.arange(len(df), dtype=np.int64), lengths)
+        else:
+            rows = np.arange(len(df), dtype=np.int64)
+        values = values.str.strip().to_numpy(dtype=object)
+        keep = values != ''
+        codes, uniques = pd.factorize(values[keep], sort=True)
+
+        # A value listed twice in one row counts once
+        stride = max(len(df), 1)
+        pairs = codes.astype(np.int64) * stride + rows[keep]
+        pairs.sort()
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if len(pairs) else pairs
+        uniques = np.asarray(uniques, dtype=object)
+        index[column] = {
+            'values': uniques,
+            'codes': (pairs // stride).astype(np.int32),
+            'rows': (pairs % stride).astype(np.int32),
+            'lookup': {value: code for code, value in enumerate(uniques)}
+        }
+    return index
+
+def load_near_duplicate_groups(df):
+    """compute_near_duplicate_groups, loaded from DATA_CACHE_DIR when present"""
+    arrays = cached_arrays('near-duplicates', lambda: {'groups': compute_near_duplicate_groups(df).to_numpy()})
+    return pd.Series(arrays['groups'], index=df.index)
+
 # Initialize data
 abstracts_df = load_data()
+table_memory = compact_dtypes(abstracts_df)
+DATA_VERSION = compute_data_version(abstracts_df)
+near_duplicate_groups = load_near_duplicate_groups(abstracts_df)
+abstracts_json = encode_columns(abstracts_df)   # Base table never changes after loading
+table_memory['json_fragment_bytes'] = fragments_bytes(abstracts_json)
+table_memory['json_fragment_columns'] = list(abstracts_json)
+search_index = build_search_index(abstracts_df)
+suggest_index = build_suggest_index(abstracts_df)
+facet_index = build_facet_index(abstracts_df)
+
+def process_rss_bytes():
+    """Current resident memory of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0  # Windows
+    # Peak instead of current where /proc is unavailable (bytes on macOS, KB elsewhere)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def pid_alive(pid):
+    """Whether a process with this pid is still running"""
+    if os.name == 'nt':
+        return True  # os.kill would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and histograms that are flushed to a per-process JSON
+    file and summed over all processes of the server when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.collectors = []
+        self.flusher_pid = None
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.ensure_flusher()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'buckets': [0] * len(METRICS_LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(METRICS_LATENCY_BUCKETS):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+        self.ensure_flusher()
+
+    def add_collector(self, collector):
+        """Register a function returning (name, value, labels) samples computed at flush time"""
+        self.collectors.append(collector)
+
+    def directory(self):
+        """Directory shared by all processes of this server instance"""
+        if METRICS_DIR:
+            return METRICS_DIR
+        # Gunicorn workers share their master's directory; other servers use their own pid
+        under_gunicorn = os.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn')
+        return os.path.join(tempfile.gettempdir(), 'esmo-metrics', str(os.getppid() if under_gunicorn else os.getpid()))
+
+    def ensure_flusher(self):
+        """Start the background flush thread once per process (also after a fork)"""
+        if self.flusher_pid == os.getpid():
+            return
+        with self.lock:
+            if self.flusher_pid == os.getpid():
+                return
+            self.flusher_pid = os.getpid()
+        threading.Thread(target=self.flush_loop, daemon=True).start()
+
+    def flush_loop(self):
+        self.remove_stale_directories()
+        while True:
+            time.sleep(METRICS_FLUSH_SECONDS)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Could not write metrics: {e}")
+
+    def remove_stale_directories(self):
+        """Delete default metrics directories left behind by servers that have exited"""
+        if METRICS_DIR:
+            return
+        root = os.path.join(tempfile.gettempdir(), 'esmo-metrics')
+        for name in os.listdir(root) if os.path.isdir(root) else []:
+            if name.isdigit() and not pid_alive(int(name)):
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+    def snapshot(self):
+        """This process's metrics as a JSON-serializable dict"""
+        gauges = []
+        counters = []
+        for collector in self.collectors:
+            for name, value, labels in collector():
+                target = counters if METRIC_DEFINITIONS[name][0] == 'counter' else gauges
+                target.append([name, labels, value])
+        with self.lock:
+            counters += [[name, dict(labels), value] for (name, labels), value in self.counters.items()]
+            histograms = [[name, dict(labels), dict(h, buckets=list(h['buckets']))]
+                          for (name, labels), h in self.histograms.items()]
+        return {'pid': os.getpid(), 'counters': counters, 'gauges': gauges, 'histograms': histograms}
+
+    def flush(self):
+        """Atomically write this process's metrics file"""
+        directory = self.directory()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(path + '.tmp', path)
+
+    def aggregate(self):
+        """Sum counters and histograms over all process files; keep gauges of live processes only"""
+        self.flush()
+        counters, gauges, histograms = {}, {}, {}
+        directory = self.directory()
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in data['counters']:
+                key = (name, tuple(sorted(labels.items())))
+                counters[key] = counters.get(key, 0) + value
+            if pid_alive(data['pid']):
+                for name, labels, value in data['gauges']:
+                    key = (name, tuple(sorted(labels.items())))
+                    gauges[key] = gauges.get(key, 0) + value
+            for name, labels, h in data['histograms']:
+                key = (name, tuple(sorted(labels.items())))
+                total = histograms.setdefault(key, {'buckets': [0] * len(METRICS_LATENCY_BUCKETS), 'sum': 0.0, 'count': 0})
+                total['buckets'] = [a + b for a, b in zip(total['buckets'], h['buckets'])]
+                total['sum'] += h['sum']
+                total['count'] += h['count']
+        return counters, gauges, histograms
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        counters, gauges, histograms = self.aggregate()
+
+        def label_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+            return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+        lines = []
+        for name, (metric_type, help_text) in METRIC_DEFINITIONS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+            if metric_type == 'histogram':
+                for (metric, labels), h in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(METRICS_LATENCY_BUCKETS, h['buckets']):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{label_text(labels, [('le', bound)])} {cumulative}")
+                    lines.append(f"{name}_bucket{label_text(labels, [('le', '+Inf')])} {h['count']}")
+                    lines.append(f"{name}_sum{label_text(labels)} {h['sum']}")
+                    lines.append(f"{name}_count{label_text(labels)} {h['count']}")
+            else:
+                samples = counters if metric_type == 'counter' else gauges
+                for (metric, labels), value in sorted(samples.items()):
+                    if metric == name:
+                        lines.append(f"{name}{label_text(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
+
+def process_metrics():
+    """Samples computed when this process flushes its metrics"""
+    with progress_lock:
+        active = sum(1 for p in annotation_progress.values() if p.get('status') == 'running')
+    client_cache = get_openai_client.cache_info()
+    return [
+        ('annotator_active_tasks', active, {}),
+        ('process_resident_memory_bytes', process_rss_bytes(), {'pid': str(os.getpid())}),
+        ('annotator_cache_requests_total', client_cache.hits, {'cache': 'openai_client', 'result': 'hit'}),
+        ('annotator_cache_requests_total', client_cache.misses, {'cache': 'openai_client', 'result': 'miss'})
+    ]
+
+metrics.add_collector(process_metrics)
 
 def cleanup_old_results():
     """Remove annotation results older than RESULT_EXPIRATION_HOURS"""
@@ -1324,6 +1318,8 @@ def filter_dataframe_efficient(df, search_filter='', show_empty=False):
     Memory-efficient filtering that avoids full DataFrame copies.
     Returns a filtered view/index instead of a full copy.
     """
+    start_time = time.time()
+
     # Start with all indices
     mask = pd.Series([True] * len(df), index=df.index)
 
@@ -1336,164 +1332,1309 @@ def filter_dataframe_efficient(df, search_filter='', show_empty=False):
 
     if search_filter:
         search_terms = [term.strip() for term in search_filter.split(';') if term.strip()]
-        search_mask = pd.Series([False] * len(df), index=df.index)
+        search_mask = np.zeros(len(df), dtype=bool)
+        keywords = matched_keywords.to_numpy(dtype=object)
+
+        # Stringify each column once and match column-wise instead of row by row.
+        # Categorical columns are matched once per category and expanded through their codes.
+        text_columns = []
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                text_columns.append((pd.Series(df[col].cat.categories.astype(str)), df[col].cat.codes.to_numpy()))
+            else:
+                text_columns.append((column_text(df[col]), None))
+        lower_columns = None
+
+        def expand(matched, codes):
+            # Code -1 (missing) picks the appended False
+            return matched if codes is None else np.append(matched, False)[codes]
 
         for term in search_terms:
-            term_mask = df.apply(lambda row: row.astype(str).str.contains(term, case=False).any(), axis=1)
-            search_mask = search_mask | term_mask
+            term_mask = np.zeros(len(df), dtype=bool)
+            if SEARCH_REGEX_CHARS.search(term):
+                for text, codes in text_columns:
+                    term_mask |= expand(text.str.contains(term, case=False).to_numpy(dtype=bool, na_value=False), codes)
+            else:
+                # Plain words are a substring test on lowercased text, much faster than a regex
+                if lower_columns is None:
+                    lower_columns = [(text.str.lower(), codes) for text, codes in text_columns]
+                for text, codes in lower_columns:
+                    term_mask |= expand(text.str.contains(term.lower(), regex=False).to_numpy(dtype=bool, na_value=False),
+                                        codes)
+            search_mask |= term_mask
 
             # Track matched keywords
-            for idx in df[term_mask].index:
-                if matched_keywords[idx]:
-                    matched_keywords[idx] += '; ' + term
-                else:
-                    matched_keywords[idx] = term
+            matched = keywords[term_mask]
+            keywords[term_mask] = np.where(matched != '', matched + '; ' + term, term)
 
+        matched_keywords = pd.Series(keywords, index=df.index)
         mask = mask & search_mask
 
+    searched = 'true' if search_filter else 'false'
+    metrics.observe('annotator_filter_duration_seconds', time.time() - start_time, search=searched)
+    metrics.inc('annotator_filter_rows_scanned_total', len(df), search=searched)
     return mask, matched_keywords
 
-def get_openai_response(api_key, model, abstract_text, question, dry_run=False):
+def parse_facet_filters(selections):
+    """
+    Canonical, hashable facet filters ((column, (values, ...)), ...) from a
+    {column: [values]} mapping; raises ValueError for columns that are not facets.
+    """
+    if not isinstance(selections, dict):
+        raise ValueError('Facet filters must map facet columns to values')
+    filters = []
+    for column, values in selections.items():
+        if column not in facet_index:
+            raise ValueError(f"Unknown facet: {column}")
+        values = tuple(sorted({str(value) for value in ([values] if isinstance(values, str) else values)}))
+        if values:
+            filters.append((column, values))
+    return tuple(sorted(filters))
+
+def facet_mask(column, values):
+    """Rows having any of the given values in a facet column"""
+    facet = facet_index[column]
+    codes = [facet['lookup'][value] for value in values if value in facet['lookup']]
+    mask = np.zeros(len(abstracts_df), dtype=bool)
+    mask[facet['rows'][np.isin(facet['codes'], codes)]] = True
+    return mask
+
+def facet_filter_mask(facet_filters):
+    """Rows matching every facet filter (each facet matches any of its selected values)"""
+    mask = np.ones(len(abstracts_df), dtype=bool)
+    for column, values in facet_filters:
+        mask &= facet_mask(column, values)
+    return mask
+
+def facet_counts(search_mask, facet_filters):
+    """
+    Value counts of every facet over the rows matching the search. Each facet is
+    counted with the other facets' filters applied but not its own, so the
+    alternatives to a selected value keep their counts.
+    """
+    masks = {column: facet_mask(column, values) for column, values in facet_filters}
+    selected = dict(facet_filters)
+    counts = {}
+    for column, facet in facet_index.items():
+        rows = search_mask
+        for other, mask in masks.items():
+            if other != column:
+                rows = rows & mask
+        value_counts = np.bincount(facet['codes'][rows[facet['rows']]], minlength=len(facet['values']))
+        codes = np.flatnonzero(value_counts)
+        codes = codes[np.lexsort((codes, -value_counts[codes]))]
+        listed = codes[:FACET_MAX_VALUES].tolist()
+        listed += [facet['lookup'][value] for value in selected.get(column, ())
+                   if value in facet['lookup'] and facet['lookup'][value] not in listed]
+        counts[column] = {
+            'values': [{'value': facet['values'][code], 'count': int(value_counts[code])} for code in listed],
+            'distinct': len(codes),
+            'selected': list(selected.get(column, ()))
+        }
+    return counts
+
+def result_snapshot(search, show_empty, facet_filters=()):
+    """
+    Row positions (and matched keywords) of a query over the loaded table, with its
+    facet counts, cached per data version and query so paging through results never
+    re-runs the filter.
+    """
+    key = hashlib.sha1(f"{DATA_VERSION}|{search}|{show_empty}|{facet_filters}".encode('utf-8')).hexdigest()[:16]
+    with snapshot_lock:
+        snapshot = result_snapshots.get(key)
+        if snapshot is not None:
+            result_snapshots.move_to_end(key)
+    metrics.inc('annotator_cache_requests_total', cache='result_snapshot',
+                result='miss' if snapshot is None else 'hit')
+    if snapshot is not None:
+        return snapshot
+
+    mask, matched_keywords = filter_dataframe_efficient(abstracts_df, search, show_empty)
+    search_mask = mask.to_numpy(dtype=bool)
+    positions = np.flatnonzero(search_mask & facet_filter_mask(facet_filters))
+    snapshot = {
+        'id': key,
+        'search': search,
+        'show_empty': show_empty,
+        'facet_filters': facet_filters,
+        'positions': positions,
+        'keywords': matched_keywords.values[positions] if search else None,
+        'facets': facet_counts(search_mask, facet_filters)
+    }
+    with snapshot_lock:
+        result_snapshots[key] = snapshot
+        while len(result_snapshots) > RESULT_SNAPSHOT_CACHE_SIZE:
+            result_snapshots.popitem(last=False)
+    return snapshot
+
+def instant_search(query, limit):
+    """
+    Rows containing a word starting with every query word (all words are treated
+    as prefixes, since the last one is usually still being typed). Rows matching
+    in the title come first. Returns (normalized terms, hit count, top row positions).
+    """
+    terms = re.findall(r'\w+', normalize_search_text(pd.Series([query])).iat[0])
+    if len(''.join(terms)) < INSTANT_SEARCH_MIN_CHARS:
+        return terms, 0, np.array([], dtype=np.int64)
+
+    mask = np.ones(len(abstracts_df), dtype=bool)
+    title_mask = np.ones(len(abstracts_df), dtype=bool)
+    for term in terms:
+        mask &= search_index['all'].match(term)
+        title_mask &= search_index['title'].match(term)
+    positions = np.flatnonzero(mask)
+    in_title = title_mask[positions]
+    top = np.concatenate([positions[in_title][:limit], positions[~in_title][:limit]])[:limit]
+    return terms, len(positions), top
+
+def encode_cursor(snapshot, offset):
+    """
+    Opaque cursor for the page starting at `offset` of a snapshot. It carries the
+    query and data version, so any worker can rebuild the snapshot it refers to.
+    """
+    payload = json_dumps({'v': DATA_VERSION, 'q': snapshot['search'], 'e': snapshot['show_empty'],
+                          'f': dict(snapshot['facet_filters']), 'o': offset})
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """(data version, search, show_empty, facet filters, offset) of a cursor; raises ValueError if malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return (str(payload['v']), str(payload['q']), bool(payload['e']), parse_facet_filters(payload.get('f', {})),
+                max(0, int(payload['o'])))
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def dry_run_answer(allow_unclear=False):
+    """Random mock answer; cascade first tiers are sometimes unsure"""
+    if allow_unclear and random.random() < DRY_RUN_UNCLEAR_RATE:
+        return CASCADE_UNCLEAR_MARKER
+    return random.choice(DRY_RUN_RESPONSES)
+
+def build_prompt_messages(instructions, abstract_text, system_prompt=SYSTEM_PROMPT):
+    """
+    Chat messages laid out for provider-side prefix caching: the system prompt,
+    task instructions and question(s) are identical for every call in a task
+    and come first, and the per-row abstract comes last.
+    """
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"{instructions}\n\nAbstract:\n{abstract_text}"}
+    ]
+
+def with_guidance(instructions, guidance=''):
+    """Append user-supplied guidance (definitions, examples) to the static instructions"""
+    if not guidance:
+        return instructions
+    return f"{instructions}\n\nAdditional instructions:\n{guidance}"
+
+def question_instructions(question, guidance=''):
+    """Static prompt prefix for a single free-text question"""
+    return with_guidance(
+        "Answer the question below concisely, based only on the abstract that follows.",
+        guidance
+    ) + f"\n\nQuestion: {question}"
+
+def multi_question_instructions(questions, guidance=''):
+    """Static prompt prefix for several questions answered as JSON keys q1, q2, ..."""
+    numbered_questions = "\n".join(f"q{i + 1}: {question}" for i, question in enumerate(questions))
+    return with_guidance(
+        "Answer each question below concisely, based only on the abstract that follows. "
+        "Return a JSON object with one answer per question id.",
+        guidance
+    ) + f"\n\nQuestions:\n{numbered_questions}"
+
+def extraction_instructions(fields, guidance=''):
+    """Static prompt prefix for structured extraction with JSON keys f1, f2, ..."""
+    field_lines = "\n".join(
+        f"f{i + 1}: {field['name']} ({field['type']}"
+        + (f"; one of {', '.join(field['values'])}" if field['values'] else '')
+        + ")"
+        + (f" - {field['description']}" if field['description'] else '')
+        for i, field in enumerate(fields)
+    )
+    return with_guidance(
+        "Extract the fields below from the abstract that follows. "
+        "Use null when the abstract does not report a value.",
+        guidance
+    ) + f"\n\nFields:\n{field_lines}"
+
+def annotation_instructions(questions, fields, guidance=''):
+    """The static prompt prefix a task sends with every abstract"""
+    if fields:
+        return extraction_instructions(fields, guidance)
+    if len(questions) == 1:
+        return question_instructions(questions[0], guidance)
+    return multi_question_instructions(questions, guidance)
+
+@functools.lru_cache(maxsize=32)
+def get_openai_client(api_key, timeout):
+    """Shared client per key and timeout; building one per call costs ~35ms of CPU and its connection pool"""
+    from openai import OpenAI
+
+    # Retries are handled in request_chat_completion so they can be counted and backed off consistently
+    return OpenAI(api_key=api_key, base_url=OPENAI_BASE_URL, timeout=timeout, max_retries=0)
+
+def is_throttling_error(error):
+    """Whether an API error means the provider is overloaded (429 or timeout)"""
+    if getattr(error, 'status_code', None) == 429:
+        return True
+    name = type(error).__name__
+    return 'RateLimit' in name or 'Timeout' in name
+
+def is_retryable_error(error):
+    """Throttling, timeouts, connection failures and 5xx responses are worth retrying"""
+    if is_throttling_error(error):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    if status_code is not None:
+        return status_code >= 500
+    return 'Connection' in type(error).__name__
+
+def model_error_kind(error):
+    """Coarse error category for model call metrics"""
+    if getattr(error, 'status_code', None) == 429 or 'RateLimit' in type(error).__name__:
+        return 'throttled'
+    if 'Timeout' in type(error).__name__:
+        return 'timeout'
+    status_code = getattr(error, 'status_code', None)
+    if status_code is not None:
+        return 'server' if status_code >= 500 else 'client'
+    return 'connection' if 'Connection' in type(error).__name__ else 'other'
+
+def response_token_counts(response):
+    """Prompt, completion, cached and reasoning tokens reported for one API response"""
+    response_usage = getattr(response, 'usage', None)
+    prompt_details = getattr(response_usage, 'prompt_tokens_details', None)
+    completion_details = getattr(response_usage, 'completion_tokens_details', None)
+    return {
+        'prompt_tokens': getattr(response_usage, 'prompt_tokens', 0) or 0,
+        'completion_tokens': getattr(response_usage, 'completion_tokens', 0) or 0,
+        'cached_tokens': getattr(prompt_details, 'cached_tokens', 0) or 0,
+        'reasoning_tokens': getattr(completion_details, 'reasoning_tokens', 0) or 0
+    }
+
+def usage_cost(model, tokens):
+    """USD cost of token counts at MODEL_PRICING rates (reasoning tokens are billed as completion)"""
+    pricing = MODEL_PRICING.get(model, MODEL_PRICING[ESTIMATE_FALLBACK_MODEL])
+    uncached = tokens.get('prompt_tokens', 0) - tokens.get('cached_tokens', 0)
+    return (uncached * pricing['input'] + tokens.get('cached_tokens', 0) * pricing['cached_input']
+            + tokens.get('completion_tokens', 0) * pricing['output']) / 1_000_000
+
+def add_model_usage(totals, model_usage):
+    """Add per-model call and token counts into a model -> totals dict (cost is recomputed)"""
+    for model, counts in model_usage.items():
+        entry = totals.setdefault(model, dict.fromkeys(('calls',) + USAGE_TOKEN_FIELDS, 0))
+        for field in ('calls',) + USAGE_TOKEN_FIELDS:
+            entry[field] += counts.get(field, 0)
+        entry['cost_usd'] = round(usage_cost(model, entry), 6)
+    return totals
+
+def usage_total(model_usage):
+    """Sum a model -> totals dict over all models"""
+    total = dict.fromkeys(('calls',) + USAGE_TOKEN_FIELDS, 0)
+    for counts in model_usage.values():
+        for field in total:
+            total[field] += counts.get(field, 0)
+    total['cost_usd'] = round(sum(usage_cost(model, counts) for model, counts in model_usage.items()), 6)
+    return total
+
+def api_key_label(api_key):
+    """Non-reversible label for aggregating usage per API key"""
+    digest = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:8]
+    return f"...{(api_key or '')[-4:]} ({digest})"
+
+def record_usage(usage, response, model):
+    """Accumulate token counts from an API response into a usage dict, in total and per model"""
+    if usage is None or getattr(response, 'usage', None) is None:
+        return
+    tokens = response_token_counts(response)
+    for field, count in tokens.items():
+        usage[field] = usage.get(field, 0) + count
+    add_model_usage(usage.setdefault('models', {}), {model: dict(tokens, calls=1)})
+
+def record_response_metrics(response, model, outcome='ok'):
+    """Count a completed model call and its provider-reported tokens"""
+    metrics.inc('annotator_model_calls_total', model=model, outcome=outcome)
+    for field, count in response_token_counts(response).items():
+        metrics.inc(f'annotator_model_{field}_total', count, model=model)
+
+def hedged_call(attempt, model, usage=None, on_late_usage=None):
+    """
+    Run attempt(); if it outlives the model's recent p95 latency, race an identical
+    request against it and return whichever succeeds first.
+    The losing request is billed as well, so its tokens are recorded when it
+    finishes: passed to on_late_usage(usage) if given, otherwise added to usage.
+    """
+    delay = call_latency_quantile(model, HEDGE_LATENCY_QUANTILE)
+    if delay is None:
+        return attempt()
+
+    # The pool is shared by all tasks, so time the primary from when it starts, not from when it queued
+    started = threading.Event()
+
+    def run_primary():
+        started.set()
+        return attempt()
+
+    primary = hedge_executor.submit(run_primary)
+    started.wait()
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    def record_loser(future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        response = future.result()
+        record_response_metrics(response, model, outcome='hedge_loser')
+        late_usage = {} if on_late_usage else usage
+        record_usage(late_usage, response, model)
+        if on_late_usage:
+            on_late_usage(late_usage)
+
+    if usage is not None:
+        usage['hedged'] = usage.get('hedged', 0) + 1
+    racers = {primary, hedge_executor.submit(attempt)}
+    pending = set(racers)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for loser in racers - {future}:
+                    loser.add_done_callback(record_loser)
+                return future.result()
+
+    # Both requests failed; surface the original error
+    return primary.result()
+
+def request_chat_completion(api_key, model, instructions, abstract_text, system_prompt=SYSTEM_PROMPT,
+                            usage=None, call_settings=None, **options):
+    """
+    Send one chat completion with the cache-friendly prompt layout and return its text.
+    call_settings may override the per-request timeout, the number of retries and
+    whether slow requests are hedged; its 'on_late_usage' callback receives the
+    usage of losing hedged requests that finish after this call returns.
+    """
+    call_settings = call_settings or {}
+    timeout = call_settings.get('timeout') or REQUEST_TIMEOUT_SECONDS
+    max_retries = call_settings.get('max_retries', REQUEST_MAX_RETRIES)
+    client = get_openai_client(api_key, timeout)
+
+    def attempt():
+        attempt_start = time.time()
+        response = client.chat.completions.create(
+            model=model,
+            messages=build_prompt_messages(instructions, abstract_text, system_prompt),
+            # Calls sharing a prefix share a key, so the provider routes them to the same cache
+            prompt_cache_key=hashlib.sha1(f"{system_prompt}\n{instructions}".encode('utf-8')).hexdigest(),
+            **options
+        )
+        # One sample per request, excluding retries, backoff and queueing, for hedge thresholds and estimates
+        record_call_latency(model, time.time() - attempt_start)
+        return response
+
+    start_time = time.time()
+    for retry in range(max_retries + 1):
+        try:
+            if call_settings.get('hedge'):
+                response = hedged_call(attempt, model, usage, call_settings.get('on_late_usage'))
+            else:
+                response = attempt()
+            break
+        except Exception as e:
+            metrics.inc('annotator_model_errors_total', model=model, error=model_error_kind(e))
+            if usage is not None and is_throttling_error(e):
+                usage['throttled'] = usage.get('throttled', 0) + 1
+            if retry >= max_retries or not is_retryable_error(e):
+                metrics.inc('annotator_model_calls_total', model=model, outcome='error')
+                raise
+            if usage is not None:
+                usage['retries'] = usage.get('retries', 0) + 1
+            # Exponential backoff with jitter
+            time.sleep(min(REQUEST_BACKOFF_MAX_SECONDS, REQUEST_BACKOFF_SECONDS * 2 ** retry) * random.uniform(0.5, 1.0))
+
+    metrics.observe('annotator_model_call_duration_seconds', time.time() - start_time, model=model)
+    record_response_metrics(response, model)
+    record_usage(usage, response, model)
+    return response.choices[0].message.content
+
+def get_openai_response(api_key, model, abstract_text, question, dry_run=False, allow_unclear=False,
+                        guidance='', usage=None, call_settings=None):
     """Get response from OpenAI API or generate mock response for dry run"""
     if dry_run:
-        # Generate random responses for dry run
-        responses = [
-            "Yes, this abstract mentions the treatment.",
-            "No, this is not mentioned in the abstract.",
-            "Partially relevant - see details in abstract.",
-            "Not applicable to this study.",
-            "Further investigation needed."
-        ]
         time.sleep(0.1)  # Simulate API delay
-        return random.choice(responses)
+        return dry_run_answer(allow_unclear)
 
     try:
-        from openai import OpenAI
+        instructions = question_instructions(question, guidance)
 
-        client = OpenAI(api_key=api_key)
+        answer = request_chat_completion(
+            api_key, model, instructions, abstract_text,
+            system_prompt=CASCADE_SYSTEM_PROMPT if allow_unclear else SYSTEM_PROMPT,
+            usage=usage,
+            call_settings=call_settings
+        )
+        return answer.strip()
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+def base_model_name(model):
+    """Model name without a dated snapshot suffix (gpt-4o-2024-08-06 -> gpt-4o)"""
+    return re.sub(r'-\d{4}-\d{2}-\d{2}$|-\d{4}$', '', model or '')
 
-        prompt = f"""Given the following abstract, please answer the question concisely.
+def json_answer_request(model, instructions, name, properties, required):
+    """
+    Instructions and request options for an answer given as a JSON object with these
+    properties: a strict JSON schema for models with structured outputs, otherwise
+    JSON mode (where available) with the keys spelled out in the instructions.
+    """
+    base_model = base_model_name(model)
+    if base_model in STRUCTURED_OUTPUT_MODELS:
+        return instructions, {
+            'response_format': {
+                'type': 'json_schema',
+                'json_schema': {
+                    'name': name,
+                    'strict': True,
+                    'schema': {
+                        'type': 'object',
+                        'properties': properties,
+                        'required': required,
+                        'additionalProperties': False
+                    }
+                }
+            }
+        }
 
-Abstract:
-{abstract_text}
+    types = {key: properties[key]['type'] for key in required}
+    key_lines = "\n".join(
+        f"{key}: {value_type if isinstance(value_type, str) else ' or '.join(value_type)}"
+        for key, value_type in types.items()
+    )
+    instructions += f"\n\nRespond with only a JSON object with these keys:\n{key_lines}"
+    if base_model in JSON_MODE_MODELS:
+        return instructions, {'response_format': {'type': 'json_object'}}
+    return instructions, {}
 
-Question: {question}
+def parse_json_answer(content):
+    """The JSON object in a model answer, allowing code fences or text around it without structured outputs"""
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        match = re.search(r'\{.*\}', content or '', re.DOTALL)
+        if match is None:
+            raise
+        return json.loads(match.group(0))
+
+def get_openai_multi_response(api_key, model, abstract_text, questions, dry_run=False, allow_unclear=False,
+                              guidance='', usage=None, call_settings=None):
+    """Answer several questions about one abstract in a single structured-output request"""
+    if dry_run:
+        time.sleep(0.1)  # Simulate API delay
+        return [dry_run_answer(allow_unclear) for _ in questions]
 
-Answer:"""
+    try:
+        keys = [f"q{i + 1}" for i in range(len(questions))]
+        instructions, options = json_answer_request(
+            model, multi_question_instructions(questions, guidance), 'abstract_answers',
+            {key: {'type': 'string'} for key in keys}, keys
+        )
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant analyzing medical abstracts. Provide concise, factual answers based only on the information in the abstract."},
-                {"role": "user", "content": prompt}
-            ]
+        content = request_chat_completion(
+            api_key, model, instructions, abstract_text,
+            system_prompt=CASCADE_SYSTEM_PROMPT if allow_unclear else SYSTEM_PROMPT,
+            usage=usage,
+            call_settings=call_settings,
+            **options
         )
 
-        return response.choices[0].message.content.strip()
+        parsed = parse_json_answer(content)
+        return [str(parsed.get(key, '')).strip() for key in keys]
     except Exception as e:
-        return f"Error: {str(e)}"
+        return [f"Error: {str(e)}"] * len(questions)
+
+def parse_field_definitions(raw_fields):
+    """Validate user-supplied extraction fields; raises ValueError on bad input"""
+    fields = []
+    seen = set()
+    for raw in raw_fields:
+        name = str(raw.get('name', '')).strip()
+        field_type = str(raw.get('type', 'string')).strip().lower()
+        values = [str(v).strip() for v in (raw.get('values') or []) if str(v).strip()]
+
+        if not name:
+            raise ValueError('Every extraction field needs a name')
+        if name in seen:
+            raise ValueError(f"Duplicate extraction field: {name}")
+        if field_type not in FIELD_TYPES:
+            raise ValueError(f"Unknown type '{field_type}' for field {name} (use one of: {', '.join(FIELD_TYPES)})")
+        if field_type == 'category' and not values:
+            raise ValueError(f"Category field {name} needs a list of values")
+
+        seen.add(name)
+        fields.append({
+            'name': name,
+            'type': field_type,
+            'values': values,
+            'description': str(raw.get('description', '') or '').strip()
+        })
+    return fields
+
+def field_json_schema(field):
+    """JSON-schema property for one extraction field (null means not reported)"""
+    schema = {'type': [FIELD_TYPES[field['type']], 'null']}
+    if field['type'] == 'category':
+        schema['enum'] = field['values'] + [None]
+    schema['description'] = field['name'] + (f" - {field['description']}" if field['description'] else '')
+    return schema
+
+def dry_run_field_value(field):
+    """Random value of the right type for dry runs"""
+    if field['type'] == 'number':
+        return round(random.uniform(0, 100), 1)
+    if field['type'] == 'integer':
+        return random.randint(10, 1000)
+    if field['type'] == 'boolean':
+        return random.choice([True, False, None])
+    if field['type'] == 'category':
+        return random.choice(field['values'] + [None])
+    return random.choice(DRY_RUN_RESPONSES)
+
+def get_openai_extraction(api_key, model, abstract_text, fields, dry_run=False, allow_unclear=False,
+                          guidance='', usage=None, call_settings=None):
+    """
+    Extract typed fields from one abstract using a JSON-schema response format.
+    Returns (values, error) with values in field order; unreported values are None.
+    With allow_unclear the model also reports whether it is confident, and an
+    unconfident extraction comes back with CASCADE_UNCLEAR_MARKER as the error.
+    """
+    if dry_run:
+        time.sleep(0.1)  # Simulate API delay
+        values = [dry_run_field_value(field) for field in fields]
+        if allow_unclear and random.random() < DRY_RUN_UNCLEAR_RATE:
+            return values, CASCADE_UNCLEAR_MARKER
+        return values, None
+
+    try:
+        # Field names are free text, so the schema uses positional keys
+        keys = [f"f{i + 1}" for i in range(len(fields))]
+
+        properties = {key: field_json_schema(field) for key, field in zip(keys, fields)}
+        required = list(keys)
+        if allow_unclear:
+            properties['confident'] = {
+                'type': 'boolean',
+                'description': 'Whether the abstract clearly reports every field'
+            }
+            required.append('confident')
+        instructions, options = json_answer_request(
+            model, extraction_instructions(fields, guidance), 'abstract_fields', properties, required
+        )
+
+        content = request_chat_completion(
+            api_key, model, instructions, abstract_text,
+            usage=usage,
+            call_settings=call_settings,
+            **options
+        )
+
+        parsed = parse_json_answer(content)
+        if allow_unclear and not parsed.get('confident', True):
+            return [parsed.get(key) for key in keys], CASCADE_UNCLEAR_MARKER
+        return [parsed.get(key) for key in keys], None
+    except Exception as e:
+        return [None] * len(fields), f"Error: {str(e)}"
+
+def typed_field_column(values, field):
+    """Convert raw extracted values into a typed column (numeric, boolean or categorical)"""
+    if field['type'] == 'number':
+        return pd.to_numeric(values, errors='coerce').astype('float64')
+    if field['type'] == 'integer':
+        return pd.to_numeric(values, errors='coerce').round().astype('Int64')
+    if field['type'] == 'boolean':
+        truthy = {'true': True, 'yes': True, 'false': False, 'no': False}
+        return values.map(
+            lambda v: v if isinstance(v, bool) else truthy.get(str(v).strip().lower())
+        ).astype('boolean')
+    if field['type'] == 'category':
+        return pd.Series(pd.Categorical(values, categories=field['values']), index=values.index)
+    return values
+
+def answer_column_names(questions):
+    """Build one unique 'Answer: ...' column name per question"""
+    columns = []
+    for question in questions:
+        column = f"Answer: {question[:50]}..."
+        suffix = 2
+        while column in columns:
+            column = f"Answer: {question[:50]}... ({suffix})"
+            suffix += 1
+        columns.append(column)
+    return columns
+
+def annotate_abstract(api_key, model, abstract_text, questions, fields, dry_run, allow_unclear=False,
+                      guidance='', usage=None, call_settings=None):
+    """Answer all questions (or extract all fields) for one abstract; returns the answer list"""
+    if fields:
+        values, error = get_openai_extraction(
+            api_key, model, abstract_text, fields, dry_run, allow_unclear, guidance, usage, call_settings
+        )
+        return values + [error]
+    if len(questions) == 1:
+        return [get_openai_response(
+            api_key, model, abstract_text, questions[0], dry_run, allow_unclear, guidance, usage, call_settings
+        )]
+    return get_openai_multi_response(
+        api_key, model, abstract_text, questions, dry_run, allow_unclear, guidance, usage, call_settings
+    )
 
-def process_abstracts_batch(task_id, abstracts_batch, api_key, model, question, dry_run, thread_id):
-    """Process a batch of abstracts"""
+def has_error(answers):
+    """Whether any answer is an API error message"""
+    return any(isinstance(answer, str) and answer.startswith('Error:') for answer in answers)
+
+def needs_escalation(answers):
+    """A cascade row is escalated if any answer is UNCLEAR or an error"""
+    for answer in answers:
+        if isinstance(answer, str) and answer.strip().upper().startswith(CASCADE_UNCLEAR_MARKER):
+            return True
+    return has_error(answers)
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on in-flight model requests: grow by one after a full window of
+    healthy calls, halve on throttling (429s or timeouts).
+    """
+
+    def __init__(self, max_limit, initial_limit=ADAPTIVE_INITIAL_CONCURRENCY):
+        self.max_limit = max(1, max_limit)
+        self.limit = max(1, min(initial_limit, self.max_limit))
+        self.in_flight = 0
+        self.healthy_calls = 0
+        self.smoothed_latency = None
+        self.baseline_latency = None
+        self.last_decrease = 0.0
+        self.started = time.time()
+        self.history = [[0.0, self.limit]]  # [seconds since start, limit] at every change
+        self.condition = threading.Condition()
+
+    def _set_limit(self, limit, now):
+        self.limit = limit
+        self.healthy_calls = 0
+        self.history.append([round(now - self.started, 1), limit])
+
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency, throttled=False, failed=False):
+        with self.condition:
+            self.in_flight -= 1
+            now = time.time()
+
+            if throttled:
+                # A 429 on a request sent before the last cut was caused by the old,
+                # higher limit, which that cut already answered; latency is measured
+                # from when the request was issued (retries included)
+                if now - latency > self.last_decrease:
+                    self._set_limit(max(1, int(self.limit * ADAPTIVE_DECREASE_FACTOR)), now)
+                    self.last_decrease = now
+            elif not failed:
+                self.smoothed_latency = latency if self.smoothed_latency is None else (
+                    0.8 * self.smoothed_latency + 0.2 * latency
+                )
+                if self.baseline_latency is None or self.smoothed_latency < self.baseline_latency:
+                    self.baseline_latency = self.smoothed_latency
+
+                # Only grow while latency stays close to the best seen so far
+                if self.smoothed_latency <= ADAPTIVE_LATENCY_TOLERANCE * self.baseline_latency:
+                    self.healthy_calls += 1
+                    if self.healthy_calls >= self.limit and self.limit < self.max_limit:
+                        self._set_limit(self.limit + 1, now)
+
+            self.condition.notify_all()
+
+def add_task_usage(progress, api_key, usage):
+    """Add a usage dict's tokens and cost to a task's progress and its API key's totals (hold progress_lock)"""
+    for field in USAGE_TOKEN_FIELDS:
+        progress[field] += usage.get(field, 0)
+    if usage.get('models'):
+        add_model_usage(progress['usage_by_model'], usage['models'])
+        progress['cost_usd'] = usage_total(progress['usage_by_model'])['cost_usd']
+        add_model_usage(usage_by_api_key.setdefault(api_key_label(api_key), {}), usage['models'])
+
+def process_abstracts_batch(task_id, abstracts_batch, api_key, model, questions, dry_run, thread_id,
+                            fields=None, cascade_model=None, guidance='', limiter=None, call_settings=None):
+    """
+    Process a batch of abstracts, answering every question for each one.
+    In extraction mode (fields given) answers are the typed field values
+    followed by an error message (None on success). With cascade_model,
+    rows the first model is unsure about are re-run on cascade_model.
+    guidance is appended to the shared (cacheable) instruction prefix.
+    With a limiter, every model call waits for an adaptive concurrency slot.
+    call_settings carries the per-request timeout, retry and hedging options.
+    """
     results = []
+
+    def record_late_usage(usage):
+        # Losing hedged requests finish after their row was counted; bill them to the task
+        with progress_lock:
+            if task_id in annotation_progress:
+                add_task_usage(annotation_progress[task_id], api_key, usage)
+
+    call_settings = dict(call_settings or {}, on_late_usage=record_late_usage)
+
+    def call_model(call_model_name, abstract_text, usage, allow_unclear=False):
+        throttled_before = usage.get('throttled', 0)
+        if limiter:
+            limiter.acquire()
+        call_start = time.time()
+        try:
+            answers = annotate_abstract(
+                api_key, call_model_name, abstract_text, questions, fields, dry_run,
+                allow_unclear=allow_unclear, guidance=guidance, usage=usage, call_settings=call_settings
+            )
+        except Exception:
+            if limiter:
+                limiter.release(time.time() - call_start, failed=True)
+            raise
+        latency = time.time() - call_start
+        if limiter:
+            limiter.release(
+                latency,
+                throttled=usage.get('throttled', 0) > throttled_before,
+                failed=has_error(answers)
+            )
+        return answers
     
     for idx, (index, row) in enumerate(abstracts_batch):
         try:
             abstract_text = row.get('Abstract', '')
+            answered_by = ''
+            usage = {}
             if not abstract_text:
-                answer = "No abstract available"
+                if fields:
+                    answers = [None] * len(fields) + ["No abstract available"]
+                else:
+                    answers = ["No abstract available"] * len(questions)
             else:
-                answer = get_openai_response(api_key, model, abstract_text, question, dry_run)
+                answers = call_model(model, abstract_text, usage, allow_unclear=bool(cascade_model))
+                answered_by = model
+
+                if cascade_model and needs_escalation(answers):
+                    answers = call_model(cascade_model, abstract_text, usage)
+                    answered_by = cascade_model
+                    with progress_lock:
+                        annotation_progress[task_id]['escalated'] += 1
             
             results.append({
                 'index': index,
-                'answer': answer
+                'answers': answers,
+                'answered_by': answered_by,
+                'usage': usage
             })
             
-            # Update progress
-            with threading.Lock():
-                annotation_progress[task_id]['completed'] += 1
+            # Update progress and token stats
+            with progress_lock:
+                progress = annotation_progress[task_id]
+                progress['completed'] += 1
+                add_task_usage(progress, api_key, usage)
+                progress['throttled'] += usage.get('throttled', 0)
+                progress['retries'] += usage.get('retries', 0)
+                progress['hedged'] += usage.get('hedged', 0)
+                if limiter:
+                    progress['concurrency'] = limiter.limit
                 
         except Exception as e:
             results.append({
                 'index': index,
-                'answer': f"Error: {str(e)}"
+                'answers': [None] * len(fields) + [f"Error: {str(e)}"] if fields else [f"Error: {str(e)}"] * len(questions),
+                'answered_by': '',
+                'usage': {}
             })
     
     return results
 
+@functools.lru_cache(maxsize=1)
+def get_tokenizer():
+    """Local tokenizer for estimates: tiktoken if installed, otherwise None (chars/token heuristic)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding('o200k_base')
+    except Exception:
+        return None
+
+def count_tokens(text):
+    """Count tokens locally with the cached tokenizer or the chars/token heuristic"""
+    tokenizer = get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, disallowed_special=()))
+    return (len(text) + ESTIMATE_CHARS_PER_TOKEN - 1) // ESTIMATE_CHARS_PER_TOKEN
+
+def tokenizer_name():
+    """How count_tokens counts, as reported with estimates"""
+    if get_tokenizer() is not None:
+        return 'tiktoken o200k_base'
+    return f"heuristic ({ESTIMATE_CHARS_PER_TOKEN} chars/token)"
+
+def load_abstract_token_counts(df):
+    """
+    Per-row token counts of the 'Abstract' column for estimates, counted at startup
+    (or loaded from DATA_CACHE_DIR) so no request has to tokenize the corpus.
+    """
+    start = time.time()
+
+    def build():
+        texts = df.get('Abstract', pd.Series('', index=df.index)).astype(str)
+        return {'counts': np.fromiter(map(count_tokens, texts), dtype=np.int64, count=len(texts))}
+
+    counts = pd.Series(cached_arrays('tokens', build, (tokenizer_name(),))['counts'], index=df.index)
+    if len(df):
+        print(f"Abstract token counts: {int(counts.sum())} tokens, {tokenizer_name()} ({time.time() - start:.1f}s)")
+    return counts
+
+abstract_token_counts = load_abstract_token_counts(abstracts_df)
+
+def record_call_latency(model, seconds):
+    """Remember one successful model request's latency for hedging thresholds and estimates"""
+    with progress_lock:
+        recent_call_latencies.setdefault(model, deque(maxlen=ESTIMATE_LATENCY_HISTORY)).append(seconds)
+
+def call_latency_quantile(model, quantile, min_samples=HEDGE_MIN_SAMPLES):
+    """Latency quantile of recent real calls to a model, or None if too few were seen"""
+    with progress_lock:
+        latencies = list(recent_call_latencies.get(model, []))
+    if len(latencies) < min_samples:
+        return None
+    return float(np.quantile(latencies, quantile))
+
+def observed_call_latency(model):
+    """Median latency of recent real calls to a model, or None if too few were seen"""
+    with progress_lock:
+        latencies = list(recent_call_latencies.get(model, []))
+    if len(latencies) < ESTIMATE_MIN_LATENCY_SAMPLES:
+        return None
+    return float(np.median(latencies))
+
+def token_calibration_factor():
+    """Ratio of real to locally estimated prompt tokens over recent completed tasks"""
+    actual = estimated = 0
+    for progress in list(annotation_progress.values()):
+        if (progress.get('status') == 'completed' and progress.get('prompt_tokens')
+                and not progress.get('cascade_model')):
+            actual += progress['prompt_tokens']
+            estimated += progress.get('estimated_prompt_tokens', 0)
+    return actual / estimated if actual and estimated else 1.0
+
+def observed_escalation_rate():
+    """Share of calls escalated by recent real cascade tasks, or the default"""
+    escalated = completed = 0
+    for progress in list(annotation_progress.values()):
+        if progress.get('status') == 'completed' and progress.get('cascade_model') and not progress.get('dry_run'):
+            escalated += progress.get('escalated', 0)
+            completed += progress.get('completed', 0)
+    return escalated / completed if completed else ESTIMATE_DEFAULT_ESCALATION_RATE
+
+def estimate_annotation(settings, plan):
+    """Expected tokens, cost and wall-clock time for an annotation task"""
+    model = settings['model']
+    pricing = MODEL_PRICING.get(model, MODEL_PRICING[ESTIMATE_FALLBACK_MODEL])
+    request_df = plan['request_df']
+
+    # Only rows with abstract text reach the model
+    texts = request_df.get('Abstract', pd.Series('', index=request_df.index)).astype(str)
+    call_indices = request_df.index[(texts != '').values]
+    calls = len(call_indices)
+
+    calibration = token_calibration_factor()
+    system_prompt = CASCADE_SYSTEM_PROMPT if settings['cascade_model'] else SYSTEM_PROMPT
+    instructions = annotation_instructions(settings['questions'], settings['fields'], settings['guidance'])
+    prefix_tokens = count_tokens(system_prompt) + count_tokens(instructions) + ESTIMATE_MESSAGE_OVERHEAD_TOKENS
+    abstract_tokens = int(abstract_token_counts.loc[call_indices].sum())
+    input_tokens = round((abstract_tokens + prefix_tokens * calls) * calibration)
+
+    # The provider caches prefixes of 1024+ tokens in 128-token steps, after the first call
+    cacheable_tokens = (prefix_tokens // 128) * 128 if prefix_tokens >= PROMPT_CACHE_MIN_TOKENS else 0
+    cached_tokens = cacheable_tokens * max(0, calls - 1)
+
+    answers_per_call = len(settings['fields']) or len(settings['questions'])
+    output_tokens_per_call = pricing['output_tokens'] + ESTIMATE_OUTPUT_TOKENS_PER_EXTRA_ANSWER * (answers_per_call - 1)
+    output_tokens = calls * output_tokens_per_call
+
+    def cost(prices, uncached, cached, output):
+        return (uncached * prices['input'] + cached * prices['cached_input'] + output * prices['output']) / 1e6
+
+    estimated_cost = cost(pricing, input_tokens - cached_tokens, cached_tokens, output_tokens)
+
+    latency = observed_call_latency(model)
+    latency_source = 'observed' if latency is not None else 'default'
+    if latency is None:
+        latency = pricing['seconds_per_call']
+
+    concurrency = max(1, min(settings['num_threads'], calls or 1))
+    estimated_seconds = -(-calls // concurrency) * latency
+
+    estimate = {
+        'model': model,
+        'abstracts': len(plan['filtered_df']),
+        'requests': calls,
+        'near_duplicates_skipped': plan['near_duplicates_skipped'],
+        'duplicate_calls_saved': plan['duplicate_calls_saved'],
+        'tokenizer': tokenizer_name(),
+        'token_calibration': round(calibration, 3),
+        'prefix_tokens': prefix_tokens,
+        'input_tokens': input_tokens,
+        'cached_input_tokens': cached_tokens,
+        'output_tokens': output_tokens,
+        'concurrency': concurrency,
+        'seconds_per_call': round(latency, 2),
+        'latency_source': latency_source,
+        'priced': model in MODEL_PRICING
+    }
+
+    # A cascade re-runs the expected share of rows on the stronger model
+    cascade_model = settings['cascade_model']
+    if cascade_model:
+        cascade_pricing = MODEL_PRICING.get(cascade_model, MODEL_PRICING[ESTIMATE_FALLBACK_MODEL])
+        escalation_rate = observed_escalation_rate()
+        escalated_calls = round(calls * escalation_rate)
+        escalated_input = round(input_tokens * escalation_rate)
+        escalated_output = escalated_calls * (
+            cascade_pricing['output_tokens'] + ESTIMATE_OUTPUT_TOKENS_PER_EXTRA_ANSWER * (answers_per_call - 1)
+        )
+        estimated_cost += cost(cascade_pricing, escalated_input, 0, escalated_output)
+        cascade_latency = observed_call_latency(cascade_model) or cascade_pricing['seconds_per_call']
+        estimated_seconds += escalated_calls / concurrency * cascade_latency
+        estimate.update({
+            'cascade_model': cascade_model,
+            'escalation_rate': round(escalation_rate, 3),
+            'escalated_requests': escalated_calls
+        })
+
+    estimate['estimated_cost_usd'] = round(estimated_cost, 4)
+    estimate['estimated_seconds'] = round(estimated_seconds, 1)
+    return estimate
+
+@app.before_request
+def start_request_timer():
+    """Remember when the request started for the latency histogram"""
+    g.request_start = time.time()
+
+@app.after_request
+def record_request_metrics(response):
+    """Observe request latency per route template (bounded label values)"""
+    start = g.get('request_start')
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.time() - start,
+                        method=request.method, route=route, status=str(response.status_code))
+    return response
+
+def accepted_encoding():
+    """'br' or 'gzip', whichever the client accepts (brotli only when installed), else None"""
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br'
+    if request.accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def compress_body(body, encoding):
+    """Bytes compressed with brotli ('br') or gzip"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)    # wbits 31 = gzip container
+    return compressor.compress(body) + compressor.flush()
+
+@app.after_request
+def compress_response(response):
+    """Compress JSON and CSV bodies with brotli or gzip, whichever the client accepts"""
+    if (response.status_code != 200 or response.mimetype not in COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    encoding = accepted_encoding()
+    if encoding is None:
+        return response
+
+    # send_file responses (CSV downloads) pass their buffer through; read it here
+    response.direct_passthrough = False
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)     # A strong tag would promise byte-identical bodies
+    response.headers.pop('Accept-Ranges', None)     # Byte ranges would refer to the uncompressed body
+    return response
+
+def conditional_get(view=None, state=None):
+    """
+    Tag responses with an ETag from the data version, path and query string,
+    and answer a matching If-None-Match with 304 without running the view.
+    Only for views whose output depends on nothing else, unless `state` is given:
+    it maps the view's arguments to a string covering what else the output depends
+    on, or None when the resource does not exist here (the view then always runs).
+    """
+    if view is None:
+        return lambda view: conditional_get(view, state)
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        version = DATA_VERSION
+        if state is not None:
+            resource_state = state(*args, **kwargs)
+            if resource_state is None:
+                return view(*args, **kwargs)
+            version = f"{DATA_VERSION}|{resource_state}"
+        query = sorted(request.args.items(multi=True))
+        etag = hashlib.sha1(f"{version}|{request.path}|{query}".encode('utf-8')).hexdigest()[:20]
+        if request.if_none_match.contains_weak(etag) and not request.if_none_match.star_tag:
+            metrics.inc('annotator_cache_requests_total', cache='etag', result='hit')
+            response = app.response_class(status=304)
+        else:
+            metrics.inc('annotator_cache_requests_total', cache='etag', result='miss')
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        # Weak, since the same tag covers the gzip, brotli and identity encodings
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'    # Cache, but revalidate every time
+        return response
+    return wrapper
+
+def fingerprint_assets(names):
+    """
+    Content-hashed URL for each static asset (app.js -> /static/app.3f2a9c1b0d4e.js),
+    and the reverse mapping from hashed file name to the file on disk.
+    """
+    urls, sources = {}, {}
+    for name in names:
+        with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{digest}{ext}"
+        urls[name] = f"/static/{hashed}"
+        sources[hashed] = name
+    return urls, sources
+
+asset_urls, fingerprinted_assets = fingerprint_assets(STATIC_ASSETS)
+
+@functools.lru_cache(maxsize=None)
+def compressed_asset(hashed_name, encoding):
+    """A fingerprinted asset compressed once per encoding (its content never changes under that name)"""
+    with open(os.path.join(STATIC_DIR, fingerprinted_assets[hashed_name]), 'rb') as f:
+        return compress_body(f.read(), encoding)
+
+@functools.lru_cache(maxsize=4)
+def render_index(openai_api_key):
+    """Render the page shell once per API key value"""
+    return render_template_string(HTML_TEMPLATE, openai_api_key=openai_api_key, asset_urls=asset_urls)
+
 @app.route('/')
 def index():
     """Render the main page"""
     # Get OpenAI API key from environment if available
     openai_api_key = os.environ.get('OPENAI_API_KEY', '')
-    return render_template_string(HTML_TEMPLATE, openai_api_key=openai_api_key)
+    response = app.make_response(render_index(openai_api_key))
+    response.add_etag()
+    response.headers['Cache-Control'] = 'private, no-cache'    # Revalidate; may embed the API key
+    return response.make_conditional(request)
+
+@app.route('/static/<path:filename>')
+def static_asset(filename):
+    """Serve static files; fingerprinted names are cached by browsers for a year"""
+    source = fingerprinted_assets.get(filename)
+    if source is None:
+        return send_from_directory(STATIC_DIR, filename)
+    encoding = accepted_encoding()
+    if encoding is None:
+        response = send_from_directory(STATIC_DIR, source, max_age=STATIC_MAX_AGE_SECONDS)
+    else:
+        # Served from the compressed copy, so compress_response leaves it alone
+        response = app.response_class(compressed_asset(filename, encoding), mimetype=mimetypes.guess_type(source)[0])
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(f"{filename}-{encoding}")
+        response = response.make_conditional(request)
+    response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE_SECONDS}, immutable'
+    return response
+
+def requested_fields():
+    """Column projection from ?fields=a,b,c (None returns every column)"""
+    fields = request.args.get('fields', '')
+    fields = {field.strip() for field in fields.split(',') if field.strip()}
+    return fields or None
+
+def requested_facet_filters():
+    """Facet filters from repeated ?facet=Column:value parameters; raises ValueError for unknown facets"""
+    selections = {}
+    for item in request.args.getlist('facet'):
+        column, _, value = item.partition(':')
+        selections.setdefault(column, []).append(value)
+    return parse_facet_filters(selections)
 
 @app.route('/api/abstracts')
+@conditional_get
 def get_abstracts():
-    """Get paginated abstracts data with efficient filtering"""
-    page = int(request.args.get('page', 1))
+    """
+    Get paginated abstracts data with efficient filtering.
+    Pages come from a cached snapshot of the query result: either by number
+    (page, search, show_empty, facet filters) or by the opaque next/prev cursors
+    of an earlier page. Facet counts of the whole result come with every page
+    unless facets=false.
+    """
     per_page = int(request.args.get('per_page', 20))
-    search = request.args.get('search', '')
-    show_empty = request.args.get('show_empty', 'false').lower() == 'true'
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            version, search, show_empty, facet_filters, start = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if version != DATA_VERSION:
+            return jsonify({'error': 'The abstracts were reloaded since this cursor was issued; start from the first page'}), 410
+    else:
+        page = int(request.args.get('page', 1))
+        search = request.args.get('search', '')
+        show_empty = request.args.get('show_empty', 'false').lower() == 'true'
+        try:
+            facet_filters = requested_facet_filters()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        start = (page - 1) * per_page
 
     # Cleanup old results periodically (every request is fine given low frequency)
     cleanup_old_results()
 
-    # Use efficient filtering
-    mask, matched_keywords = filter_dataframe_efficient(abstracts_df, search, show_empty)
-
-    # Get filtered indices (avoid full copy)
-    filtered_indices = abstracts_df.index[mask]
-    total = len(filtered_indices)
+    # Filtered row positions, computed once per query and data version
+    snapshot = result_snapshot(search, show_empty, facet_filters)
+    total = len(snapshot['positions'])
 
-    # Paginate using indices
-    start = (page - 1) * per_page
+    # Paginate using positions
     end = start + per_page
-    page_indices = filtered_indices[start:end]
-
-    # Only copy the data we need for this page
-    page_df = abstracts_df.loc[page_indices].copy()
+    page_positions = snapshot['positions'][start:end]
 
     # Add matched keywords if search was used
+    extra_columns = {}
     if search:
-        page_df['Matched Keywords'] = matched_keywords[page_indices]
+        extra_columns['Matched Keywords'] = snapshot['keywords'][start:end]
 
-    # Convert to dict for JSON response
-    data = page_df.to_dict('records')
+    # Encode only the requested columns and preview length, reusing the rows encoded at load time
+    data_json = records_json(abstracts_df, page_positions, requested_fields(), request.args.get('preview', type=int),
+                             extra_columns=extra_columns, fragments=abstracts_json)
 
     response_data = {
-        'data': data,
         'total': total,
-        'page': page,
+        'page': start // per_page + 1,
         'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
+        'total_pages': (total + per_page - 1) // per_page,
+        'next_cursor': encode_cursor(snapshot, end) if end < total else None,
+        'prev_cursor': encode_cursor(snapshot, max(0, start - per_page)) if start > 0 else None
     }
+    if request.args.get('facets', 'true').lower() != 'false':
+        response_data['facets'] = snapshot['facets']
 
     # Include search terms if present
     if search:
         search_terms = [term.strip() for term in search.split(';') if term.strip()]
         response_data['search_terms'] = search_terms
 
-    return jsonify(response_data)
+    return json_response(response_data, data_json)
+
+@app.route('/api/abstracts/<int:row_id>')
+@conditional_get
+def get_abstract(row_id):
+    """Full record of one abstract, fetched on demand by the modal and expanded rows"""
+    if row_id not in abstracts_df.index:
+        return jsonify({'error': 'Abstract not found'}), 404
+    position = abstracts_df.index.get_loc(row_id)
+    record_json = records_json(abstracts_df, [position], fragments=abstracts_json)[1:-1]
+    return app.response_class(record_json, mimetype='application/json')
+
+@app.route('/api/search/instant')
+@conditional_get
+def search_instant():
+    """Hit count and top matches for a word-prefix query, cheap enough to call on every keystroke"""
+    start = time.time()
+    query = request.args.get('q', '')
+    limit = max(0, min(request.args.get('limit', 10, type=int), INSTANT_SEARCH_MAX_RESULTS))
+    terms, hits, positions = instant_search(query, limit)
+    data_json = records_json(abstracts_df, positions, INSTANT_SEARCH_RESULT_FIELDS, fragments=abstracts_json)
+    return json_response({
+        'query': query,
+        'terms': terms,
+        'hits': hits,
+        'elapsed_ms': round((time.time() - start) * 1000, 2)
+    }, data_json)
+
+@app.route('/api/suggest')
+@conditional_get
+def suggest_completions():
+    """Ranked completions of the term, author or track being typed"""
+    start = time.time()
+    query = request.args.get('q', '')
+    limit = max(0, min(request.args.get('limit', 10, type=int), SUGGEST_MAX_RESULTS))
+    prefix = suggest_keys(pd.Series([query])).iat[0]
+    return jsonify({
+        'query': query,
+        'suggestions': suggest_index.suggest(prefix, limit),
+        'elapsed_ms': round((time.time() - start) * 1000, 2)
+    })
 
-@app.route('/api/annotate', methods=['POST'])
-def annotate_abstracts():
-    """Start annotation process with efficient filtering"""
-    data = request.json
-    api_key = data.get('api_key')
+def parse_annotation_request(data):
+    """Read annotation settings from a request body; raises ValueError on bad input"""
     model = data.get('model', 'gpt-3.5-turbo')
-    question = data.get('question')
-    num_threads = int(data.get('num_threads', 4))
-    dry_run = data.get('dry_run', False)
-    search_filter = data.get('search_filter', '')
-    show_empty = data.get('show_empty', False)
-
-    # Generate task ID
-    task_id = hashlib.md5(f"{question}{datetime.now()}".encode()).hexdigest()
+    questions = data.get('questions') or [data.get('question')]
+    questions = [q.strip() for q in questions if q and q.strip()]
+    cascade_model = data.get('cascade_model') or None
+    if cascade_model == model:
+        cascade_model = None
+
+    # Structured extraction mode replaces free-text questions with typed fields
+    fields = parse_field_definitions(data.get('fields') or [])
+
+    if fields:
+        question = f"Extract: {', '.join(field['name'] for field in fields)}"
+    elif questions:
+        question = questions[0]
+    else:
+        raise ValueError('No question provided')
+
+    return {
+        'api_key': data.get('api_key'),
+        'model': model,
+        'question': question,
+        'questions': questions,
+        'fields': fields,
+        'num_threads': int(data.get('num_threads', 4)),
+        'dry_run': data.get('dry_run', False),
+        'search_filter': data.get('search_filter', ''),
+        'show_empty': data.get('show_empty', False),
+        'facet_filters': parse_facet_filters(data.get('facets') or {}),
+        'dedupe_near_duplicates': data.get('dedupe_near_duplicates', False),
+        'cascade_model': cascade_model,
+        'guidance': (data.get('guidance') or '').strip(),
+        'adaptive_concurrency': data.get('adaptive_concurrency', False),
+        'call_settings': {
+            'timeout': float(data.get('request_timeout') or REQUEST_TIMEOUT_SECONDS),
+            'max_retries': int(data.get('max_retries', REQUEST_MAX_RETRIES)),
+            'hedge': bool(data.get('hedge_requests', False))
+        }
+    }
 
+def plan_annotation_rows(search_filter, show_empty, dedupe_near_duplicates, facet_filters=()):
+    """
+    Select the rows an annotation task covers and the subset that actually needs
+    a model request (one per near-duplicate group if requested, then one per
+    unique abstract text).
+    """
     # Use efficient filtering
     mask, matched_keywords = filter_dataframe_efficient(abstracts_df, search_filter, show_empty)
+    mask &= facet_filter_mask(facet_filters)
 
     # Get filtered indices
     filtered_indices = abstracts_df.index[mask]
@@ -1505,33 +2646,127 @@ def annotate_abstracts():
     if search_filter:
         filtered_df['Matched Keywords'] = matched_keywords[filtered_indices]
 
+    # Only annotate one representative per near-duplicate group if requested
+    representative_map = None
+    annotate_df = filtered_df
+    if dedupe_near_duplicates:
+        filtered_groups = near_duplicate_groups.loc[filtered_indices]
+        is_representative = ~filtered_groups.duplicated()
+        group_to_representative = pd.Series(
+            filtered_groups.index[is_representative.values],
+            index=filtered_groups[is_representative].values
+        )
+        representative_map = filtered_groups.map(group_to_representative)
+        annotate_df = filtered_df[is_representative.values]
+
+    # Issue one request per unique abstract text; identical rows share the answer
+    abstract_texts = annotate_df.get('Abstract', pd.Series('', index=annotate_df.index)).astype(str)
+    text_keys = abstract_texts.map(lambda text: hashlib.sha1(text.encode('utf-8')).hexdigest())
+    is_first_text = ~text_keys.duplicated()
+
+    return {
+        'filtered_df': filtered_df,
+        'representative_map': representative_map,
+        'text_keys': text_keys,
+        'request_df': annotate_df[is_first_text.values],
+        'near_duplicates_skipped': len(filtered_df) - len(annotate_df),
+        # Empty abstracts never reach the model, so they don't count as saved calls
+        'duplicate_calls_saved': int((~is_first_text & (abstract_texts != '')).sum())
+    }
+
+@app.route('/api/annotate', methods=['POST'])
+def annotate_abstracts():
+    """Start annotation process with efficient filtering"""
+    try:
+        settings = parse_annotation_request(request.json)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    api_key = settings['api_key']
+    model = settings['model']
+    question = settings['question']
+    questions = settings['questions']
+    fields = settings['fields']
+    num_threads = settings['num_threads']
+    dry_run = settings['dry_run']
+    cascade_model = settings['cascade_model']
+    guidance = settings['guidance']
+    adaptive_concurrency = settings['adaptive_concurrency']
+    call_settings = settings['call_settings']
+
+    # Generate task ID
+    task_id = hashlib.md5(f"{questions}{fields}{datetime.now()}".encode()).hexdigest()
+
+    plan = plan_annotation_rows(
+        settings['search_filter'], settings['show_empty'], settings['dedupe_near_duplicates'],
+        settings['facet_filters']
+    )
+    filtered_df = plan['filtered_df']
+    representative_map = plan['representative_map']
+    text_keys = plan['text_keys']
+    request_df = plan['request_df']
+    near_duplicates_skipped = plan['near_duplicates_skipped']
+    duplicate_calls_saved = plan['duplicate_calls_saved']
+    estimate = estimate_annotation(settings, plan)
+
     # Initialize progress tracking
-    total_abstracts = len(filtered_df)
+    total_abstracts = len(request_df)
     annotation_progress[task_id] = {
         'total': total_abstracts,
         'completed': 0,
         'status': 'running',
-        'question': question
+        'question': question,
+        'questions': questions,
+        'near_duplicates_skipped': near_duplicates_skipped,
+        'duplicate_calls_saved': duplicate_calls_saved,
+        'model': model,
+        'cascade_model': cascade_model,
+        'escalated': 0,
+        'prompt_tokens': 0,
+        'completion_tokens': 0,
+        'cached_tokens': 0,
+        'reasoning_tokens': 0,
+        'usage_by_model': {},
+        'cost_usd': 0.0,
+        # Uncalibrated local estimate, compared with real prompt tokens to calibrate later estimates
+        'estimated_prompt_tokens': estimate['input_tokens'] / estimate['token_calibration'],
+        'dry_run': dry_run,
+        'throttled': 0,
+        'retries': 0,
+        'hedged': 0,
+        'api_key_label': api_key_label(api_key)
     }
 
+    # Adaptive mode: num_threads is the ceiling and the AIMD limiter picks the in-flight count
+    limiter = None
+    if adaptive_concurrency:
+        limiter = AdaptiveConcurrencyLimiter(num_threads)
+        annotation_progress[task_id]['concurrency'] = limiter.limit
+        annotation_progress[task_id]['concurrency_history'] = limiter.history
+
     # Track creation time for cleanup
     annotation_timestamps[task_id] = datetime.now()
 
     # Split abstracts into batches for threading
-    abstracts_list = list(filtered_df.iterrows())
-    batch_size = max(1, total_abstracts // num_threads) if total_abstracts > num_threads else 1
+    abstracts_list = list(request_df.iterrows())
+    if adaptive_concurrency:
+        # One row per work item so idle workers pick up rows as the limit grows
+        batch_size = 1
+    else:
+        batch_size = max(1, total_abstracts // num_threads) if total_abstracts > num_threads else 1
     batches = [abstracts_list[i:i + batch_size] for i in range(0, total_abstracts, batch_size)]
 
     # Process in background
     def run_annotation():
         all_results = []
 
-        with ThreadPoolExecutor(max_workers=min(num_threads, len(batches))) as executor:
+        with ThreadPoolExecutor(max_workers=max(1, min(num_threads, len(batches)))) as executor:
             futures = []
             for i, batch in enumerate(batches):
                 future = executor.submit(
                     process_abstracts_batch,
-                    task_id, batch, api_key, model, question, dry_run, i
+                    task_id, batch, api_key, model, questions, dry_run, i, fields, cascade_model, guidance,
+                    limiter, call_settings
                 )
                 futures.append(future)
 
@@ -1542,19 +2777,61 @@ def annotate_abstracts():
 
         # Update dataframe with results
         result_df = filtered_df.copy()
-        answer_column = f"Answer: {question[:50]}..."
+        if fields:
+            answer_columns = [f"Answer: {field['name']}" for field in fields] + [EXTRACTION_ERROR_COLUMN]
+            no_answers = [None] * len(answer_columns)
+        else:
+            answer_columns = answer_column_names(questions)
+            no_answers = ['No answer'] * len(questions)
 
         # Create answer mapping
-        answer_map = {r['index']: r['answer'] for r in all_results}
+        answer_map = {r['index']: r['answers'] for r in all_results}
+
+        # Record which cascade tier answered each row alongside its answers
+        if cascade_model:
+            answer_columns = answer_columns + [ANSWERED_BY_COLUMN]
+            no_answers = no_answers + ['']
+            answer_map = {r['index']: r['answers'] + [r['answered_by']] for r in all_results}
+
+        # Broadcast answers to rows with identical abstract text
+        text_answers = {text_keys[idx]: answers for idx, answers in answer_map.items()}
+        answer_map = {idx: text_answers.get(key, no_answers) for idx, key in text_keys.items()}
+
+        # Fan representative answers out to their near-duplicates
+        if representative_map is not None:
+            result_df['Duplicate Group'] = abstracts_df.loc[representative_map.values, 'Abstract #'].values
+            answer_map = {idx: answer_map.get(rep, no_answers) for idx, rep in representative_map.items()}
+
+        # Add one answer column per question
+        for i, answer_column in enumerate(answer_columns):
+            result_df[answer_column] = result_df.index.map(lambda x: answer_map.get(x, no_answers)[i])
+
+        if cascade_model:
+            # Keep the tier next to the base columns rather than among the answers
+            result_df.insert(len(filtered_df.columns), ANSWERED_BY_COLUMN, result_df.pop(ANSWERED_BY_COLUMN))
+
+        # Tokens and cost of the calls made for each row; rows answered by a duplicate's call show 0
+        if not dry_run:
+            row_usage = {r['index']: r['usage'] for r in all_results}
+            for field, column in USAGE_COLUMNS.items():
+                if field == 'cost_usd':
+                    values = {idx: round(usage_total(u.get('models', {}))['cost_usd'], 6) for idx, u in row_usage.items()}
+                else:
+                    values = {idx: u.get(field, 0) for idx, u in row_usage.items()}
+                result_df[column] = result_df.index.map(lambda x: values.get(x, 0))
 
-        # Add the answer column
-        result_df[answer_column] = result_df.index.map(lambda x: answer_map.get(x, 'No answer'))
+        # Store extracted fields as typed columns so they filter and aggregate vectorized
+        for field, answer_column in zip(fields, answer_columns):
+            result_df[answer_column] = typed_field_column(result_df[answer_column], field)
+        if fields and result_df[EXTRACTION_ERROR_COLUMN].isna().all():
+            result_df = result_df.drop(columns=[EXTRACTION_ERROR_COLUMN])
 
         # Ensure all columns are preserved
         print(f"Result columns after annotation: {list(result_df.columns)}")
 
         # Store results
         annotation_results[task_id] = result_df
+        annotation_progress[task_id]['completed_at'] = datetime.now().isoformat()
         annotation_progress[task_id]['status'] = 'completed'
 
         # Clean up temporary variables and force garbage collection
@@ -1566,7 +2843,26 @@ def annotate_abstracts():
     thread = threading.Thread(target=run_annotation)
     thread.start()
 
-    return jsonify({'task_id': task_id, 'total': total_abstracts})
+    return jsonify({
+        'task_id': task_id,
+        'total': total_abstracts,
+        'near_duplicates_skipped': near_duplicates_skipped,
+        'duplicate_calls_saved': duplicate_calls_saved
+    })
+
+@app.route('/api/annotate/estimate', methods=['POST'])
+def estimate_annotation_task():
+    """Preflight estimate of tokens, cost and duration for an annotation request"""
+    try:
+        settings = parse_annotation_request(request.json)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    plan = plan_annotation_rows(
+        settings['search_filter'], settings['show_empty'], settings['dedupe_near_duplicates'],
+        settings['facet_filters']
+    )
+    return jsonify(estimate_annotation(settings, plan))
 
 @app.route('/api/progress/<task_id>')
 def get_progress(task_id):
@@ -1574,10 +2870,18 @@ def get_progress(task_id):
     if task_id not in annotation_progress:
         return jsonify({'error': 'Task not found'}), 404
     
-    progress = annotation_progress[task_id]
-    return jsonify(progress)
+    # Workers update token totals in place, so serialize under the lock
+    with progress_lock:
+        return jsonify(annotation_progress[task_id])
+
+def annotated_results_state(task_id):
+    """ETag state of a finished task's results, or None if this process does not hold them"""
+    if task_id not in annotation_results:
+        return None
+    return f"{task_id}|{annotation_progress.get(task_id, {}).get('completed_at', '')}"
 
 @app.route('/api/annotated/<task_id>')
+@conditional_get(state=annotated_results_state)
 def get_annotated_results(task_id):
     """Get annotated results for display in table"""
     if task_id not in annotation_results:
@@ -1593,11 +2897,14 @@ def get_annotated_results(task_id):
     start = (page - 1) * per_page
     end = start + per_page
     
-    # Convert to dict for JSON response
-    data = result_df.iloc[start:end].to_dict('records')
+    # Convert to dict for JSON response (missing typed values become null); answer
+    # columns (and the cascade's Answered By) are always kept since the question
+    # text is part of their names
+    answer_columns = [c for c in result_df.columns if c.startswith('Answer:') or c == ANSWERED_BY_COLUMN]
+    data_json = records_json(result_df, np.arange(max(start, 0), min(end, total)), requested_fields(),
+                             request.args.get('preview', type=int), keep_columns=answer_columns)
     
     response_data = {
-        'data': data,
         'total': total,
         'page': page,
         'per_page': per_page,
@@ -1609,16 +2916,21 @@ def get_annotated_results(task_id):
     if 'Matched Keywords' in result_df.columns:
         response_data['search_terms'] = True
     
-    return jsonify(response_data)
+    return json_response(response_data, data_json)
 
 @app.route('/api/download/current')
 def download_current_view():
     """Download current filtered view as CSV with streaming"""
     search = request.args.get('search', '')
     show_empty = request.args.get('show_empty', 'false').lower() == 'true'
+    try:
+        facet_filters = requested_facet_filters()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     # Use efficient filtering
     mask, matched_keywords = filter_dataframe_efficient(abstracts_df, search, show_empty)
+    mask &= facet_filter_mask(facet_filters)
 
     # Get filtered indices (avoid full copy)
     filtered_indices = abstracts_df.index[mask]
@@ -1634,8 +2946,8 @@ def download_current_view():
     # Create CSV with streaming to avoid loading everything in memory
     output = io.StringIO()
 
-    # Write header
-    output.write(','.join(existing_cols) + '\n')
+    # Write header (quoted like the rows, since answer columns carry free-text questions)
+    pd.DataFrame(columns=existing_cols).to_csv(output, index=False)
 
     # Write data in chunks to minimize memory usage
     chunk_size = 1000
@@ -1683,9 +2995,17 @@ def download_results(task_id):
     if 'Matched Keywords' in result_df.columns:
         base_cols.append('Matched Keywords')
 
-    # Add annotation columns
+    # Add near-duplicate grouping if the task was deduplicated
+    if 'Duplicate Group' in result_df.columns:
+        base_cols.append('Duplicate Group')
+
+    # Add the answering model if the task used a cascade
+    if ANSWERED_BY_COLUMN in result_df.columns:
+        base_cols.append(ANSWERED_BY_COLUMN)
+
+    # Add annotation columns, then per-row token usage and cost
     annotation_cols = [col for col in result_df.columns if col.startswith('Answer:')]
-    all_cols = base_cols + annotation_cols
+    all_cols = base_cols + annotation_cols + list(USAGE_COLUMNS.values())
 
     # Select only existing columns in the correct order
     existing_cols = [col for col in all_cols if col in result_df.columns]
@@ -1693,8 +3013,8 @@ def download_results(task_id):
     # Create CSV with streaming to avoid loading everything in memory
     output = io.StringIO()
 
-    # Write header
-    output.write(','.join(existing_cols) + '\n')
+    # Write header (quoted like the rows, since answer columns carry free-text questions)
+    pd.DataFrame(columns=existing_cols).to_csv(output, index=False)
 
     # Write data in chunks to minimize memory usage
     chunk_size = 1000
@@ -1719,6 +3039,7 @@ def download_results(task_id):
     )
 
 @app.route('/api/models')
+@conditional_get
 def get_models():
     """Get available OpenAI models"""
     return jsonify({
@@ -1738,6 +3059,7 @@ def get_models():
     })
 
 @app.route('/api/stats')
+@conditional_get
 def get_stats():
     """Get statistics about the loaded data"""
     total = len(abstracts_df)
@@ -1752,9 +3074,71 @@ def get_stats():
         'total_abstracts': with_abstracts,  # Show only abstracts with content by default
         'abstracts_with_text': with_abstracts,
         'total_all': total,  # Total including empty ones
-        'columns': list(abstracts_df.columns)
+        'near_duplicates': int((near_duplicate_groups != near_duplicate_groups.index).sum()),
+        'columns': list(abstracts_df.columns),
+        'memory': table_memory
     })
 
+def is_usage_admin():
+    """Whether the request carries the USAGE_ADMIN_TOKEN bearer token"""
+    if not USAGE_ADMIN_TOKEN:
+        return False
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(token.strip().encode('utf-8'),
+                                                              USAGE_ADMIN_TOKEN.encode('utf-8'))
+
+@app.route('/api/usage')
+def get_usage_summary():
+    """
+    Token usage and cost per model and per task for the API key sent in
+    USAGE_KEY_HEADER (since this process started); every key's with the admin token.
+    """
+    if is_usage_admin():
+        labels = None
+    elif request.headers.get(USAGE_KEY_HEADER):
+        labels = {api_key_label(request.headers[USAGE_KEY_HEADER])}
+    else:
+        return jsonify({'error': f'Send your OpenAI API key in the {USAGE_KEY_HEADER} header to see its usage'}), 401
+
+    with progress_lock:
+        by_api_key = {
+            label: {'models': {model: dict(counts) for model, counts in models.items()}, 'total': usage_total(models)}
+            for label, models in usage_by_api_key.items()
+            if labels is None or label in labels
+        }
+        by_model = {}
+        for label, models in usage_by_api_key.items():
+            if labels is None or label in labels:
+                add_model_usage(by_model, models)
+        tasks = [
+            {
+                'task_id': task_id,
+                'status': progress['status'],
+                'model': progress['model'],
+                'cascade_model': progress['cascade_model'],
+                'total': progress['total'],
+                'completed': progress['completed'],
+                'models': {model: dict(counts) for model, counts in progress['usage_by_model'].items()},
+                'total_usage': usage_total(progress['usage_by_model'])
+            }
+            for task_id, progress in annotation_progress.items()
+            if not progress.get('dry_run') and (labels is None or progress.get('api_key_label') in labels)
+        ]
+
+    response = jsonify({
+        'total': usage_total(by_model),
+        'by_model': by_model,
+        'by_api_key': by_api_key,
+        'tasks': tasks
+    })
+    response.headers['Cache-Control'] = 'private, no-store'    # Depends on the caller's key
+    return response
+
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus metrics summed over all server processes"""
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     # Get host and port from environment variables with defaults
     host = os.environ.get('HOST', '127.0.0.1')
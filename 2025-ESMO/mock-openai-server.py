@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Mock OpenAI Chat Completions Server
+A local, OpenAI-compatible endpoint for load and throughput testing of the
+annotator without spending money or needing network access.
+
+Usage:
+    python mock-openai-server.py --port 8001 --latency-median 1.5 --error-429-rate 0.02
+
+Then point the annotator at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=mock python conference-webapp.py
+"""
+
+import os
+import json
+import re
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from flask import Flask, request, jsonify
+
+# Default behaviour (each can be overridden from the command line or environment)
+DEFAULT_CONFIG = {
+    'latency_median': float(os.environ.get('MOCK_LATENCY_MEDIAN', 1.0)),   # Seconds
+    'latency_sigma': float(os.environ.get('MOCK_LATENCY_SIGMA', 0.5)),     # Lognormal shape (0 = fixed)
+    'latency_max': float(os.environ.get('MOCK_LATENCY_MAX', 60.0)),        # Cap for the long tail
+    'error_429_rate': float(os.environ.get('MOCK_ERROR_429_RATE', 0.0)),
+    'error_500_rate': float(os.environ.get('MOCK_ERROR_500_RATE', 0.0)),
+    'unclear_rate': float(os.environ.get('MOCK_UNCLEAR_RATE', 0.1)),       # Cascade first-tier "UNCLEAR" answers
+    'rpm_limit': int(os.environ.get('MOCK_RPM_LIMIT', 0)),                 # Requests per minute, 0 = unlimited
+    'max_concurrent': int(os.environ.get('MOCK_MAX_CONCURRENT', 0)),       # In-flight requests, 0 = unlimited
+    'seed': os.environ.get('MOCK_SEED')
+}
+
+CHARS_PER_TOKEN = 4
+PROMPT_CACHE_MIN_TOKENS = 1024
+REASONING_MODEL_PREFIXES = ('gpt-5', 'o1', 'o3', 'o4')
+
+MOCK_ANSWERS = [
+    "Yes, this abstract mentions the treatment.",
+    "No, this is not mentioned in the abstract.",
+    "Partially relevant - see details in abstract.",
+    "Not applicable to this study.",
+    "Further investigation needed."
+]
+
+
+def count_tokens(text):
+    """Rough token count (about 4 characters per token)"""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def mock_value(schema, rng):
+    """Random value that satisfies one JSON-schema property"""
+    types = schema.get('type', 'string')
+    if isinstance(types, str):
+        types = [types]
+    types = [t for t in types if t != 'null'] or ['null']
+    field_type = types[0]
+
+    if 'enum' in schema:
+        choices = [v for v in schema['enum'] if v is not None]
+        return rng.choice(choices) if choices else None
+    if field_type == 'number':
+        return round(rng.uniform(0, 100), 1)
+    if field_type == 'integer':
+        return rng.randint(10, 1000)
+    if field_type == 'boolean':
+        return rng.random() < 0.8
+    if field_type == 'null':
+        return None
+    return rng.choice(MOCK_ANSWERS)
+
+
+def create_mock_app(config=None):
+    """Build the mock server app; config overrides DEFAULT_CONFIG keys"""
+    config = dict(DEFAULT_CONFIG, **(config or {}))
+    rng = random.Random(config['seed'])
+    rng_lock = threading.Lock()
+
+    app = Flask(__name__)
+    app.config['MOCK'] = config
+
+    state_lock = threading.Lock()
+    state = {
+        'requests': 0,
+        'completed': 0,
+        'errors_429': 0,
+        'errors_500': 0,
+        'in_flight': 0,
+        'peak_in_flight': 0,
+        'prompt_tokens': 0,
+        'completion_tokens': 0,
+        'cached_tokens': 0
+    }
+    request_times = deque()     # Start times inside the last minute, for the RPM limit
+    seen_prefixes = set()       # prompt_cache_key values seen so far (prefix cache)
+
+    def sample_latency():
+        with rng_lock:
+            if config['latency_sigma'] > 0:
+                latency = rng.lognormvariate(0, config['latency_sigma']) * config['latency_median']
+            else:
+                latency = config['latency_median']
+        return min(latency, config['latency_max'])
+
+    def rate_limit_headers(remaining, reset_seconds):
+        limit = config['rpm_limit'] or 10000
+        return {
+            'x-ratelimit-limit-requests': str(limit),
+            'x-ratelimit-remaining-requests': str(max(0, remaining)),
+            'x-ratelimit-reset-requests': f"{reset_seconds:.3f}s"
+        }
+
+    def error_response(status, message, error_type, headers):
+        body = {'error': {'message': message, 'type': error_type, 'param': None, 'code': error_type}}
+        return jsonify(body), status, headers
+
+    @app.route('/v1/models')
+    def list_models():
+        """List the model ids the annotator offers"""
+        model_ids = ['gpt-5-nano', 'gpt-5-mini', 'gpt-5', 'gpt-4o', 'gpt-4o-mini']
+        return jsonify({
+            'object': 'list',
+            'data': [{'id': m, 'object': 'model', 'created': 0, 'owned_by': 'mock'} for m in model_ids]
+        })
+
+    @app.route('/stats')
+    def get_stats():
+        """Counters for benchmarks and load tests"""
+        with state_lock:
+            return jsonify(dict(state))
+
+    @app.route('/v1/chat/completions', methods=['POST'])
+    def chat_completions():
+        """OpenAI-compatible chat completion with injected latency, errors and rate limits"""
+        data = request.get_json(force=True)
+        now = time.time()
+
+        with state_lock:
+            state['requests'] += 1
+
+            # Sliding one-minute window for the RPM limit
+            while request_times and now - request_times[0] > 60:
+                request_times.popleft()
+            reset_seconds = 60 - (now - request_times[0]) if request_times else 0.0
+            remaining = (config['rpm_limit'] - len(request_times)) if config['rpm_limit'] else 10000
+
+            over_rpm = config['rpm_limit'] and remaining <= 0
+            over_concurrency = config['max_concurrent'] and state['in_flight'] >= config['max_concurrent']
+            with rng_lock:
+                injected_429 = rng.random() < config['error_429_rate']
+                injected_500 = rng.random() < config['error_500_rate']
+
+            if over_rpm or over_concurrency or injected_429:
+                state['errors_429'] += 1
+                headers = rate_limit_headers(remaining, reset_seconds)
+                headers['retry-after'] = f"{max(1, int(reset_seconds)) if over_rpm else 1}"
+                return error_response(429, 'Rate limit reached (mock)', 'rate_limit_exceeded', headers)
+
+            request_times.append(now)
+            remaining -= 1
+            state['in_flight'] += 1
+            state['peak_in_flight'] = max(state['peak_in_flight'], state['in_flight'])
+
+        try:
+            time.sleep(sample_latency())
+
+            if injected_500:
+                with state_lock:
+                    state['errors_500'] += 1
+                return error_response(500, 'Internal server error (mock)', 'server_error',
+                                      rate_limit_headers(remaining, reset_seconds))
+
+            model = data.get('model', 'gpt-5-nano')
+            messages = data.get('messages', [])
+            prompt_text = '\n'.join(str(m.get('content', '')) for m in messages)
+            system_text = next((str(m.get('content', '')) for m in messages if m.get('role') == 'system'), '')
+
+            # Build content matching the requested JSON schema (or the keys listed in the
+            # prompt for models without structured outputs), or a free-text answer
+            response_format = data.get('response_format') or {}
+            prompt_keys = re.search(r'JSON object with these keys:\n((?:\w+: [\w ]+\n?)+)', prompt_text)
+            with rng_lock:
+                if response_format.get('type') == 'json_schema':
+                    schema = response_format['json_schema']['schema']
+                    content = json.dumps({
+                        key: mock_value(prop, rng) for key, prop in schema.get('properties', {}).items()
+                    })
+                elif prompt_keys:
+                    content = json.dumps({
+                        key: mock_value({'type': types.split(' or ')}, rng)
+                        for key, types in re.findall(r'(\w+): ([\w ]+)', prompt_keys.group(1))
+                    })
+                elif 'UNCLEAR' in system_text and rng.random() < config['unclear_rate']:
+                    content = 'UNCLEAR'
+                else:
+                    content = rng.choice(MOCK_ANSWERS)
+                reasoning_tokens = rng.randint(100, 500) if model.startswith(REASONING_MODEL_PREFIXES) else 0
+
+            # Prefix caching: the instructions before the abstract are cached after the first call per key
+            prompt_tokens = count_tokens(prompt_text)
+            cached_tokens = 0
+            cache_key = data.get('prompt_cache_key')
+            if cache_key:
+                user_text = str(messages[-1].get('content', '')) if messages else ''
+                prefix_tokens = count_tokens(system_text + user_text.split('\n\nAbstract:\n')[0])
+                with state_lock:
+                    if cache_key in seen_prefixes and prefix_tokens >= PROMPT_CACHE_MIN_TOKENS:
+                        cached_tokens = (prefix_tokens // 128) * 128
+                    seen_prefixes.add(cache_key)
+            completion_tokens = count_tokens(content) + reasoning_tokens
+
+            with state_lock:
+                state['completed'] += 1
+                state['prompt_tokens'] += prompt_tokens
+                state['completion_tokens'] += completion_tokens
+                state['cached_tokens'] += cached_tokens
+
+            body = {
+                'id': f"chatcmpl-mock-{state['requests']}",
+                'object': 'chat.completion',
+                'created': int(now),
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': content, 'refusal': None},
+                    'logprobs': None,
+                    'finish_reason': 'stop'
+                }],
+                'usage': {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens,
+                    'prompt_tokens_details': {'cached_tokens': cached_tokens},
+                    'completion_tokens_details': {'reasoning_tokens': reasoning_tokens}
+                }
+            }
+            return jsonify(body), 200, rate_limit_headers(remaining, reset_seconds)
+        finally:
+            with state_lock:
+                state['in_flight'] -= 1
+
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local OpenAI-compatible mock chat completions server')
+    parser.add_argument('--host', default=os.environ.get('HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8001)))
+    parser.add_argument('--latency-median', type=float, default=DEFAULT_CONFIG['latency_median'],
+                        help='Median response time in seconds')
+    parser.add_argument('--latency-sigma', type=float, default=DEFAULT_CONFIG['latency_sigma'],
+                        help='Lognormal spread of response times (0 for a fixed latency)')
+    parser.add_argument('--latency-max', type=float, default=DEFAULT_CONFIG['latency_max'],
+                        help='Upper bound on a single response time in seconds')
+    parser.add_argument('--error-429-rate', type=float, default=DEFAULT_CONFIG['error_429_rate'],
+                        help='Share of requests rejected with 429')
+    parser.add_argument('--error-500-rate', type=float, default=DEFAULT_CONFIG['error_500_rate'],
+                        help='Share of requests failing with 500 after the latency')
+    parser.add_argument('--unclear-rate', type=float, default=DEFAULT_CONFIG['unclear_rate'],
+                        help='Share of cascade first-tier answers that come back UNCLEAR')
+    parser.add_argument('--rpm-limit', type=int, default=DEFAULT_CONFIG['rpm_limit'],
+                        help='Requests per minute before 429s (0 = unlimited)')
+    parser.add_argument('--max-concurrent', type=int, default=DEFAULT_CONFIG['max_concurrent'],
+                        help='In-flight requests before 429s (0 = unlimited)')
+    parser.add_argument('--seed', default=DEFAULT_CONFIG['seed'], help='Random seed for reproducible runs')
+    args = parser.parse_args()
+
+    mock_app = create_mock_app({
+        'latency_median': args.latency_median,
+        'latency_sigma': args.latency_sigma,
+        'latency_max': args.latency_max,
+        'error_429_rate': args.error_429_rate,
+        'error_500_rate': args.error_500_rate,
+        'unclear_rate': args.unclear_rate,
+        'rpm_limit': args.rpm_limit,
+        'max_concurrent': args.max_concurrent,
+        'seed': args.seed
+    })
+
+    print("\n" + "="*50)
+    print("Mock OpenAI Chat Completions Server")
+    print("="*50)
+    print(f"\nBase URL: http://{args.host}:{args.port}/v1")
+    print(f"Latency: median {args.latency_median}s, sigma {args.latency_sigma}, max {args.latency_max}s")
+    print(f"Errors: 429 {args.error_429_rate:.1%}, 500 {args.error_500_rate:.1%}")
+    print(f"Limits: {args.rpm_limit or 'unlimited'} rpm, {args.max_concurrent or 'unlimited'} concurrent")
+    print(f"\nPoint the annotator at it with: OPENAI_BASE_URL=http://{args.host}:{args.port}/v1")
+    print("\nPress CTRL+C to stop the server\n")
+
+    mock_app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,1030 @@
+let currentPage = 1;
+let totalPages = 1;
+let currentTaskId = null;
+let progressInterval = null;
+let isShowingAnnotated = false;
+let currentFilteredTotal = 0;  // Track filtered total
+let nextCursor = null;  // Cursors into the server-side snapshot of the current search
+let prevCursor = null;
+
+// Load statistics on page load
+window.onload = function() {
+    loadStats();
+    loadAbstracts();
+
+    // Add event listeners
+    document.getElementById('showEmptyAbstracts').addEventListener('change', function() {
+        loadAbstracts(1);  // Reload from page 1 when toggling
+    });
+
+    document.getElementById('perPage').addEventListener('change', function() {
+        loadAbstracts(1);  // Reload from page 1 when changing per page
+    });
+
+    document.getElementById('continuousScroll').addEventListener('change', function() {
+        if (!isShowingAnnotated) loadAbstracts(1);
+    });
+
+    document.getElementById('tableScroller').addEventListener('scroll', scheduleVirtualRender, {passive: true});
+    window.addEventListener('resize', scheduleVirtualRender);
+};
+
+function handleSearchKeyPress(event) {
+    if (event.key === 'Enter') {
+        searchAbstracts();
+    }
+}
+
+// Search as you type: a debounced, cancellable preview of the keyword being typed
+const INSTANT_SEARCH_DEBOUNCE_MS = 150;
+const INSTANT_SEARCH_MIN_CHARS = 2;
+const INSTANT_SEARCH_RESULTS = 8;
+const INSTANT_SUGGESTIONS = 6;        // Completions of the keyword from /api/suggest
+let instantSearchTimer = null;
+let instantSearchController = null;
+
+function handleSearchKeyDown(event) {
+    if (event.key === 'Escape') {
+        hideInstantResults();
+    }
+}
+
+function handleSearchInput() {
+    cancelInstantSearch();
+    const keywords = document.getElementById('searchInput').value.split(';');
+    const query = keywords[keywords.length - 1].trim();  // The keyword being typed
+    if (query.length < INSTANT_SEARCH_MIN_CHARS) {
+        hideInstantResults();
+        return;
+    }
+    instantSearchTimer = setTimeout(() => runInstantSearch(query), INSTANT_SEARCH_DEBOUNCE_MS);
+}
+
+function cancelInstantSearch() {
+    clearTimeout(instantSearchTimer);
+    if (instantSearchController) {
+        instantSearchController.abort();  // Its answer would be for a stale query
+        instantSearchController = null;
+    }
+}
+
+function runInstantSearch(query) {
+    const controller = new AbortController();
+    instantSearchController = controller;
+    const getJson = url => fetch(url, {signal: controller.signal}).then(response => response.json());
+    Promise.all([
+        getJson('/api/search/instant?q=' + encodeURIComponent(query) + '&limit=' + INSTANT_SEARCH_RESULTS),
+        getJson('/api/suggest?q=' + encodeURIComponent(query) + '&limit=' + INSTANT_SUGGESTIONS)
+    ])
+        .then(([data, completions]) => {
+            if (controller === instantSearchController) showInstantResults(data, completions.suggestions || []);
+        })
+        .catch(error => {
+            if (error.name !== 'AbortError') console.error('Instant search failed:', error);
+        });
+}
+
+function showInstantResults(data, suggestions) {
+    const box = document.getElementById('instantResults');
+    const keywords = escapeHtml(data.terms.join(' '));
+    const completions = suggestions.length ? '<div class="instant-suggestions">' +
+        suggestions.map(suggestion =>
+            '<span class="instant-suggestion" data-text="' + escapeHtml(suggestion.text).replace(/"/g, '&quot;') +
+                '" title="' + suggestion.kind + ' in ' + suggestion.count.toLocaleString() + ' abstracts" onmousedown="applySuggestion(this.dataset.text)">' +
+                escapeHtml(suggestion.text) + ' <small>' + suggestion.count.toLocaleString() + '</small></span>'
+        ).join('') + '</div>' : '';
+    box.innerHTML = completions + '<div class="instant-count">' + data.hits.toLocaleString() +
+        ' abstracts have words starting with "' + keywords + '" (press Enter to search)</div>' +
+        data.data.map(row =>
+            '<div class="instant-result" onmousedown="openInstantResult(' + row._id + ', \'' + keywords.replace(/'/g, '') + '\')">' +
+                '<div class="instant-title">' + escapeHtml(row['Abstract title'] || '-') + '</div>' +
+                '<div class="instant-meta">' + escapeHtml([row['Abstract #'], row['First Author'], row['Track']].filter(v => v).join(' · ')) + '</div>' +
+            '</div>'
+        ).join('');
+    box.style.display = 'block';
+}
+
+function applySuggestion(text) {
+    // Replace the keyword being typed with the completion and search for it
+    const input = document.getElementById('searchInput');
+    const keywords = input.value.split(';');
+    keywords[keywords.length - 1] = (keywords.length > 1 ? ' ' : '') + text;
+    input.value = keywords.join(';');
+    searchAbstracts();
+}
+
+function hideInstantResults() {
+    cancelInstantSearch();
+    document.getElementById('instantResults').style.display = 'none';
+}
+
+function openInstantResult(rowId, keywords) {
+    fetchAbstract(rowId)
+        .then(record => showAbstractModal(Object.assign({}, record, {'Matched Keywords': keywords.split(' ').join('; ')})))
+        .catch(error => showMessage('Could not load abstract: ' + error.message));
+}
+
+// Columns the table shows; list pages carry a preview of each abstract
+const LIST_FIELDS = ['Abstract #', 'Track', 'First Author', 'Abstract title', 'Abstract', 'Matched Keywords'];
+const ABSTRACT_PREVIEW_CHARS = 300;
+const ABSTRACT_CACHE_SIZE = 200;
+const abstractCache = new Map();
+
+function listQuery() {
+    return '&fields=' + encodeURIComponent(LIST_FIELDS.join(',')) + '&preview=' + ABSTRACT_PREVIEW_CHARS;
+}
+
+function storeAbstractRef(cell, row) {
+    cell.dataset.rowId = row._id;
+    cell.dataset.keywords = row['Matched Keywords'] || '';
+    if (row._truncated) cell.dataset.truncated = 'true';
+}
+
+// Full record from /api/abstracts/<id>, with a small cache of recently opened rows
+function fetchAbstract(rowId) {
+    if (abstractCache.has(rowId)) {
+        return Promise.resolve(abstractCache.get(rowId));
+    }
+    return fetch('/api/abstracts/' + rowId)
+        .then(response => {
+            if (!response.ok) throw new Error('Abstract not found');
+            return response.json();
+        })
+        .then(record => {
+            if (abstractCache.size >= ABSTRACT_CACHE_SIZE) {
+                abstractCache.delete(abstractCache.keys().next().value);
+            }
+            abstractCache.set(rowId, record);
+            return record;
+        });
+}
+
+function toggleAbstract(button) {
+    const cell = button.closest('.abstract-cell');
+    const preview = cell.querySelector('.abstract-preview');
+
+    if (cell.classList.contains('expanded')) {
+        cell.classList.remove('expanded');
+        button.textContent = '+';
+        button.style.top = '50%';
+        button.style.transform = 'translateY(-50%)';
+    } else {
+        // Format once; truncated previews fetch the full text first
+        if (!preview.getAttribute('data-formatted')) {
+            const showText = text => {
+                preview.innerHTML = formatAbstractText(text);
+                preview.setAttribute('data-formatted', 'true');
+            };
+            if (cell.dataset.truncated) {
+                fetchAbstract(cell.dataset.rowId)
+                    .then(record => showText(record['Abstract'] || ''))
+                    .catch(error => console.error('Error loading abstract:', error));
+            } else {
+                showText(preview.textContent);
+            }
+        }
+
+        cell.classList.add('expanded');
+        button.textContent = '−';
+        button.style.top = '12px';
+        button.style.transform = 'none';
+    }
+}
+
+function toggleAnnotationSettings() {
+    const settings = document.getElementById('annotationAdvancedSettings');
+    const toggle = document.querySelector('.annotate-box .settings-toggle');
+
+    if (settings.classList.contains('show')) {
+        settings.classList.remove('show');
+        toggle.innerHTML = '▶ Advanced Settings';
+    } else {
+        settings.classList.add('show');
+        toggle.innerHTML = '▼ Advanced Settings';
+    }
+}
+
+function resetSearch() {
+    document.getElementById('searchInput').value = '';
+    document.getElementById('searchMessage').innerHTML = '';
+    loadAbstracts(1);
+}
+
+function showSearchMessage(message, type = 'info') {
+    const messageEl = document.getElementById('searchMessage');
+    messageEl.className = type;
+    messageEl.textContent = message;
+    setTimeout(() => {
+        messageEl.textContent = '';
+    }, 5000);
+}
+
+function showMessage(message, type = 'error') {
+    const messageEl = document.getElementById('message');
+    messageEl.className = type;
+    messageEl.textContent = message;
+
+    // Add download button if annotation is complete
+    if (message.includes('completed successfully') && currentTaskId) {
+        messageEl.innerHTML = message + ' <button class="btn-success" style="margin-left: 10px;" onclick="downloadResults()">Download Now</button>';
+    }
+
+    setTimeout(() => {
+        messageEl.textContent = '';
+    }, 10000); // Show for longer when download is available
+}
+
+function loadStats() {
+    fetch('/api/stats')
+        .then(response => response.json())
+        .then(data => {
+            document.getElementById('totalAbstracts').textContent = data.total_abstracts.toLocaleString();
+            document.getElementById('abstractsWithText').textContent = data.abstracts_with_text.toLocaleString();
+        })
+        .catch(error => console.error('Error loading stats:', error));
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+// Facets: value counts over the current result; clicking a value filters by it
+const FACET_VALUES_SHOWN = 12;          // Values listed per facet until expanded
+const activeFacets = {};                // facet column -> selected values
+const expandedFacets = new Set();
+let shownFacets = {};
+let facetChoices = [];                  // [column, value] behind each rendered value
+
+function facetQuery() {
+    return Object.entries(activeFacets).map(([column, values]) =>
+        values.map(value => '&facet=' + encodeURIComponent(column + ':' + value)).join('')).join('');
+}
+
+function renderFacets(facets) {
+    const panel = document.getElementById('facetPanel');
+    shownFacets = facets || {};
+    facetChoices = [];
+    const columns = Object.keys(shownFacets).filter(column => shownFacets[column].values.length);
+    panel.innerHTML = columns.map((column, index) => {
+        const facet = shownFacets[column];
+        // Selected values first, so they stay visible when the list is collapsed
+        const values = facet.values.filter(item => facet.selected.includes(item.value))
+            .concat(facet.values.filter(item => !facet.selected.includes(item.value)));
+        const shown = expandedFacets.has(column) ? values : values.slice(0, FACET_VALUES_SHOWN);
+        const items = shown.map(item => {
+            facetChoices.push([column, item.value]);
+            return '<span class="facet-value' + (facet.selected.includes(item.value) ? ' selected' : '') +
+                '" onclick="toggleFacet(' + (facetChoices.length - 1) + ')">' + escapeHtml(item.value) +
+                ' <small>' + item.count.toLocaleString() + '</small></span>';
+        }).join('');
+        const more = values.length > FACET_VALUES_SHOWN ?
+            '<span class="facet-action" onclick="toggleFacetExpanded(' + index + ')">' +
+                (expandedFacets.has(column) ? 'fewer' : 'all ' + values.length) + '</span>' : '';
+        const clear = facet.selected.length ?
+            '<span class="facet-action" onclick="clearFacet(' + index + ')">clear</span>' : '';
+        return '<div class="facet"><span class="facet-name">' + escapeHtml(column) + '</span>' + items + more + clear + '</div>';
+    }).join('');
+    panel.style.display = columns.length ? '' : 'none';
+}
+
+function toggleFacet(choice) {
+    const [column, value] = facetChoices[choice];
+    const values = activeFacets[column] || [];
+    activeFacets[column] = values.includes(value) ? values.filter(v => v !== value) : values.concat([value]);
+    if (!activeFacets[column].length) delete activeFacets[column];
+    searchAbstracts();
+}
+
+function toggleFacetExpanded(index) {
+    const column = Object.keys(shownFacets).filter(c => shownFacets[c].values.length)[index];
+    if (expandedFacets.has(column)) {
+        expandedFacets.delete(column);
+    } else {
+        expandedFacets.add(column);
+    }
+    renderFacets(shownFacets);
+}
+
+function clearFacet(index) {
+    delete activeFacets[Object.keys(shownFacets).filter(c => shownFacets[c].values.length)[index]];
+    searchAbstracts();
+}
+
+// Reset table headers to the abstracts view
+function setAbstractsHeader(searched) {
+    const thead = document.querySelector('#abstractsTable thead tr');
+    thead.innerHTML = '<th>Abstract #</th><th>Track</th><th>Author</th><th>Abstract Title</th><th>Abstract</th>' +
+        (searched ? '<th>Matched Keywords</th>' : '');
+}
+
+// Table row for one abstract from /api/abstracts
+function buildAbstractRow(row, searched) {
+    const tr = document.createElement('tr');
+    const abstractText = row['Abstract'] || '';
+    const hasAbstract = abstractText && abstractText !== '-' && abstractText !== '0';
+
+    tr.innerHTML = '<td>' + (row['Abstract #'] || '-') + '</td>' +
+        '<td>' + (row['Track'] || '-') + '</td>' +
+        '<td>' + (row['First Author'] || '-') + '</td>' +
+        '<td>' + (row['Abstract title'] || '-') + '</td>' +
+        '<td class="abstract-cell">' +
+            (hasAbstract ?
+                '<div class="abstract-preview">' + escapeHtml(abstractText) + '</div>' +
+                '<button class="expand-button" onclick="toggleAbstract(this)">+</button>' +
+                '<button class="modal-button" onclick="openModal(this)" title="Open in modal view">⊡</button>' :
+                '-') +
+        '</td>' +
+        (searched && row['Matched Keywords'] ? '<td>' + escapeHtml(row['Matched Keywords']) + '</td>' : (searched ? '<td>-</td>' : ''));
+
+    // Keep only the row id; the full record is fetched when needed
+    if (hasAbstract) {
+        storeAbstractRef(tr.querySelector('.abstract-cell'), row);
+    }
+    return tr;
+}
+
+// Load a page by number (new search or settings) or by a cursor from the previous page
+function loadAbstracts(page = 1, cursor = null) {
+    if (document.getElementById('continuousScroll').checked) {
+        startVirtualTable();
+        return;
+    }
+    stopVirtualTable();
+
+    const search = document.getElementById('searchInput').value;
+    const showEmpty = document.getElementById('showEmptyAbstracts').checked;
+    const perPage = document.getElementById('perPage').value;
+    const url = cursor ?
+        '/api/abstracts?cursor=' + encodeURIComponent(cursor) + '&per_page=' + perPage + listQuery() :
+        '/api/abstracts?page=' + page + '&per_page=' + perPage + '&search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty + facetQuery() + listQuery();
+
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                // Cursors expire when the server reloads its data; start over
+                if (cursor) {
+                    loadAbstracts(1);
+                } else {
+                    console.error('Error loading abstracts:', data.error);
+                }
+                return;
+            }
+
+            const searched = 'search_terms' in data;
+            currentPage = data.page;
+            nextCursor = data.next_cursor;
+            prevCursor = data.prev_cursor;
+            totalPages = data.total_pages;
+            isShowingAnnotated = false;
+            currentFilteredTotal = data.total;  // Store filtered total
+
+            // Update filtered count in stats
+            document.getElementById('totalAbstracts').textContent = data.total.toLocaleString();
+            renderFacets(data.facets);
+
+            // Update table
+            const tbody = document.getElementById('tableBody');
+            tbody.innerHTML = '';
+            setAbstractsHeader(searched);
+            data.data.forEach(row => tbody.appendChild(buildAbstractRow(row, searched)));
+
+            // Update pagination
+            document.getElementById('pageInfo').textContent = 'Page ' + currentPage + ' of ' + totalPages;
+            document.getElementById('prevBtn').disabled = currentPage === 1;
+            document.getElementById('nextBtn').disabled = currentPage === totalPages;
+
+            // Show search complete message
+            if (searched && !cursor) {
+                showSearchMessage('Search complete! Found ' + data.total + ' matching abstracts.', 'success');
+            }
+        })
+        .catch(error => console.error('Error loading abstracts:', error));
+}
+
+// Continuous scroll: windows of rows are fetched from the API as they come into
+// view, and only the rows near the viewport are kept in the DOM
+const VIRTUAL_WINDOW_ROWS = 100;        // Rows per API request
+const VIRTUAL_ROW_ESTIMATE = 46;        // Height (px) assumed for rows not rendered yet
+const VIRTUAL_OVERSCAN_ROWS = 10;       // Rows rendered beyond each edge of the viewport
+const VIRTUAL_PREFETCH_WINDOWS = 1;     // Windows fetched ahead in the scroll direction
+const VIRTUAL_MAX_WINDOWS = 30;         // Windows kept in memory; the farthest are dropped
+let virtualTable = null;
+
+function startVirtualTable() {
+    stopVirtualTable();
+    const search = document.getElementById('searchInput').value;
+    const showEmpty = document.getElementById('showEmptyAbstracts').checked;
+    const scroller = document.getElementById('tableScroller');
+
+    const state = {
+        query: '&search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty + facetQuery() + listQuery(),
+        total: 0,
+        searched: false,
+        started: false,
+        windows: new Map(),     // window index -> rows
+        pending: new Set(),     // window indexes being fetched
+        heights: new Map(),     // row index -> measured height
+        rendered: new Map(),    // row index -> <tr> in the DOM
+        range: '',
+        scrollTop: 0,
+        direction: 1,
+        frame: null,
+        controller: new AbortController(),
+        topSpacer: document.createElement('tr'),
+        bottomSpacer: document.createElement('tr')
+    };
+    [state.topSpacer, state.bottomSpacer].forEach(spacer => {
+        spacer.className = 'virtual-spacer';
+        spacer.appendChild(document.createElement('td'));
+    });
+    // Re-render when rows change height (expanded abstracts, wrapping titles)
+    state.observer = new ResizeObserver(entries => {
+        let changed = false;
+        entries.forEach(entry => {
+            const index = Number(entry.target.dataset.index);
+            const height = entry.target.getBoundingClientRect().height;
+            if (height && state.heights.get(index) !== height) {
+                state.heights.set(index, height);
+                changed = true;
+            }
+        });
+        if (changed) scheduleVirtualRender();
+    });
+
+    virtualTable = state;
+    isShowingAnnotated = false;
+    scroller.classList.add('virtual');
+    scroller.scrollTop = 0;
+    document.querySelector('.pagination').style.display = 'none';
+    document.getElementById('tableBody').innerHTML = '';
+    fetchVirtualWindow(0);
+}
+
+function stopVirtualTable() {
+    if (!virtualTable) return;
+    virtualTable.controller.abort();
+    virtualTable.observer.disconnect();
+    if (virtualTable.frame) cancelAnimationFrame(virtualTable.frame);
+    virtualTable = null;
+    document.getElementById('tableScroller').classList.remove('virtual');
+    document.querySelector('.pagination').style.display = '';
+    document.getElementById('tableBody').innerHTML = '';
+}
+
+function fetchVirtualWindow(index) {
+    const state = virtualTable;
+    if (state.windows.has(index) || state.pending.has(index)) return;
+    state.pending.add(index);
+
+    // Facet counts cover the whole result, so only the first window asks for them
+    fetch('/api/abstracts?page=' + (index + 1) + '&per_page=' + VIRTUAL_WINDOW_ROWS + state.query +
+          (index === 0 ? '' : '&facets=false'),
+          {signal: state.controller.signal})
+        .then(response => response.json())
+        .then(data => {
+            state.pending.delete(index);
+            if (state !== virtualTable) return;
+            if (data.error) {
+                console.error('Error loading abstracts:', data.error);
+                return;
+            }
+            state.total = data.total;
+            state.windows.set(index, data.data);
+
+            if (!state.started) {
+                state.started = true;
+                state.searched = 'search_terms' in data;
+                currentFilteredTotal = data.total;
+                document.getElementById('totalAbstracts').textContent = data.total.toLocaleString();
+                setAbstractsHeader(state.searched);
+                if (state.searched) {
+                    showSearchMessage('Search complete! Found ' + data.total + ' matching abstracts.', 'success');
+                }
+            }
+            if (data.facets) {
+                renderFacets(data.facets);
+            }
+            evictVirtualWindows(index);
+            scheduleVirtualRender();
+        })
+        .catch(error => {
+            state.pending.delete(index);
+            if (error.name !== 'AbortError') console.error('Error loading abstracts:', error);
+        });
+}
+
+// Drop the windows farthest from the one just loaded to bound memory
+function evictVirtualWindows(current) {
+    const state = virtualTable;
+    if (state.windows.size <= VIRTUAL_MAX_WINDOWS) return;
+    const farthest = [...state.windows.keys()].sort((a, b) => Math.abs(b - current) - Math.abs(a - current));
+    farthest.slice(0, state.windows.size - VIRTUAL_MAX_WINDOWS).forEach(index => state.windows.delete(index));
+}
+
+function scheduleVirtualRender() {
+    if (virtualTable && !virtualTable.frame) {
+        virtualTable.frame = requestAnimationFrame(renderVirtualTable);
+    }
+}
+
+function renderVirtualTable() {
+    const state = virtualTable;
+    if (!state) return;
+    state.frame = null;
+
+    const scroller = document.getElementById('tableScroller');
+    const tbody = document.getElementById('tableBody');
+    const columns = document.querySelectorAll('#abstractsTable thead th').length;
+    const headerHeight = document.querySelector('#abstractsTable thead').getBoundingClientRect().height;
+    state.direction = scroller.scrollTop >= state.scrollTop ? 1 : -1;
+    state.scrollTop = scroller.scrollTop;
+
+    // Visible rows from measured heights (estimates for rows not rendered yet)
+    const viewTop = Math.max(0, scroller.scrollTop - headerHeight);
+    const viewBottom = viewTop + scroller.clientHeight;
+    const rowHeight = index => state.heights.get(index) || VIRTUAL_ROW_ESTIMATE;
+    let offset = 0, first = -1, last = state.total;
+    let before = 0, after = 0;
+    for (let index = 0; index < state.total; index++) {
+        const height = rowHeight(index);
+        if (first < 0 && offset + height > viewTop) first = index;
+        if (first >= 0 && last === state.total && offset >= viewBottom) last = index;
+        offset += height;
+    }
+    first = Math.max(0, (first < 0 ? state.total : first) - VIRTUAL_OVERSCAN_ROWS);
+    last = Math.min(state.total, last + VIRTUAL_OVERSCAN_ROWS);
+    for (let index = 0; index < first; index++) before += rowHeight(index);
+    for (let index = last; index < state.total; index++) after += rowHeight(index);
+
+    // Fetch the windows in view, plus the next ones in the scroll direction
+    const firstWindow = Math.floor(first / VIRTUAL_WINDOW_ROWS);
+    const lastWindow = Math.floor(Math.max(first, last - 1) / VIRTUAL_WINDOW_ROWS);
+    const maxWindow = Math.max(0, Math.ceil(state.total / VIRTUAL_WINDOW_ROWS) - 1);
+    for (let w = firstWindow; w <= lastWindow; w++) fetchVirtualWindow(w);
+    for (let ahead = 1; ahead <= VIRTUAL_PREFETCH_WINDOWS; ahead++) {
+        const w = state.direction > 0 ? lastWindow + ahead : firstWindow - ahead;
+        if (w >= 0 && w <= maxWindow) fetchVirtualWindow(w);
+    }
+
+    [[state.topSpacer, before], [state.bottomSpacer, after]].forEach(([spacer, height]) => {
+        spacer.firstChild.colSpan = columns;
+        spacer.firstChild.style.height = height + 'px';
+    });
+
+    // Rebuild the row list only when the range or the loaded rows changed; rows
+    // that stay in range keep their DOM (and expanded state)
+    const loaded = [...Array(last - first).keys()].filter(i => state.windows.has(Math.floor((first + i) / VIRTUAL_WINDOW_ROWS))).length;
+    const range = first + ':' + last + ':' + loaded;
+    if (range === state.range) return;
+    state.range = range;
+
+    const rows = [];
+    for (let index = first; index < last; index++) {
+        const windowRows = state.windows.get(Math.floor(index / VIRTUAL_WINDOW_ROWS));
+        let tr = state.rendered.get(index);
+        if (tr && tr.classList.contains('virtual-placeholder') && windowRows) {
+            tr = null;  // Its data has arrived
+        }
+        if (!tr) {
+            if (windowRows) {
+                tr = buildAbstractRow(windowRows[index % VIRTUAL_WINDOW_ROWS], state.searched);
+                tr.dataset.index = index;
+                state.observer.observe(tr);
+            } else {
+                tr = document.createElement('tr');
+                tr.className = 'virtual-placeholder';
+                tr.innerHTML = '<td colspan="' + columns + '" style="height: ' + rowHeight(index) + 'px">Loading…</td>';
+            }
+        }
+        rows.push(tr);
+    }
+    const keep = new Map(rows.map((tr, i) => [first + i, tr]));
+    state.rendered.forEach((tr, index) => {
+        if (keep.get(index) !== tr) state.observer.unobserve(tr);
+    });
+    state.rendered = keep;
+    tbody.replaceChildren(state.topSpacer, ...rows, state.bottomSpacer);
+}
+
+function searchAbstracts() {
+    hideInstantResults();
+    isShowingAnnotated = false;
+    currentTaskId = null;
+    loadAbstracts(1);
+}
+
+function previousPage() {
+    if (currentPage > 1) {
+        if (isShowingAnnotated && currentTaskId) {
+            loadAnnotatedResults(currentPage - 1);
+        } else {
+            loadAbstracts(currentPage - 1, prevCursor);
+        }
+    }
+}
+
+function nextPage() {
+    if (currentPage < totalPages) {
+        if (isShowingAnnotated && currentTaskId) {
+            loadAnnotatedResults(currentPage + 1);
+        } else {
+            loadAbstracts(currentPage + 1, nextCursor);
+        }
+    }
+}
+
+// Collect annotation settings from the form (shared by start and estimate)
+function buildAnnotationRequest() {
+    const questions = document.getElementById('questionInput').value.split('\n').map(q => q.trim()).filter(q => q);
+
+    return {
+        question: questions[0] || '',
+        questions: questions,
+        fields: parseExtractionFields(document.getElementById('fieldsInput').value),
+        guidance: document.getElementById('guidanceInput').value.trim(),
+        api_key: document.getElementById('apiKey').value.trim(),
+        model: document.getElementById('modelSelect').value,
+        cascade_model: document.getElementById('cascadeModelSelect').value,
+        num_threads: parseInt(document.getElementById('numThreads').value),
+        dry_run: document.getElementById('dryRun').checked,
+        search_filter: document.getElementById('searchInput').value,
+        show_empty: document.getElementById('showEmptyAbstracts').checked,
+        facets: activeFacets,
+        dedupe_near_duplicates: document.getElementById('dedupeNearDuplicates').checked,
+        adaptive_concurrency: document.getElementById('adaptiveConcurrency').checked,
+        request_timeout: parseFloat(document.getElementById('requestTimeout').value),
+        hedge_requests: document.getElementById('hedgeRequests').checked
+    };
+}
+
+function estimateAnnotation() {
+    const requestData = buildAnnotationRequest();
+
+    if (requestData.questions.length === 0 && requestData.fields.length === 0) {
+        showMessage('Please enter a question or extraction fields for the abstracts', 'error');
+        return;
+    }
+
+    fetch('/api/annotate/estimate', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(requestData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.error) {
+            showMessage(data.error, 'error');
+            return;
+        }
+        const minutes = data.estimated_seconds / 60;
+        showMessage('Estimate: ' + data.requests.toLocaleString() + ' requests, ~' +
+            Math.round(data.input_tokens + data.output_tokens).toLocaleString() + ' tokens, ~$' +
+            data.estimated_cost_usd.toFixed(2) + (data.priced ? '' : ' (approximate pricing)') + ', ~' +
+            (minutes >= 1 ? minutes.toFixed(1) + ' min' : Math.round(data.estimated_seconds) + ' s') +
+            ' at ' + data.concurrency + ' parallel requests', 'success');
+    })
+    .catch(error => showMessage('Error: ' + error, 'error'));
+}
+
+function startAnnotation() {
+    const requestData = buildAnnotationRequest();
+
+    if (requestData.questions.length === 0 && requestData.fields.length === 0) {
+        showMessage('Please enter a question or extraction fields for the abstracts', 'error');
+        return;
+    }
+
+    if (!requestData.dry_run && !requestData.api_key) {
+        showMessage('Please enter your OpenAI API key or enable dry run', 'error');
+        return;
+    }
+
+    // Show progress container
+    document.getElementById('progressContainer').style.display = 'block';
+    document.getElementById('progressFill').style.width = '0%';
+    document.getElementById('progressFill').textContent = '0%';
+
+    fetch('/api/annotate', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(requestData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.error) {
+            showMessage(data.error, 'error');
+            document.getElementById('progressContainer').style.display = 'none';
+        } else if (data.task_id) {
+            currentTaskId = data.task_id;
+            document.getElementById('progressText').textContent = 'Processing ' + data.total + ' abstracts...' +
+                (data.near_duplicates_skipped ? ' (' + data.near_duplicates_skipped + ' near-duplicates share answers)' : '') +
+                (data.duplicate_calls_saved ? ' (' + data.duplicate_calls_saved + ' identical abstracts reuse answers)' : '');
+            startProgressTracking();
+        } else {
+            showMessage('Failed to start annotation', 'error');
+        }
+    })
+    .catch(error => {
+        showMessage('Error: ' + error, 'error');
+        document.getElementById('progressContainer').style.display = 'none';
+    });
+}
+
+// Parse "name: type[: value1|value2]" lines into extraction field definitions
+function parseExtractionFields(text) {
+    return text.split('\n').map(line => line.trim()).filter(line => line).map(line => {
+        const parts = line.split(':').map(part => part.trim());
+        return {
+            name: parts[0],
+            type: (parts[1] || 'string').toLowerCase(),
+            values: parts[2] ? parts[2].split('|').map(v => v.trim()).filter(v => v) : []
+        };
+    });
+}
+
+function startProgressTracking() {
+    if (progressInterval) {
+        clearInterval(progressInterval);
+    }
+
+    progressInterval = setInterval(() => {
+        if (!currentTaskId) return;
+
+        fetch('/api/progress/' + currentTaskId)
+            .then(response => response.json())
+            .then(data => {
+                // Safely calculate percentage, avoiding NaN
+                let percentage = 0;
+                if (data.total && data.total > 0) {
+                    percentage = Math.round((data.completed / data.total) * 100);
+                    // Clamp between 0 and 100
+                    percentage = Math.max(0, Math.min(100, percentage));
+                }
+
+                document.getElementById('progressFill').style.width = percentage + '%';
+                document.getElementById('progressFill').textContent = percentage + '%';
+
+                if (data.concurrency && data.status !== 'completed') {
+                    document.getElementById('progressText').textContent = 'Processed ' + data.completed + ' of ' + data.total +
+                        ' (' + data.concurrency + ' parallel requests' + (data.throttled ? ', ' + data.throttled + ' throttled' : '') + ')';
+                }
+
+                if (data.status === 'completed') {
+                    clearInterval(progressInterval);
+                    document.getElementById('progressFill').style.width = '100%';
+                    document.getElementById('progressFill').textContent = '100%';
+                    document.getElementById('progressText').textContent = 'Annotation completed!' +
+                        (data.cascade_model ? ' (' + data.escalated + ' escalated to ' + data.cascade_model + ')' : '') +
+                        (data.cost_usd ? ' ' + (data.prompt_tokens + data.completion_tokens).toLocaleString() +
+                            ' tokens, $' + data.cost_usd.toFixed(4) : '');
+                    showMessage('Annotation completed successfully!', 'success');
+
+                    // Reload the table to show the new annotation column
+                    loadAnnotatedResults();
+                }
+            })
+            .catch(error => {
+                console.error('Error tracking progress:', error);
+            });
+    }, 1000);
+}
+
+function loadAnnotatedResults(page = 1) {
+    // Load the annotated results and update the table (always paged)
+    if (!currentTaskId) return;
+    stopVirtualTable();
+    document.getElementById('facetPanel').style.display = 'none';
+
+    isShowingAnnotated = true;
+    const perPage = document.getElementById('perPage').value;
+
+    fetch('/api/annotated/' + currentTaskId + '?page=' + page + '&per_page=' + perPage + listQuery())
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                console.error('Error loading annotated results:', data.error);
+                return;
+            }
+
+            currentPage = data.page;
+            totalPages = data.total_pages;
+
+            // Update table headers if new columns exist
+            if (data.columns && data.columns.length > 0) {
+                const thead = document.querySelector('#abstractsTable thead tr');
+                thead.innerHTML = '';
+
+                // Add standard columns in new order
+                const standardColumns = [
+                    {name: 'Abstract #', field: 'Abstract #'},
+                    {name: 'Track', field: 'Track'},
+                    {name: 'Author', field: 'First Author'},
+                    {name: 'Abstract Title', field: 'Abstract title'},
+                    {name: 'Abstract', field: 'Abstract'}
+                ];
+
+                standardColumns.forEach(col => {
+                    const th = document.createElement('th');
+                    th.textContent = col.name;
+                    thead.appendChild(th);
+                });
+
+                // Add matched keywords column if present
+                if (data.columns.includes('Matched Keywords')) {
+                    const th = document.createElement('th');
+                    th.textContent = 'Matched Keywords';
+                    th.style.backgroundColor = '#fff3cd';
+                    thead.appendChild(th);
+                }
+
+                // Add annotation columns (and the model that answered, for cascades)
+                data.columns.forEach(col => {
+                    if (col.startsWith('Answer:') || col === 'Answered By') {
+                        const th = document.createElement('th');
+                        th.textContent = col;
+                        th.style.backgroundColor = '#e8f5e9';
+                        thead.appendChild(th);
+                    }
+                });
+            }
+
+            // Update table body
+            const tbody = document.getElementById('tableBody');
+            tbody.innerHTML = '';
+
+            data.data.forEach(row => {
+                const tr = document.createElement('tr');
+                const abstractText = row['Abstract'] || '';
+                const hasAbstract = abstractText && abstractText !== '-' && abstractText !== '0';
+
+                // Escape HTML in text
+                const escapeHtml = (text) => {
+                    const div = document.createElement('div');
+                    div.textContent = text;
+                    return div.innerHTML;
+                };
+
+                // Add standard columns with expandable abstract in new order
+                let html = '<td>' + (row['Abstract #'] || '-') + '</td>' +
+                    '<td>' + (row['Track'] || '-') + '</td>' +
+                    '<td>' + (row['First Author'] || '-') + '</td>' +
+                    '<td>' + (row['Abstract title'] || '-') + '</td>' +
+                    '<td class="abstract-cell">' +
+                        (hasAbstract ?
+                            '<div class="abstract-preview">' + escapeHtml(abstractText) + '</div>' +
+                            '<button class="expand-button" onclick="toggleAbstract(this)">+</button>' +
+                            '<button class="modal-button" onclick="openModal(this)" title="Open in modal view">⊡</button>' :
+                            '-') +
+                    '</td>';
+
+                // Add matched keywords if present
+                if (data.columns.includes('Matched Keywords')) {
+                    html += '<td style="background-color: #fffbf0; font-style: italic;">' + escapeHtml(row['Matched Keywords'] || '-') + '</td>';
+                }
+
+                tr.innerHTML = html;
+
+                // Add annotation columns
+                data.columns.forEach(col => {
+                    if (col.startsWith('Answer:') || col === 'Answered By') {
+                        const td = document.createElement('td');
+                        td.textContent = (row[col] === null || row[col] === undefined || row[col] === '') ? '-' : row[col];
+                        td.style.backgroundColor = '#f1f8e9';
+                        tr.appendChild(td);
+                    }
+                });
+
+                // Keep only the row id; the full record is fetched when needed
+                if (hasAbstract) {
+                    storeAbstractRef(tr.querySelector('.abstract-cell'), row);
+                }
+
+                tbody.appendChild(tr);
+            });
+
+            // Update pagination
+            document.getElementById('pageInfo').textContent = 'Page ' + data.page + ' of ' + data.total_pages;
+            document.getElementById('prevBtn').disabled = data.page === 1;
+            document.getElementById('nextBtn').disabled = data.page === data.total_pages;
+        })
+        .catch(error => console.error('Error loading annotated results:', error));
+}
+
+function downloadResults() {
+    if (currentTaskId && isShowingAnnotated) {
+        // Download annotated results
+        window.location.href = '/api/download/' + currentTaskId;
+    } else {
+        // Download current filtered view
+        const search = document.getElementById('searchInput').value;
+        const showEmpty = document.getElementById('showEmptyAbstracts').checked;
+
+        window.location.href = '/api/download/current?search=' + encodeURIComponent(search) + '&show_empty=' + showEmpty + facetQuery();
+    }
+}
+
+// Format abstract text with bold section headers
+function formatAbstractText(text) {
+    if (!text) return text;
+
+    // Escape HTML first to prevent XSS
+    const div = document.createElement('div');
+    div.textContent = text;
+    let formatted = div.innerHTML;
+
+    // List of section headers to make bold
+    const headers = ['Background', 'Methods', 'Results', 'Conclusions', 'Legal entity responsible for the study', 'Disclosure'];
+
+    headers.forEach(header => {
+        // Match header at start of text or after period/newline/space
+        const regex = new RegExp(`(^|\. |\n)(${header})([:  ])`, 'gi');
+        formatted = formatted.replace(regex, '$1<strong>$2</strong>$3');
+    });
+
+    return formatted;
+}
+
+// Highlight keywords in text
+function highlightKeywords(text, keywords) {
+    if (!text || !keywords) return text;
+
+    let highlighted = text;
+    const keywordList = keywords.split(';').map(k => k.trim()).filter(k => k);
+
+    keywordList.forEach(keyword => {
+        // Escape special regex characters in the keyword
+        const escapedKeyword = keyword.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+        const regex = new RegExp(`(${escapedKeyword})`, 'gi');
+        highlighted = highlighted.replace(regex, '<span class="keyword-highlight">$1</span>');
+    });
+
+    return highlighted;
+}
+
+// Open modal from button click
+function openModal(button) {
+    const cell = button.closest('.abstract-cell');
+    fetchAbstract(cell.dataset.rowId)
+        .then(record => showAbstractModal(Object.assign({}, record, {'Matched Keywords': cell.dataset.keywords})))
+        .catch(error => showMessage('Could not load abstract: ' + error.message));
+}
+
+// Show abstract in modal
+function showAbstractModal(row) {
+    const modal = document.getElementById('abstractModal');
+    const modalTitle = document.getElementById('modalTitle');
+    const modalInfo = document.getElementById('modalInfo');
+    const modalAbstractText = document.getElementById('modalAbstractText');
+
+    // Set title
+    modalTitle.textContent = row['Abstract title'] || 'Abstract';
+
+    // Set info
+    let infoHTML = '';
+    if (row['Abstract #']) {
+        infoHTML += `<div class="modal-info-item"><span class="modal-info-label">Abstract #:</span> ${row['Abstract #']}</div>`;
+    }
+    if (row['First Author']) {
+        infoHTML += `<div class="modal-info-item"><span class="modal-info-label">Author:</span> ${row['First Author']}</div>`;
+    }
+    if (row['Track']) {
+        infoHTML += `<div class="modal-info-item"><span class="modal-info-label">Track:</span> ${row['Track']}</div>`;
+    }
+    if (row['Matched Keywords']) {
+        infoHTML += `<div class="modal-info-item"><span class="modal-info-label">Keywords:</span> ${row['Matched Keywords']}</div>`;
+    }
+    modalInfo.innerHTML = infoHTML;
+
+    // Set abstract text with formatting
+    let abstractText = row['Abstract'] || 'No abstract available';
+    abstractText = formatAbstractText(abstractText);
+
+    if (row['Matched Keywords']) {
+        abstractText = highlightKeywords(abstractText, row['Matched Keywords']);
+    }
+
+    modalAbstractText.innerHTML = abstractText;
+
+    // Show modal
+    modal.style.display = 'block';
+}
+
+// Close modal
+function closeAbstractModal() {
+    document.getElementById('abstractModal').style.display = 'none';
+}
+
+// Close modal when clicking outside
+window.onclick = function(event) {
+    const modal = document.getElementById('abstractModal');
+    if (event.target == modal) {
+        modal.style.display = 'none';
+    }
+}
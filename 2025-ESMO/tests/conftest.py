@@ -0,0 +1,74 @@
+"""
+Shared fixtures: the app loaded over a small synthetic corpus, and a fake
+OpenAI client that answers every JSON key named in the prompt.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import functools
+import types
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(APP_DIR, 'benchmarks'))
+
+from synthetic_data import generate_abstracts, load_webapp
+
+
+@pytest.fixture(scope='session')
+def webapp(tmp_path_factory):
+    """The app module with a 200-row synthetic table and no on-disk index cache"""
+    data_file = tmp_path_factory.mktemp('data') / 'abstracts.xlsx'
+    generate_abstracts(200).to_excel(data_file, index=False)
+    os.environ['DATA_CACHE_DIR'] = 'off'
+    return load_webapp(str(data_file), name='conference_webapp_tests')
+
+
+@pytest.fixture
+def client(webapp):
+    return webapp.app.test_client()
+
+
+class FakeCompletions:
+    """Records each request and answers with a JSON object (or text for single questions)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        prompt = kwargs['messages'][-1]['content']
+        keys = re.findall(r'^([qf]\d+): ', prompt, re.MULTILINE)
+        content = json.dumps({key: f"answer {key}" for key in dict.fromkeys(keys)}) if keys else 'Yes'
+        usage = types.SimpleNamespace(
+            prompt_tokens=100, completion_tokens=10,
+            prompt_tokens_details=types.SimpleNamespace(cached_tokens=0),
+            completion_tokens_details=types.SimpleNamespace(reasoning_tokens=0)
+        )
+        message = types.SimpleNamespace(content=content)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=usage)
+
+
+@pytest.fixture
+def fake_openai(webapp, monkeypatch):
+    """Route model calls to a FakeCompletions; returns it so tests can inspect the requests"""
+    completions = FakeCompletions()
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    # Cached like the real factory, whose cache_info() the metrics collector reads
+    monkeypatch.setattr(webapp, 'get_openai_client', functools.lru_cache()(lambda api_key, timeout: client))
+    return completions
+
+
+def run_task(client, body, timeout=30):
+    """Start an annotation task and wait for it to finish; returns (task_id, progress)"""
+    task_id = client.post('/api/annotate', json=body).get_json()['task_id']
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        progress = client.get(f'/api/progress/{task_id}').get_json()
+        if progress['status'] != 'running':
+            return task_id, progress
+        time.sleep(0.05)
+    raise TimeoutError(f"Task {task_id} did not finish in {timeout}s")
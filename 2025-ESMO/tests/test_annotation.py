@@ -0,0 +1,78 @@
+"""Annotation requests: response formats per model, parsing and whole tasks"""
+
+import io
+import pytest
+import pandas as pd
+from conftest import run_task
+
+QUESTIONS = ['Is this a phase 3 trial?', 'Is overall survival reported?']
+FIELDS = [{'name': 'Phase', 'type': 'category', 'values': ['1', '2', '3']}, {'name': 'Sample size', 'type': 'integer'}]
+
+
+@pytest.mark.parametrize('model, response_format', [
+    ('gpt-4o-mini', 'json_schema'),
+    ('gpt-4o-2024-08-06', 'json_schema'),
+    ('gpt-3.5-turbo', 'json_object'),
+    ('gpt-4-turbo', 'json_object'),
+    ('gpt-4', None),
+])
+def test_multi_question_response_format(webapp, fake_openai, model, response_format):
+    answers = webapp.get_openai_multi_response('sk-test', model, 'Abstract text', QUESTIONS)
+
+    assert answers == ['answer q1', 'answer q2']
+    request = fake_openai.calls[-1]
+    assert request.get('response_format', {}).get('type') == response_format
+    if response_format != 'json_schema':
+        assert 'Respond with only a JSON object with these keys:\nq1: string\nq2: string' in request['messages'][-1]['content']
+
+
+@pytest.mark.parametrize('model', ['gpt-5-nano', 'gpt-3.5-turbo', 'gpt-4'])
+def test_extraction_response_format(webapp, fake_openai, model):
+    fields = webapp.parse_field_definitions(FIELDS)
+    values, error = webapp.get_openai_extraction('sk-test', model, 'Abstract text', fields, allow_unclear=True)
+
+    assert error is None
+    assert values == ['answer f1', 'answer f2']
+    schema_request = fake_openai.calls[-1].get('response_format', {}).get('type') == 'json_schema'
+    assert schema_request == (model == 'gpt-5-nano')
+
+
+def test_parse_json_answer_allows_code_fences(webapp):
+    assert webapp.parse_json_answer('```json\n{"q1": "Yes"}\n```') == {'q1': 'Yes'}
+    with pytest.raises(ValueError):
+        webapp.parse_json_answer('no JSON here')
+
+
+def test_multi_question_task_with_default_model(webapp, client, fake_openai):
+    task_id, progress = run_task(client, {'api_key': 'sk-test', 'questions': QUESTIONS, 'num_threads': 8})
+
+    assert progress['status'] == 'completed'
+    assert progress['model'] == 'gpt-3.5-turbo'
+    assert {call['response_format']['type'] for call in fake_openai.calls} == {'json_object'}
+    result_df = webapp.annotation_results[task_id]
+    answer_columns = webapp.answer_column_names(QUESTIONS)
+    answered = result_df[result_df['Abstract'] != '']
+    assert (answered[answer_columns[0]] == 'answer q1').all()
+    assert (answered[answer_columns[1]] == 'answer q2').all()
+
+
+def test_download_quotes_question_columns(webapp, client, fake_openai):
+    questions = ['Phase 2, 3 or "other"?', 'Is overall survival reported?']
+    task_id, _ = run_task(client, {'api_key': 'sk-test', 'model': 'gpt-4o-mini', 'questions': questions})
+
+    response = client.get(f'/api/download/{task_id}')
+    downloaded = pd.read_csv(io.BytesIO(response.data))
+    assert list(downloaded.columns[-len(webapp.USAGE_COLUMNS) - 2:-len(webapp.USAGE_COLUMNS)]) == \
+        webapp.answer_column_names(questions)
+    assert len(downloaded) == len(webapp.annotation_results[task_id])
+
+
+def test_annotated_results_keep_answered_by_with_fields(webapp, client):
+    task_id, progress = run_task(client, {'dry_run': True, 'question': 'Is this a phase 3 trial?',
+                                          'model': 'gpt-4o-mini', 'cascade_model': 'gpt-4o', 'num_threads': 8})
+
+    assert progress['status'] == 'completed'
+    response = client.get(f'/api/annotated/{task_id}?per_page=50&fields=Abstract%20%23,Abstract&preview=20')
+    rows = response.get_json()['data']
+    assert all(webapp.ANSWERED_BY_COLUMN in row for row in rows)
+    assert {row[webapp.ANSWERED_BY_COLUMN] for row in rows if row['Abstract']} <= {'gpt-4o-mini', 'gpt-4o'}
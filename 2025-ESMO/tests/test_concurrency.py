@@ -0,0 +1,44 @@
+"""AdaptiveConcurrencyLimiter under a simulated clock"""
+
+import heapq
+import random
+import time
+import types
+
+
+def simulate(webapp, monkeypatch, throttle_rate, seed, calls=3000, latency=1.0, backoff=2.0):
+    """
+    Run calls through a limiter with a fixed share of random 429s, which take one
+    backoff longer (as retried calls do); the limits seen after the first quarter.
+    """
+    clock = types.SimpleNamespace(now=0.0)
+    # Background threads (the metrics flusher) keep sleeping on the real clock
+    monkeypatch.setattr(webapp, 'time', types.SimpleNamespace(time=lambda: clock.now, sleep=time.sleep))
+    rng = random.Random(seed)
+    limiter = webapp.AdaptiveConcurrencyLimiter(100)
+    pending, issued, completed, limits = [], 0, 0, []
+    while completed < calls:
+        while limiter.in_flight < limiter.limit and issued < calls:
+            limiter.acquire()
+            issued += 1
+            throttled = rng.random() < throttle_rate
+            duration = latency * rng.uniform(0.8, 1.2) + (backoff if throttled else 0.0)
+            heapq.heappush(pending, (clock.now + duration, duration, throttled))
+        clock.now, duration, throttled = heapq.heappop(pending)
+        limiter.release(duration, throttled=throttled)
+        completed += 1
+        if completed > calls // 4:
+            limits.append(limiter.limit)
+    return limits
+
+
+def test_limit_grows_without_throttling(webapp, monkeypatch):
+    limits = simulate(webapp, monkeypatch, 0.0, seed=0)
+    assert limits == sorted(limits) and limits[-1] > 4 * webapp.ADAPTIVE_INITIAL_CONCURRENCY
+
+
+def test_low_throttle_rate_does_not_collapse_limit(webapp, monkeypatch):
+    for seed in range(5):
+        limits = simulate(webapp, monkeypatch, 0.05, seed)
+        assert min(limits) >= 2
+        assert sum(limits) / len(limits) >= webapp.ADAPTIVE_INITIAL_CONCURRENCY / 2
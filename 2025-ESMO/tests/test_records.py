@@ -0,0 +1,33 @@
+"""records_json: pages encoded per request match the precomputed JSON fragments"""
+
+import json
+import numpy as np
+import pandas as pd
+
+
+def test_fragments_match_per_request_encoding(webapp):
+    df = webapp.abstracts_df
+    positions = np.arange(5, 45)
+    all_fragments = webapp.encode_columns(df, 'all')
+
+    assert webapp.records_json(df, positions) == webapp.records_json(df, positions, fragments=all_fragments)
+    assert webapp.records_json(df, positions, preview=50) == \
+        webapp.records_json(df, positions, preview=50, fragments=all_fragments)
+
+
+def test_auto_mode_only_keeps_nested_columns(webapp):
+    df = pd.DataFrame({
+        'Abstract': ['text', None],
+        'Authors': [['A. Smith', 'B. Li'], []],
+        'Year': pd.array([2025, None], dtype='Int64'),
+        'Track': pd.Categorical(['Lung', None])
+    })
+    fragments = webapp.encode_columns(df, 'auto')
+
+    assert list(fragments) == ['Authors']
+    records = json.loads(webapp.records_json(df, [0, 1], fragments=fragments))
+    assert records == [
+        {'Abstract': 'text', 'Authors': ['A. Smith', 'B. Li'], 'Year': 2025, 'Track': 'Lung', '_id': 0},
+        {'Abstract': None, 'Authors': [], 'Year': None, 'Track': None, '_id': 1}
+    ]
+    assert webapp.fragments_bytes(webapp.encode_columns(df, 'off')) == 0
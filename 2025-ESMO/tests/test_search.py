@@ -0,0 +1,79 @@
+"""filter_dataframe_efficient against the straightforward row-by-row search it replaced"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SEARCHES = ['', 'pembrolizumab', 'PEMBROLIZUMAB', 'lung; breast', 'her2; notaword', ' ; pd-l1 ;',
+            'ne(ph|ur)', 'cdk4/6', 'Müller', 'metastatic', 'notaword']
+
+# Regex terms with groups are valid searches; pandas only warns that groups are not extracted
+pytestmark = pytest.mark.filterwarnings('ignore:This pattern is interpreted as a regular expression')
+
+
+def reference_filter(df, search_filter, show_empty):
+    """The original row-wise implementation"""
+    mask = pd.Series([True] * len(df), index=df.index)
+    if not show_empty and 'Abstract' in df.columns:
+        mask = mask & (df['Abstract'].notna()) & (df['Abstract'] != '')
+    matched_keywords = pd.Series([''] * len(df), index=df.index)
+    if search_filter:
+        search_terms = [term.strip() for term in search_filter.split(';') if term.strip()]
+        search_mask = pd.Series([False] * len(df), index=df.index)
+        for term in search_terms:
+            term_mask = df.apply(lambda row: row.astype(str).str.contains(term, case=False).any(), axis=1)
+            search_mask = search_mask | term_mask
+            for idx in df[term_mask].index:
+                matched_keywords[idx] = f"{matched_keywords[idx]}; {term}" if matched_keywords[idx] else term
+        mask = mask & search_mask
+    return mask, matched_keywords
+
+
+def small_table():
+    """Empty and missing abstracts, a categorical column and numbers"""
+    return pd.DataFrame({
+        'Abstract #': ['1P', '2P', '3P', '4P', '5P'],
+        'Abstract title': ['Lung cancer outcomes', 'Breast HER2+', 'Withdrawn', 'PD-L1 in NSCLC', 'Renal'],
+        'Track': pd.Categorical(['Lung', 'Breast', 'Lung', 'Lung', 'Other']),
+        'Abstract': ['Pembrolizumab in lung cancer.', 'Trastuzumab for HER2 breast cancer.', '',
+                     'PD-L1 expression and nephritis.', None],
+        'Year': [2025, 2025, 2024, 2025, 2023]
+    })
+
+
+@pytest.mark.parametrize('show_empty', [False, True])
+@pytest.mark.parametrize('search', SEARCHES)
+def test_filter_matches_row_wise_search(webapp, search, show_empty):
+    df = webapp.abstracts_df
+    mask, keywords = webapp.filter_dataframe_efficient(df, search, show_empty)
+    expected_mask, expected_keywords = reference_filter(df.astype(object), search, show_empty)
+
+    assert mask.tolist() == expected_mask.tolist()
+    assert keywords.tolist() == expected_keywords.tolist()
+
+
+@pytest.mark.parametrize('show_empty', [False, True])
+@pytest.mark.parametrize('search', ['', 'lung', 'her2; lung', 'Other', '2024', 'pd-l1; nephr', 'ne(ph|ur)'])
+def test_filter_small_table(webapp, search, show_empty):
+    df = small_table()
+    mask, keywords = webapp.filter_dataframe_efficient(df, search, show_empty)
+    expected_mask, expected_keywords = reference_filter(df.astype(object), search, show_empty)
+
+    assert mask.tolist() == expected_mask.tolist()
+    assert keywords.tolist() == expected_keywords.tolist()
+
+
+def test_show_empty_keeps_rows_without_abstract(webapp):
+    df = small_table()
+    hidden, _ = webapp.filter_dataframe_efficient(df, '', False)
+    shown, _ = webapp.filter_dataframe_efficient(df, '', True)
+
+    assert np.flatnonzero(hidden.to_numpy()).tolist() == [0, 1, 3]
+    assert shown.all()
+
+
+def test_keywords_list_every_matching_term_in_order(webapp):
+    mask, keywords = webapp.filter_dataframe_efficient(small_table(), 'cancer; lung; notaword', False)
+
+    assert mask.tolist() == [True, True, False, True, False]
+    assert keywords.tolist() == ['cancer; lung', 'cancer', 'lung', 'lung', '']
@@ -0,0 +1,32 @@
+"""Fingerprinted static assets: compressed once per encoding and cached"""
+
+import gzip
+import os
+
+
+def test_fingerprinted_asset_is_compressed_once(webapp, client):
+    url = webapp.asset_urls['app.js']
+    with open(os.path.join(webapp.STATIC_DIR, 'app.js'), 'rb') as f:
+        source = f.read()
+    webapp.compressed_asset.cache_clear()
+
+    for _ in range(3):
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'immutable' in response.headers['Cache-Control']
+        assert gzip.decompress(response.data) == source
+    assert webapp.compressed_asset.cache_info().misses == 1
+
+    revalidated = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert webapp.compressed_asset.cache_info().currsize == 1
+    assert response.mimetype == client.get(url, headers={'Accept-Encoding': 'identity'}).mimetype
+
+
+def test_fingerprinted_asset_without_compression(webapp, client):
+    response = client.get(webapp.asset_urls['app.css'], headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    with open(os.path.join(webapp.STATIC_DIR, 'app.css'), 'rb') as f:
+        assert response.data == f.read()
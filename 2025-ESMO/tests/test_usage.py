@@ -0,0 +1,40 @@
+"""/api/usage: scoped to the caller's API key unless the admin token is sent"""
+
+from conftest import run_task
+
+ALICE_KEY = 'sk-test-alice-1111'
+BOB_KEY = 'sk-test-bob-2222'
+
+
+def run_keyed_tasks(client):
+    """One task per key; returns {key: task_id}"""
+    return {key: run_task(client, {'api_key': key, 'model': 'gpt-4o-mini', 'question': 'Is this a phase 3 trial?'})[0]
+            for key in (ALICE_KEY, BOB_KEY)}
+
+
+def test_usage_requires_a_key(webapp, client, fake_openai):
+    response = client.get('/api/usage')
+    assert response.status_code == 401
+
+
+def test_usage_is_scoped_to_the_callers_key(webapp, client, fake_openai):
+    task_ids = run_keyed_tasks(client)
+
+    response = client.get('/api/usage', headers={webapp.USAGE_KEY_HEADER: ALICE_KEY})
+    usage = response.get_json()
+    assert response.status_code == 200
+    assert 'no-store' in response.headers['Cache-Control']
+    assert list(usage['by_api_key']) == [webapp.api_key_label(ALICE_KEY)]
+    assert {task['task_id'] for task in usage['tasks']} == {task_ids[ALICE_KEY]}
+    assert usage['total'] == usage['by_api_key'][webapp.api_key_label(ALICE_KEY)]['total']
+
+
+def test_all_keys_need_the_admin_token(webapp, client, fake_openai, monkeypatch):
+    run_keyed_tasks(client)
+
+    assert client.get('/api/usage', headers={'Authorization': 'Bearer guess'}).status_code == 401
+    monkeypatch.setattr(webapp, 'USAGE_ADMIN_TOKEN', 'admin-secret')
+    assert client.get('/api/usage', headers={'Authorization': 'Bearer guess'}).status_code == 401
+
+    usage = client.get('/api/usage', headers={'Authorization': 'Bearer admin-secret'}).get_json()
+    assert {webapp.api_key_label(ALICE_KEY), webapp.api_key_label(BOB_KEY)} <= set(usage['by_api_key'])